@@ -1,6 +1,6 @@
 import streamlit as st
 
-from trading_game.app.utils.state_manager import add_player_response, add_market_response
+from trading_game.app.utils.state_manager import respond_to_quote
 
 
 
@@ -47,16 +47,8 @@ def render_input_chat() -> None:
                 if ask_price <= bid_price:
                     st.error("Ask must be higher than Bid!")
                 else:
-                    # Add player response to chat
-                    add_player_response(st.session_state.pending_quote, bid_price, ask_price)
-                    # Evaluate response
-                    result = st.session_state.quote_request.evaluate_bid_ask(bid_price, ask_price,
-                                                                             st.session_state.stock.last_price,
-                                                                             st.session_state.stock.last_vol)
-                    st.session_state.result = result
-                    final_answer = st.session_state.quote_request.generate_response_message(result)
-                    # Add market response to chat
-                    add_market_response(st.session_state.pending_quote, final_answer)
+                    # Add player response to chat, evaluate it and add market response
+                    respond_to_quote(bid_price, ask_price)
 
     else:
         st.info("No pending quote requests. Keep trading!")
\ No newline at end of file
@@ -1,34 +1,20 @@
 import streamlit as st
 
+import numpy as np
 import plotly.graph_objects as go
 
-def render_stock_chart(x_values: list[int], y_values: list[float]) -> None:
-    fig = go.Figure()
+from trading_game.config.settings import CHART_MAX_POINTS
+from trading_game.utils.downsampling import MinMaxAggregator
 
-    fig.add_trace(go.Scatter(
-        x=x_values,
-        y=y_values,
-        mode='lines',
-        name='Underlying',
-        line=dict(color='#00d4ff', width=2.5),
-        fill='tozeroy',
-        fillcolor='rgba(0, 212, 255, 0.15)'
-    ))
-
-    if not st.session_state.game_over:
-        fig.add_vline(
-            x=st.session_state.tick_count,
-            line_dash="dash",
-            line_color="#ffaa00",
-            opacity=0.5
-        )
-
-    # === Dynamically set y-axis range to give visual breathing room ===
-    y_min = min(y_values)
-    y_max = max(y_values)
-    y_range = y_max - y_min if y_max != y_min else 1
-    padding = y_range * 0.3  # 30% padding top/bottom for better centering
 
+# ---- Figure skeletons (built once per session, only the trace data and ranges change afterwards) ----
+def _base_layout(fig: go.Figure, y_title: str, height: int, **yaxis) -> None:
+    fig.add_vline(
+        x=0,
+        line_dash="dash",
+        line_color="#ffaa00",
+        opacity=0.5
+    )
     fig.update_layout(
         plot_bgcolor='#1e2130',
         paper_bgcolor='#1e2130',
@@ -37,68 +23,83 @@ def render_stock_chart(x_values: list[int], y_values: list[float]) -> None:
             showgrid=True,
             gridcolor='#2e3444',
             title="Time (ticks)",
-            range=[0, st.session_state.game_duration],
             zeroline=True,
             zerolinecolor='#2e3444'
         ),
         yaxis=dict(
             showgrid=True,
             gridcolor='#2e3444',
-            title="Price ($)",
-            range=[y_min - padding, y_max + padding],
-            zeroline=False
+            title=y_title,
+            **yaxis
         ),
-        height=400,
+        height=height,
         margin=dict(l=0, r=0, t=10, b=0),
         showlegend=False
     )
 
-    st.plotly_chart(fig, use_container_width=True)
-
-def render_pnl_chart(x_values: list[int], y_values: list[float]) -> None:
-    pnl = y_values[len(y_values) - 1]
+def _stock_figure() -> go.Figure:
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        mode='lines',
+        name='Underlying',
+        line=dict(color='#00d4ff', width=2.5),
+        fill='tozeroy',
+        fillcolor='rgba(0, 212, 255, 0.15)'
+    ))
+    _base_layout(fig, "Price ($)", 400, zeroline=False)
+    return fig
 
-    fig_pnl = go.Figure()
-    fig_pnl.add_trace(go.Scatter(
-        x=x_values,
-        y= y_values,
+def _pnl_figure() -> go.Figure:
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
         mode='lines',
         name='P&L',
-        line=dict(color='#00ff88' if pnl > 0 else '#ff4444', width=2.5),
-        fill='tozeroy',
-        fillcolor=f'rgba(0, 255, 136, 0.15)' if pnl > 0 else 'rgba(255, 68, 68, 0.15)'
+        line=dict(width=2.5),
+        fill='tozeroy'
     ))
+    _base_layout(fig, "P&L ($)", 250, zeroline=True, zerolinecolor='#ffaa00')
+    return fig
 
-    if not st.session_state.game_over:
-        fig_pnl.add_vline(
-            x=st.session_state.tick_count,
-            line_dash="dash",
-            line_color="#ffaa00",
-            opacity=0.5
-        )
+def _chart(name: str, build) -> tuple[go.Figure, MinMaxAggregator]:
+    """Cached (figure, downsampler) of a chart for this session"""
+    charts = st.session_state.setdefault("charts", {})
+    if name not in charts:
+        charts[name] = (build(), MinMaxAggregator(CHART_MAX_POINTS))
+    return charts[name]
 
-    fig_pnl.update_layout(
-        plot_bgcolor='#1e2130',
-        paper_bgcolor='#1e2130',
-        font=dict(color='#ffffff'),
-        xaxis=dict(
-            showgrid=True,
-            gridcolor='#2e3444',
-            title="Time (ticks)",
-            range=[0, st.session_state.game_duration],
-            zeroline=True,
-            zerolinecolor='#2e3444'
-        ),
-        yaxis=dict(
-            showgrid=True,
-            gridcolor='#2e3444',
-            title="P&L ($)",
-            zeroline=True,
-            zerolinecolor='#ffaa00'
-        ),
-        height=250,
-        margin=dict(l=0, r=0, t=10, b=0),
-        showlegend=False
+def _update_chart(fig: go.Figure, sampler: MinMaxAggregator, x_values: np.ndarray, y_values: np.ndarray) -> None:
+    """Fold the new points into the downsampled trace, move the tick marker"""
+    x_plot, y_plot = sampler.update(x_values, y_values)
+    fig.data[0].x = x_plot
+    fig.data[0].y = y_plot
+    fig.layout.xaxis.range = [0, st.session_state.game_duration]
+    fig.layout.shapes[0].update(
+        x0=st.session_state.tick_count, x1=st.session_state.tick_count, visible=not st.session_state.game_over
     )
 
-    st.plotly_chart(fig_pnl, use_container_width=True)
\ No newline at end of file
+
+# ---- Charts ----
+def render_stock_chart(x_values: np.ndarray, y_values: np.ndarray) -> None:
+    fig, sampler = _chart("stock", _stock_figure)
+
+    with fig.batch_update():
+        _update_chart(fig, sampler, x_values, y_values)
+
+        # === Dynamically set y-axis range to give visual breathing room (exact extremes, no scan) ===
+        y_min, y_max = sampler.y_range()
+        y_range = y_max - y_min if y_max != y_min else 1
+        padding = y_range * 0.3  # 30% padding top/bottom for better centering
+        fig.layout.yaxis.range = [y_min - padding, y_max + padding]
+
+    st.plotly_chart(fig, use_container_width=True)
+
+def render_pnl_chart(x_values: np.ndarray, y_values: np.ndarray) -> None:
+    pnl = y_values[-1]
+    fig_pnl, sampler = _chart("pnl", _pnl_figure)
+
+    with fig_pnl.batch_update():
+        _update_chart(fig_pnl, sampler, x_values, y_values)
+        fig_pnl.data[0].line.color = '#00ff88' if pnl > 0 else '#ff4444'
+        fig_pnl.data[0].fillcolor = 'rgba(0, 255, 136, 0.15)' if pnl > 0 else 'rgba(255, 68, 68, 0.15)'
+
+    st.plotly_chart(fig_pnl, use_container_width=True)
@@ -6,7 +6,8 @@ from trading_game.app.components.option_param_inputs import (
     render_results
 )
 from trading_game.config.settings import RF
-from trading_game.core.option_pricer import Option, Strategy, Greeks
+from trading_game.core import legs
+from trading_game.core.legs import legs_greeks, price_legs
 
 
 
@@ -51,16 +52,10 @@ def render_single_option_pricing_tab(spot_ref: float, vol_ref: float) -> None:
 
     # ----- RESULTS + GREEKS -----
     with result_col:
-        pricer_option = Option(
-            K=pricer_strike,
-            T=pricer_maturity,
-            r=RF,
-            option_type=pricer_opt_type
-        )
-        option_price = pricer_option.price(spot_ref, pricer_vol)
-
-        pricer_greeks = Greeks(option=pricer_option)
-        greeks_result = pricer_greeks.all_greeks(spot_ref, pricer_vol)
+        pricer_legs = legs.call(pricer_strike, pricer_maturity, RF) if pricer_opt_type == "call" \
+            else legs.put(pricer_strike, pricer_maturity, RF)
+        option_price = price_legs(pricer_legs, spot_ref, pricer_vol)
+        greeks_result = legs_greeks(pricer_legs, spot_ref, pricer_vol)
 
         render_results(option_price, greeks_result)
 
@@ -123,12 +118,9 @@ def render_vanilla_strategy_pricing_tab(spot_ref: float, vol_ref: float) -> None
 
     # ===== RESULTS + GREEKS =====
     with result_col:
-        method = getattr(Strategy, method_name)
-        strategy = method(**strat_data)
-        strategy_price = strategy.price(spot_ref, pricer_vol)
-
-        strat_greeks_calc = Greeks(strategy=strategy)
-        strat_greeks = strat_greeks_calc.all_greeks(spot_ref, pricer_vol)
+        strategy_legs = getattr(legs, method_name)(**strat_data)
+        strategy_price = price_legs(strategy_legs, spot_ref, pricer_vol)
+        strat_greeks = legs_greeks(strategy_legs, spot_ref, pricer_vol)
 
         render_results(strategy_price, strat_greeks)
 
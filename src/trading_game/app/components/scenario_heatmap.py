@@ -0,0 +1,41 @@
+import streamlit as st
+
+import numpy as np
+import plotly.graph_objects as go
+
+
+
+def render_scenario_heatmap(grid: dict, key: str = "scenario") -> None:
+    """P&L change heatmap (spot shock x vol shock) of a Book.scenario_grid, one time roll at a time"""
+    time_rolls = [int(days) for days in grid["time_rolls"]]
+    roll = st.select_slider(
+        "Time roll (business days)",
+        options=time_rolls,
+        value=time_rolls[0],
+        key=f"{key}_time_roll"
+    )
+    pnl_change = grid["pnl_change"][:, :, time_rolls.index(roll)]
+    bound = float(np.abs(pnl_change).max()) or 1.0
+
+    fig = go.Figure(go.Heatmap(
+        x=grid["spot_shocks"] * 100,
+        y=grid["vol_shocks"] * 100,
+        z=pnl_change.T,
+        zmin=-bound,
+        zmax=bound,
+        colorscale=[[0.0, '#ff4444'], [0.5, '#1e2130'], [1.0, '#00ff88']],
+        colorbar=dict(title="P&L $"),
+        hovertemplate="Spot %{x:+.1f}%<br>Vol %{y:+.1f}%<br>P&L %{z:,.0f}$<extra></extra>"
+    ))
+
+    fig.update_layout(
+        plot_bgcolor='#1e2130',
+        paper_bgcolor='#1e2130',
+        font=dict(color='#ffffff'),
+        xaxis=dict(title="Spot shock (%)", zeroline=False),
+        yaxis=dict(title="Vol shock (%)", zeroline=False),
+        height=400,
+        margin=dict(l=0, r=0, t=10, b=0)
+    )
+
+    st.plotly_chart(fig, use_container_width=True)
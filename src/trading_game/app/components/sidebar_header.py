@@ -16,6 +16,7 @@ def render_side_bar() -> None:
         <a href="#market-overview" class="nav-link">📊 Market Overview</a>
         <a href="#risk-dashboard" class="nav-link">⚠️ Risk Dashboard</a>
         <a href="#positions" class="nav-link">📈 Positions</a>
+        <a href="#scenarios" class="nav-link">🧪 Scenario Analysis</a>
         <a href="#hedging" class="nav-link">🛡️ Delta Hedging</a>
         <a href="#clients" class="nav-link">📞 Client Requests</a>
         <a href="#pricer" class="nav-link">🧮 Option Pricer</a>
@@ -5,6 +5,7 @@ from trading_game.app.layouts.controls import render_controls
 from trading_game.app.layouts.current_positions import render_current_positions
 from trading_game.app.layouts.market_overview import render_market_overview
 from trading_game.app.layouts.pricer_tool import render_pricer_tool
+from trading_game.app.layouts.scenario_analysis import render_scenario_analysis
 from trading_game.app.layouts.trading_delta import render_trading_delta
 from trading_game.app.layouts.trading_options import render_trading_options
 from trading_game.app.components.metrics import render_top_metrics
@@ -18,32 +19,30 @@ def render_main_layout() -> None:
     remove_st_default()
     global_theme()
 
-    # First computations
-    spot_ref = st.session_state.stock.last_price
-    vol_ref = st.session_state.stock.last_vol
-    book = st.session_state.book
-    cash_available = book.cash
-    total_portfolio_value = book.compute_book_value(spot_ref, vol_ref)
-    portfolio_pnl = book.compute_book_pnl(spot_ref, vol_ref)
-    portfolio_greeks = book.compute_greeks(spot_ref, vol_ref)
-    portfolio_greeks_cash = book.compute_greeks_cash(spot_ref,vol_ref)
+    # Book valued once for this tick (see state_manager.refresh_book_snapshot)
+    snapshot = st.session_state.book_snapshot
 
     # BAR AND HEADER
     render_side_bar()
-    render_header(portfolio_pnl)
+    render_header(snapshot.total_pnl)
 
     # METRICS
-    render_top_metrics(total_portfolio_value, portfolio_pnl, cash_available)
+    render_top_metrics(snapshot.total_value, snapshot.total_pnl, snapshot.cash)
 
     # ============================================================================
     # MARKET OVERVIEW
     # ============================================================================
-    render_market_overview(portfolio_pnl, portfolio_greeks, portfolio_greeks_cash)
+    render_market_overview(snapshot)
 
     # ============================================================================
     # POSITIONS TABLE
     # ============================================================================
-    render_current_positions()
+    render_current_positions(snapshot)
+
+    # ============================================================================
+    # SCENARIO ANALYSIS
+    # ============================================================================
+    render_scenario_analysis()
 
     # ============================================================================
     # CLIENT REQUESTS
@@ -63,7 +62,7 @@ def render_main_layout() -> None:
     # ============================================================================
     # DELTA
     # ============================================================================
-    render_trading_delta(portfolio_greeks, portfolio_greeks_cash, cash_available)
+    render_trading_delta(snapshot)
 
     # ============================================================================
     # CONTROLS
@@ -3,11 +3,13 @@ import streamlit as st
 from trading_game.app.components.graphs import render_stock_chart, render_pnl_chart
 from trading_game.app.components.news_alert import render_news
 from trading_game.app.components.risk_bar import render_risk_bar
-from trading_game.app.utils.styling import get_risk_color
+from trading_game.app.utils.styling import EXPOSURE_COLORS
+from trading_game.config.settings import RISK_BAR_MAX
+from trading_game.core.book_snapshot import BookSnapshot
 
 
 
-def render_market_overview(pnl, portfolio_greeks, portfolio_greeks_cash) -> None :
+def render_market_overview(snapshot: BookSnapshot) -> None :
     st.markdown('<a id="market-overview"></a>', unsafe_allow_html=True)
     st.header("📊 Market Overview")
 
@@ -18,9 +20,10 @@ def render_market_overview(pnl, portfolio_greeks, portfolio_greeks_cash) -> None
 
     chart_col, risk_col = st.columns([2, 1])
     with chart_col:
-        x_values = list(range(len(stock.price_history)))
-        y_values_stock = stock.price_history
-        y_values_pnl = book.pnl_history
+        # Zero-copy views of the history buffers, indexed by tick
+        x_values = stock.price_history.indices()
+        y_values_stock = stock.price_history.view()
+        y_values_pnl = book.pnl_history.view()
 
         # === Stock Evolution ===
         st.subheader(f"📈 Live Price - {st.session_state.stock.name} {st.session_state.stock.ticker}")
@@ -36,26 +39,25 @@ def render_market_overview(pnl, portfolio_greeks, portfolio_greeks_cash) -> None
 
         st.markdown("#### Portfolio Greeks")
 
-        delta_color = get_risk_color(portfolio_greeks['delta'], [500, 1500])
-        gamma_color = get_risk_color(portfolio_greeks['gamma'], [50, 150])
-        vega_color = get_risk_color(portfolio_greeks['vega'], [1000, 3000])
-        theta_color = get_risk_color(portfolio_greeks['theta'], [50, 150])
+        portfolio_greeks = snapshot.greeks
+        portfolio_greeks_cash = snapshot.greeks_cash
+        colors = {name: EXPOSURE_COLORS[level] for name, level in snapshot.exposure.items()}
 
         st.markdown(
-            f"**Delta $:** <span style='color:{delta_color}; font-size:24px'>{portfolio_greeks_cash['delta_cash']:.0f}</span>",
+            f"**Delta $:** <span style='color:{colors['delta']}; font-size:24px'>{portfolio_greeks_cash['delta_cash']:.0f}</span>",
             unsafe_allow_html=True)
-        render_risk_bar(portfolio_greeks['delta'], 2000)
+        render_risk_bar(portfolio_greeks['delta'], RISK_BAR_MAX['delta'])
         st.markdown(
-            f"**Gamma $:** <span style='color:{gamma_color}; font-size:24px'>{portfolio_greeks_cash['gamma_cash']:.2f}</span>",
+            f"**Gamma $:** <span style='color:{colors['gamma']}; font-size:24px'>{portfolio_greeks_cash['gamma_cash']:.2f}</span>",
             unsafe_allow_html=True)
-        render_risk_bar(portfolio_greeks['gamma'], 200)
-        st.markdown(f"**Vega $:** <span style='color:{vega_color}; font-size:24px'>{portfolio_greeks_cash['vega_cash']:.0f}</span>",
+        render_risk_bar(portfolio_greeks['gamma'], RISK_BAR_MAX['gamma'])
+        st.markdown(f"**Vega $:** <span style='color:{colors['vega']}; font-size:24px'>{portfolio_greeks_cash['vega_cash']:.0f}</span>",
                     unsafe_allow_html=True)
-        render_risk_bar(portfolio_greeks['vega'], 5000)
+        render_risk_bar(portfolio_greeks['vega'], RISK_BAR_MAX['vega'])
         st.markdown(
-            f"**Theta $:** <span style='color:{theta_color}; font-size:24px'>{portfolio_greeks_cash['theta_cash']:.2f}</span>",
+            f"**Theta $:** <span style='color:{colors['theta']}; font-size:24px'>{portfolio_greeks_cash['theta_cash']:.2f}</span>",
             unsafe_allow_html=True)
-        render_risk_bar(portfolio_greeks['theta'], 150)
+        render_risk_bar(portfolio_greeks['theta'], RISK_BAR_MAX['theta'])
 
         st.write("")
         st.write("")
@@ -63,11 +65,11 @@ def render_market_overview(pnl, portfolio_greeks, portfolio_greeks_cash) -> None
         st.write("")
 
         st.markdown("#### Risk Alerts")
-        if abs(portfolio_greeks['delta']) > 1500:
+        if snapshot.exposure['delta'] == "high":
             st.error(f"⚠️ High Delta Exposure: {portfolio_greeks['delta']:.0f}")
-        if abs(portfolio_greeks['gamma']) > 150:
+        if snapshot.exposure['gamma'] == "high":
             st.warning(f"⚠️ High Gamma Risk: {portfolio_greeks['gamma']:.2f}")
-        if not book.is_empty():
+        if not snapshot.is_empty():
             st.info("✅ No positions - No risk")
             
     st.divider()
\ No newline at end of file
@@ -0,0 +1,45 @@
+import pandas as pd
+import streamlit as st
+
+from trading_game.app.components.scenario_heatmap import render_scenario_heatmap
+from trading_game.config.scenario_config import get_stress_presets
+
+
+
+def render_scenario_analysis() -> None:
+    st.markdown('<a id="scenarios"></a>', unsafe_allow_html=True)
+    st.header("🧪 Scenario Analysis")
+
+    book = st.session_state.book
+    stock = st.session_state.stock
+
+    if book.is_empty():
+        st.info("No positions - No scenario to run")
+        st.divider()
+        return
+
+    spot_ref = stock.last_price
+    vol_ref = st.session_state.engine.market_vol
+
+    grid_col, stress_col = st.columns([2, 1])
+
+    # ===== Spot x Vol x Time grid =====
+    with grid_col:
+        st.subheader("P&L Grid")
+        render_scenario_heatmap(book.scenario_grid(spot_ref, vol_ref))
+
+    # ===== Sector stress presets =====
+    with stress_col:
+        st.subheader(f"Stress Tests - {stock.sector}")
+        stress_results = book.stress_test(spot_ref, vol_ref, get_stress_presets(stock.sector))
+        st.table(pd.DataFrame([
+            {
+                'News': result["news"].replace("[STOCK_NAME]", stock.name),
+                'Spot': f"{result['spot_shock']:+.0%}",
+                'Vol': f"{result['vol_shock']:+.0%}",
+                'P&L': f"${result['pnl_change']:,.0f}"
+            }
+            for result in stress_results
+        ]))
+
+    st.divider()
@@ -1,10 +1,12 @@
 import streamlit as st
 
+from trading_game.app.utils.state_manager import refresh_book_snapshot
 from trading_game.config.settings import TRANSACTION_COST
+from trading_game.core.book_snapshot import BookSnapshot
 
 
 
-def render_trading_delta(portfolio_greeks, portfolio_greeks_cash, cash_available) -> None:
+def render_trading_delta(snapshot: BookSnapshot) -> None:
 
     stock = st.session_state.stock
     book = st.session_state.book
@@ -15,8 +17,8 @@ def render_trading_delta(portfolio_greeks, portfolio_greeks_cash, cash_available
     hedge_col1, hedge_col2, hedge_col3 = st.columns([2, 2, 1])
 
     with hedge_col1:
-        st.markdown(f"**Current Portfolio Delta $:** {portfolio_greeks_cash['delta_cash']:.0f}")
-        recommended_hedge = -portfolio_greeks['delta']
+        st.markdown(f"**Current Portfolio Delta $:** {snapshot.greeks_cash['delta_cash']:.0f}")
+        recommended_hedge = -snapshot.greeks['delta']
         st.markdown(f"**Recommended Hedge:** {int(recommended_hedge):+.0f} shares")
 
     with hedge_col2:
@@ -37,21 +39,14 @@ def render_trading_delta(portfolio_greeks, portfolio_greeks_cash, cash_available
         executed = False
         if st.button("⚡ Execute Hedge", type="primary"):
             tried_executing = True
-            if cash_available >= transaction_cost:
-
-                # ADD TRADE TO BOOK
-                st.session_state.book.add_trade_stock(
-                    stock,
-                    stock_qty,
-                    stock.last_price,
-                    )
-
-                book.cash -= (stock_qty * stock.last_price + transaction_cost)
+            # ADD TRADE TO BOOK (premium and transaction cost are charged by the engine)
+            if st.session_state.engine.trade_stock(stock_qty):
+                refresh_book_snapshot()
                 executed = True
 
     if executed:
         st.success(f"Hedge executed! New position: {book.stocks[stock.ticker][1]:+.0f}")
     elif tried_executing:
-        st.error("Insufficient cash for transaction cost!")
+        st.error("Insufficient cash for the hedge and its transaction cost!")
 
     st.divider()
\ No newline at end of file
@@ -1,30 +1,41 @@
 import streamlit as st
 
+from trading_game.app.utils.state_manager import refresh_book_snapshot
 from trading_game.app.components.trading_tabs import render_trading_single_option_tab, render_trading_strategy_tab
-from trading_game.core.manual_trading import VanillaOrder, StrategyOrder, OrderSide, OrderType, StrategyType
-from trading_game.config.settings import RF, BASE, TRANSACTION_COST
-from trading_game.core.option_pricer import Option, Strategy
-
-def process_trade(order_strategy, execution_price, qty, side) -> None:
-    trade_qty = qty if side == "Buy" else -qty
-    book = st.session_state.book
-    cost = execution_price * trade_qty * 100
-    transaction_cost = execution_price * qty * 100 * TRANSACTION_COST
-    total_cost = cost + transaction_cost
-    if (trade_qty >= 0 and book.cash >= total_cost) or trade_qty <= 0:
-        # Add trade to book
-        book = st.session_state.book
-        book.add_trade_strategy(
-            order_strategy,
-            trade_qty * 100,
-            st.session_state.stock.last_price,
-            st.session_state.stock.last_vol)
-        book.cash -= total_cost
-
-        st.success(f"✅ Order executed at ${execution_price:.4f}")
-        st.info(f"💰 Total cost: ${cost:.2f}")
+from trading_game.core.manual_trading import VanillaOrder, StrategyOrder, OrderSide, OrderStatus, OrderType, StrategyType
+from trading_game.config.settings import RF, BASE
+
+def report_order(order) -> None:
+    """Outcome of an order placed through the engine, which books its fills"""
+    if order.filled_quantity:
+        refresh_book_snapshot()
+    if order.status == OrderStatus.EXECUTED:
+        st.success(f"✅ Order executed at ${order.executed_price:.4f}")
+        st.info(f"💰 Total cost: ${order.executed_price * order.quantity:.2f}")
+    elif order.status == OrderStatus.REJECTED:
+        st.error(f"❌ Order rejected: {order.rejection_reason}")
+    elif order.filled_quantity:
+        st.info(f"🟡 {order.filled_quantity // 100} of {order.quantity // 100} filled at "
+                f"${order.executed_price:.4f}, the rest rests in the order book")
     else:
-        st.error("Insufficient cash!")
+        st.info("🕒 Order resting in the order book, it fills once the market reaches the limit price")
+
+def render_resting_orders() -> None:
+    """Pending orders of the player, with a cancel button each"""
+    pending = st.session_state.engine.order_executor.pending_orders
+    if not pending:
+        return
+
+    st.subheader("Resting Orders")
+    for order in list(pending.values()):
+        instrument = order.option_type.upper() if isinstance(order, VanillaOrder) else order.strategy_type.value
+        limit = f"@ ${order.limit_price:.4f}" if order.order_type == OrderType.LIMIT else "at market"
+        col1, col2 = st.columns([4, 1])
+        col1.write(f"{order.side.value} {order.remaining_quantity // 100} {instrument} {limit} "
+                   f"({order.filled_quantity // 100} filled)")
+        if col2.button("Cancel", key=f"cancel_{order.order_id}"):
+            st.session_state.engine.cancel_order(order.order_id)
+            st.rerun()
 
 def render_trading_options() -> None:
     st.markdown('<a name="manual-trading"></a>', unsafe_allow_html=True)
@@ -55,22 +66,12 @@ def render_trading_options() -> None:
                 spot_price=st.session_state.stock.last_price,
                 volatility=st.session_state.stock.last_vol,
                 risk_free_rate=RF,
-                limit_price=limit_price
+                limit_price=limit_price,
+                clock=st.session_state.clock
             )
 
-            # Turn to strategy object
-            vanilla_order_strategy = vanilla_order.to_strategy()
-
-            submitted = st.session_state.order_executor.submit_order(vanilla_order)
-            if submitted:
-                success = st.session_state.order_executor.execute_vanilla_order(vanilla_order, Option)
-
-                if success:
-                    process_trade(vanilla_order_strategy, vanilla_order.executed_price, qty, side)
-                else:
-                    st.error("❌ Order could not be executed (check limit price)")
-            else:
-                st.error(f"❌ Order rejected: {vanilla_order.rejection_reason}")
+            st.session_state.engine.place_order(vanilla_order)
+            report_order(vanilla_order)
 
     # ===== TAB 2: STRATEGIES =====
     with (tab2):
@@ -116,21 +117,12 @@ def render_trading_options() -> None:
                 spot_price=st.session_state.stock.last_price,
                 volatility=st.session_state.stock.last_vol,
                 risk_free_rate=RF,
-                limit_price=limit_price_strat
+                limit_price=limit_price_strat,
+                clock=st.session_state.clock
             )
 
-            # Turn to strategy object
-            strategy_order_strategy = strategy_order.to_strategy()
-
-            submitted = st.session_state.order_executor.submit_order(strategy_order)
-            if submitted:
-                success = st.session_state.order_executor.execute_strategy_order(strategy_order, Strategy)
-
-                if success:
-                    process_trade(strategy_order_strategy, strategy_order.net_premium, qty_strat, side_strat)
-                else:
-                    st.error("❌ Strategy could not be executed (check limit price)")
-            else:
-                st.error(f"❌ Order rejected: {strategy_order.rejection_reason}")
+            st.session_state.engine.place_order(strategy_order)
+            report_order(strategy_order)
 
+    render_resting_orders()
     st.divider()
\ No newline at end of file
@@ -1,41 +1,57 @@
-from typing import Dict, Literal
+from pathlib import Path
 
 import streamlit as st
-from datetime import datetime
-
-from trading_game.config.settings import GAME_DURATION, MAX_OPTION_POSITION
-from trading_game.core.book import Book
-from trading_game.core.manual_trading import OrderExecutor
-from trading_game.models.shock import MarketShock, StateShock
-from trading_game.models.stock import Stock
-from trading_game.models.street import Street
 
+from trading_game.config.settings import GAME_DURATION, JOURNAL_DIR, RECORDING_DIR
+from trading_game.core.book_snapshot import BookSnapshot
+from trading_game.core.game_engine import GameEngine
+from trading_game.core.game_recorder import GameRecorder
+from trading_game.core.trade_journal import TradeJournal
+from trading_game.utils.app_utils import new_id
+
+
+# Engine attributes mirrored into st.session_state for the layouts
+ENGINE_STATE_KEYS = (
+    "clock", "tick_count", "game_over", "game_duration",
+    "stock", "street", "book", "order_executor",
+    "shock", "shock_happened", "shocked_vol", "vol_surface",
+    "quote_request", "quote_request_history", "result", "quote_chat_history",
+    "pending_quote", "last_quote_tick", "quote_cleared_tick",
+)
+
+
+def sync_session_state() -> None:
+    """Expose the engine state to the layouts through st.session_state"""
+    engine = st.session_state.engine
+    for key in ENGINE_STATE_KEYS:
+        st.session_state[key] = getattr(engine, key)
+    refresh_book_snapshot()
+
+def refresh_book_snapshot() -> None:
+    """Value the book once for the current tick, the layouts read st.session_state.book_snapshot"""
+    engine = st.session_state.engine
+    st.session_state.book_snapshot = BookSnapshot.take(
+        engine.book, engine.stock.last_price, engine.market_vol, engine.tick_count
+    )
 
 def initial_settings() -> None:
-    # Game flow
-    st.session_state.tick_count = 0
-    st.session_state.game_over = False
-
-    # General
-    stock = Stock.stock()
-    st.session_state.stock = stock
-    st.session_state.street = Street.street()
-    st.session_state.book = Book()
-    st.session_state.order_executor = OrderExecutor(max_position_size=MAX_OPTION_POSITION)
-
-    # Market shock
-    st.session_state.shock = MarketShock.shock(name=stock.name, sector=stock.sector)
-    st.session_state.shock_happened = False
-    st.session_state.shocked_vol = -999
-
-    # Quote request
-    st.session_state.quote_request = None
-    st.session_state.quote_request_history = list()
-    st.session_state.result = None
-    st.session_state.quote_chat_history = list()
-    st.session_state.pending_quote = None
-    st.session_state.last_quote_tick = 0
-    st.session_state.quote_cleared_tick = -999
+    previous = st.session_state.get("engine")
+    if previous is not None and previous.book.journal is not None:
+        previous.book.journal.close()
+    if previous is not None and previous.recorder is not None:
+        previous.recorder.close()
+
+    engine = GameEngine.new_game(game_duration=st.session_state.get("game_duration", GAME_DURATION))
+    if JOURNAL_DIR is not None:
+        # One journal per game, Book.restore rebuilds the book from it
+        Path(JOURNAL_DIR).mkdir(parents=True, exist_ok=True)
+        engine.book.journal = TradeJournal(Path(JOURNAL_DIR) / f"{new_id('book')}.jsonl")
+    if RECORDING_DIR is not None:
+        # Replayable with GameReplayer.load(path)
+        Path(RECORDING_DIR).mkdir(parents=True, exist_ok=True)
+        GameRecorder(Path(RECORDING_DIR) / f"{new_id('game')}.jsonl").attach(engine)
+    st.session_state.engine = engine
+    sync_session_state()
 
 def initialize_session_state() -> None:
     if 'initialized' not in st.session_state:
@@ -44,96 +60,32 @@ def initialize_session_state() -> None:
         st.session_state.trading_paused = False
         initial_settings()
 
-def manage_shock(tick_count: int, stock: Stock) -> Dict[str, str | Literal['positive','negative'] | StateShock | float]:
-    shock = st.session_state.shock
-
-    # If more than 20 ticks and shock hasn't already happened a shock happens on the market
-    if shock.shock_state == StateShock.NONE and tick_count >= 12 and not st.session_state.shock_happened:
-        shock.trigger_shock()
-        st.session_state.shock_happened = True
-        st.session_state.shocked_vol = stock.init_vol * shock.vol_spike
-
-    # If the shock just happened, the effect starts fading
-    elif shock.shock_state == StateShock.HAPPENING:
-        shock.decay_shock()
-
-    # If the shock is almost gone, back to initial state
-    elif shock.shock_state == StateShock.DECAY and abs(stock.last_vol - stock.init_vol) < 0.01:
-        shock.stop_shock()
-
-    shock_dict = shock.model_dump()
-    st.session_state.shock = shock
-    return shock_dict
-
 def update_state_on_autorefresh() -> None:
-    tick_count = st.session_state.tick_count
     if not st.session_state.trading_paused and not st.session_state.game_over:
-        if tick_count >= st.session_state.game_duration:
-            st.session_state.game_over = True
-
-        else:
-            stock = st.session_state.stock
-            book = st.session_state.book
-
-            # Update shock
-            shock_dict = manage_shock(tick_count, stock)
-
-            # Update stock
-            stock.move_stock(shock_dict, st.session_state.shocked_vol)
-
-            # Update PNL history
-            book.add_pnl_point(stock.last_price, stock.last_vol)
-
-            # Update tick count
-            tick_count += 1
-
-            st.session_state.tick_count = tick_count
-            st.session_state.stock = stock
-            st.session_state.book = book
+        st.session_state.engine.step()
+        sync_session_state()
 
 def add_quote_request(message: str, quote_id: str) -> None:
     """Add a new quote request to the chat"""
-    st.session_state.quote_chat_history.append({
-        'type': 'request',
-        'message': message,
-        'quote_id': quote_id,
-        'timestamp': datetime.now().strftime("%H:%M:%S")
-    })
-    st.session_state.pending_quote = quote_id
+    st.session_state.engine.add_quote_request(message, quote_id)
+    sync_session_state()
 
 def add_player_response(quote_id: str, bid: float, ask: float) -> None:
     """Add player's bid/ask response to the chat"""
-    st.session_state.quote_chat_history.append({
-        'type': 'player_response',
-        'quote_id': quote_id,
-        'bid': bid,
-        'ask': ask,
-        'timestamp': datetime.now().strftime("%H:%M:%S")
-    })
+    st.session_state.engine.add_player_response(quote_id, bid, ask)
+    sync_session_state()
 
 def add_market_response(quote_id: str, final_answer:str) -> None:
-    st.session_state.quote_chat_history.append({
-        'type': 'market_response',
-        'quote_id': quote_id,
-        'message': final_answer,
-        'timestamp': datetime.now().strftime("%H:%M:%S")
-    })
-
-    # Process result if exists (add trade to book)
-    if st.session_state.result:
-        book = st.session_state.book
-        qty = st.session_state.quote_request.quantity
-        way = 1 if st.session_state.quote_request.way == "sell" else -1
-        book.add_trade_strategy(
-            st.session_state.quote_request.strat,
-            qty * way,
-            st.session_state.stock.last_price,
-            st.session_state.stock.last_vol)  # check if right spot ref
-        st.session_state.book = book
-
-    st.session_state.quote_cleared_tick = st.session_state.tick_count
-    st.session_state.pending_quote = None
+    st.session_state.engine.add_market_response(quote_id, final_answer)
+    sync_session_state()
+
+def respond_to_quote(bid: float, ask: float) -> bool:
+    """Send the player's bid/ask to the client and book the trade if it is accepted"""
+    result = st.session_state.engine.respond_to_quote(bid, ask)
+    sync_session_state()
+    return result
 
 def clear_chat() -> None:
     """Clear the chat history"""
-    st.session_state.quote_chat_history = list()
\ No newline at end of file
+    st.session_state.engine.clear_chat()
+    sync_session_state()
@@ -1,5 +1,8 @@
 import streamlit as st
 
+# Colors of the exposure levels of Book._exposure_level
+EXPOSURE_COLORS = {"neutral": "#00ff88", "moderate": "#ffaa00", "high": "#ff4444"}
+
 def get_risk_color(value, thresholds) -> str:
     abs_val = abs(value)
     if abs_val < thresholds[0]:
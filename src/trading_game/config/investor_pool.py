@@ -1,7 +1,5 @@
 # Investor pool with realistic names and trading styles
 
-import random
-
 INVESTOR_POOL = [
     # Hedge Funds - Mix of directional and volatility traders
     {"name": "Sarah Chen", "company": "Bridgewater Associates"},
@@ -65,12 +63,16 @@ INVESTOR_POOL = [
 ]
 
 # Helper functions
-import random
+from typing import Optional
+
+import numpy as np
+
+from trading_game.utils.app_utils import get_rng, pick
 
 
-def get_random_investor():
+def get_random_investor(rng: Optional[np.random.Generator] = None):
     """Returns a random investor from the pool"""
-    return random.choice(INVESTOR_POOL)
+    return pick(INVESTOR_POOL, rng)
 
 
 def get_investors_by_company(company: str) ->list[dict[str, str]]:
@@ -78,11 +80,12 @@ def get_investors_by_company(company: str) ->list[dict[str, str]]:
     return [inv for inv in INVESTOR_POOL if inv["company"] == company]
 
 
-def get_random_investors(n: int, unique_companies: bool = False) -> list:
+def get_random_investors(n: int, unique_companies: bool = False, rng: Optional[np.random.Generator] = None) -> list:
     """
     Returns n random investors
     If unique_companies=True, ensures no duplicate companies
     """
+    rng = get_rng(rng)
 
     if unique_companies:
         companies_used = set()
@@ -91,7 +94,7 @@ def get_random_investors(n: int, unique_companies: bool = False) -> list:
 
         # Fill remaining slots
         while len(selected) < n and available:
-            inv = random.choice(available)
+            inv = pick(available, rng)
             if inv["company"] not in companies_used:
                 selected.append(inv)
                 companies_used.add(inv["company"])
@@ -100,4 +103,4 @@ def get_random_investors(n: int, unique_companies: bool = False) -> list:
         return selected
 
     else:
-        return random.sample(INVESTOR_POOL, min(n, len(INVESTOR_POOL)))
\ No newline at end of file
+        return [INVESTOR_POOL[i] for i in rng.choice(len(INVESTOR_POOL), min(n, len(INVESTOR_POOL)), replace=False)]
\ No newline at end of file
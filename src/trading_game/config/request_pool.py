@@ -78,13 +78,16 @@ RESPONSE_PHRASES = {
 }
 
 
-import random
-from typing import Literal
+from typing import Literal, Optional
 
-def get_random_quote_phrase() -> str:
+import numpy as np
+
+from trading_game.utils.app_utils import pick
+
+def get_random_quote_phrase(rng: Optional[np.random.Generator] = None) -> str:
     """Returns a random quote request phrase"""
-    return random.choice(QUOTE_REQUEST_PHRASES)
+    return pick(QUOTE_REQUEST_PHRASES, rng)
 
-def get_random_response_phrase(way: Literal['buy', 'sell', 'pass']) -> str:
+def get_random_response_phrase(way: Literal['buy', 'sell', 'pass'], rng: Optional[np.random.Generator] = None) -> str:
     """Returns a random response phrase depending on way"""
-    return random.choice(RESPONSE_PHRASES[way])
\ No newline at end of file
+    return pick(RESPONSE_PHRASES[way], rng)
\ No newline at end of file
@@ -0,0 +1,39 @@
+"""
+Scenario configuration for the book stress grid.
+
+Spot and vol shocks are relative moves (+0.10 = spot or vol up 10%), time rolls are in business days.
+Stress presets come from the sector news shocks of the shock pool: their price impact is the spot shock
+and their vol spike the vol shock.
+"""
+
+from typing import List, Optional
+
+import numpy as np
+
+from trading_game.config.shock_pool import NEWS_SHOCK_POOL
+
+# Default grid axes
+SPOT_SHOCKS = np.round(np.linspace(-0.30, 0.30, 25), 4)
+VOL_SHOCKS = np.round(np.linspace(-0.50, 1.50, 21), 4)
+TIME_ROLLS_DAYS = np.array([0, 1, 5, 10, 21])
+
+
+def get_stress_presets(sector: Optional[str] = None) -> List[dict]:
+    """
+    Stress scenarios from the news shock pool (one per news), for one sector or all of them.
+
+    Returns:
+        List of {"sector", "news", "shock_type", "spot_shock", "vol_shock"} dicts
+    """
+    sectors = [sector] if sector is not None else list(NEWS_SHOCK_POOL)
+    presets = []
+    for name in sectors:
+        for shock in NEWS_SHOCK_POOL.get(name, []):
+            presets.append({
+                "sector": name,
+                "news": shock["news"],
+                "shock_type": shock["shock_type"],
+                "spot_shock": shock["price_impact"],
+                "vol_shock": shock["vol_spike"] - 1,
+            })
+    return presets
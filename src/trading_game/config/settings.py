@@ -3,9 +3,20 @@ STARTING_CASH = 100_000.0
 GAME_DURATION = 50
 REFRESH_INTERVAL = 20_000
 MAX_OPTION_POSITION = 1000
+MARKET_DEPTH = None  # Quantity the market trades per instrument, side and tick at the theoretical price (None: unlimited)
+TIME_DECAY = False  # Roll option maturities down every tick
+HISTORY_MAXLEN = None  # Ticks kept in the price / vol / P&L histories (None: the whole game, else a ring buffer)
+CHART_MAX_POINTS = 1_000  # Points drawn per chart trace, longer histories are min-max downsampled
+JOURNAL_DIR = None  # Folder of the per-game book journals (None: trades are not journaled)
+RECORDING_DIR = None  # Folder of the per-game replay recordings (None: games are not recorded)
 
 # Market params
 NB_INVESTORS = 5
 RF = 0.04
 BASE = 252
-TRANSACTION_COST = 0.0001
\ No newline at end of file
+TIME_SCALE = BASE * 4  # Wall-clock seconds are divided by TIME_SCALE to get years of stock diffusion
+TRANSACTION_COST = 0.0001
+
+# Risk dashboard: |greek| below low is neutral, below high moderate, else high (see Book._exposure_level)
+RISK_THRESHOLDS = {"delta": (500, 1500), "gamma": (50, 150), "vega": (1000, 3000), "theta": (50, 150)}
+RISK_BAR_MAX = {"delta": 2000, "gamma": 200, "vega": 5000, "theta": 150}
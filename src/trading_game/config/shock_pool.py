@@ -614,23 +614,27 @@ NEWS_SHOCK_POOL = {
 }
 
 # Helper functions
-import random
+from typing import Optional
 
+import numpy as np
 
-def get_random_news_for_sector(sector: str) -> dict:
+from trading_game.utils.app_utils import pick
+
+
+def get_random_news_for_sector(sector: str, rng: Optional[np.random.Generator] = None) -> dict:
     """Returns a random news item for the given sector"""
     if sector not in NEWS_SHOCK_POOL:
         raise ValueError(f"Sector '{sector}' not found in news pool")
-    return random.choice(NEWS_SHOCK_POOL[sector])
+    return pick(NEWS_SHOCK_POOL[sector], rng)
 
 
-def get_news_by_type(sector: str, shock_type: str) -> dict:
+def get_news_by_type(sector: str, shock_type: str, rng: Optional[np.random.Generator] = None) -> dict:
     """Returns a random news item of specific type (positive/negative) for sector"""
     sector_news = NEWS_SHOCK_POOL.get(sector, [])
     filtered = [n for n in sector_news if n["shock_type"] == shock_type]
     if not filtered:
         raise ValueError(f"No {shock_type} news found for sector '{sector}'")
-    return random.choice(filtered)
+    return pick(filtered, rng)
 
 
 def format_news(news_dict: dict, stock_name: str) -> dict:
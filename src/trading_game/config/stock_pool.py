@@ -122,12 +122,16 @@ STOCK_POOL = [
 ]
 
 # Helper function to randomly select a stock
-import random
+from typing import Optional
 
+import numpy as np
 
-def get_random_stock():
+from trading_game.utils.app_utils import pick
+
+
+def get_random_stock(rng: Optional[np.random.Generator] = None):
     """Returns a random stock from the pool"""
-    return random.choice(STOCK_POOL)
+    return pick(STOCK_POOL, rng)
 
 
 def get_stock_by_ticker(ticker: str):
@@ -1,10 +1,9 @@
-import random
-
 import numpy as np
-from typing import Literal
+from typing import Literal, Optional
 
 from trading_game.config.maturity_config import get_year_frac_maturity_options
 from trading_game.config.settings import RF
+from trading_game.utils.app_utils import get_rng, pick
 
 STRATEGY_POOL = {
     'easy':[
@@ -26,13 +25,15 @@ STRATEGY_POOL = {
 RELATIVE_STRIKE_POOL = np.linspace(0.0, 0.25, 6)
 MATURITY_POOL = get_year_frac_maturity_options()
 
-def get_random_strat(level: Literal['easy','hard']) -> dict:
-    return random.choice(STRATEGY_POOL[level])
+def get_random_strat(level: Literal['easy','hard'], rng: Optional[np.random.Generator] = None) -> dict:
+    return pick(STRATEGY_POOL[level], rng)
 
-def generate_random_strat_data(level: Literal['easy', 'hard'],  price:float) -> tuple[str, dict]:
+def generate_random_strat_data(level: Literal['easy', 'hard'],  price:float,
+                               rng: Optional[np.random.Generator] = None) -> tuple[str, dict]:
+    rng = get_rng(rng)
 
     # Choose strategy
-    strategy = get_random_strat(level)
+    strategy = get_random_strat(level, rng)
     strat = dict()
 
     # Choose strike(s)
@@ -40,22 +41,22 @@ def generate_random_strat_data(level: Literal['easy', 'hard'],  price:float) ->
         if strategy["call_moneyness"] == "atm":
             factor = 1
         else:
-            strike_relative = random.choice(RELATIVE_STRIKE_POOL)
+            strike_relative = pick(RELATIVE_STRIKE_POOL, rng)
             factor = (1 + strike_relative) if strategy["call_moneyness"] == "otm" else (1 - strike_relative)
         strike = round(factor * price, 0)
         strat["k"] = strike
     elif strategy["call_moneyness"] == "atm":
         if strategy["strike"] == 2:
-            strike_relative = random.choice(np.linspace(0.05, 0.15, 4))
+            strike_relative = pick(np.linspace(0.05, 0.15, 4), rng)
         else:
-            strike_relative = random.choice(np.linspace(0.05, 0.25, 4))
+            strike_relative = pick(np.linspace(0.05, 0.25, 4), rng)
             strat["k3"] = round(price, 0)
         strat["k1"] = round((1 - strike_relative) * price, 0)
         strat["k2"] = round((1 + strike_relative) * price, 0)
     else:
         strikes = list()
         for k in range(1, strategy["strike"]+1):
-            strike_relative = random.choice([elem for elem in RELATIVE_STRIKE_POOL if elem not in strikes])
+            strike_relative = pick([elem for elem in RELATIVE_STRIKE_POOL if elem not in strikes], rng)
             strikes.append(strike_relative)
             factor = (1 + strike_relative) if strategy["call_moneyness"]=="otm"  else (1 - strike_relative)
             strike = round(factor * price, 0)
@@ -63,11 +64,11 @@ def generate_random_strat_data(level: Literal['easy', 'hard'],  price:float) ->
 
     # Choose maturity
     if strategy["maturity"] == 1:
-        strat["t"] = random.choice(MATURITY_POOL)
+        strat["t"] = pick(MATURITY_POOL, rng)
     else:
         maturities = list()
         for t in range(1, strategy["maturity"]+1):
-            maturity = random.choice([elem for elem in MATURITY_POOL if elem not in maturities])
+            maturity = pick([elem for elem in MATURITY_POOL if elem not in maturities], rng)
             maturities.append(maturity)
             strat[f"t{t}"] = maturity
 
@@ -76,7 +77,7 @@ def generate_random_strat_data(level: Literal['easy', 'hard'],  price:float) ->
 
     # Choose option type if needed
     if strategy["option_type"] > 1:
-        strat["option_type"] = random.choice(["call", "put"])
+        strat["option_type"] = pick(["call", "put"], rng)
 
     return strategy["name"], strat
 
@@ -0,0 +1,175 @@
+import argparse
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from trading_game.config.settings import GAME_DURATION, STARTING_CASH
+from trading_game.core.game_engine import GameEngine
+from trading_game.core.leg_table import GREEK_NAMES
+from trading_game.models.clock import SimulatedClock
+
+
+class ScriptedPolicy(BaseModel):
+    """
+    Scripted player used for batch simulations: quotes every client request around the theoretical mid
+    and delta-hedges with the stock once the book delta leaves the tolerance band.
+    """
+
+    quote_width: float = Field(default=0.10, gt=0, description="Bid/ask width as a fraction of the mid")
+    hedge_threshold: float = Field(default=500, ge=0, description="Absolute book delta that triggers a hedge")
+
+    def __call__(self, engine: GameEngine) -> None:
+        stock = engine.stock
+
+        # ---- Client requests ----
+        if engine.pending_quote is not None:
+            mid = abs(engine.quote_request.strat.price(stock.last_price, engine.market_vol))
+            half_width = 0.5 * self.quote_width * mid
+            engine.respond_to_quote(max(mid - half_width, 0.0), mid + half_width)
+
+        # ---- Delta hedge ----
+        delta = engine.book.compute_greeks(stock.last_price, engine.market_vol)["delta"]
+        if abs(delta) > self.hedge_threshold:
+            engine.trade_stock(-int(round(delta)))
+
+
+def max_drawdown(pnl_history: List[float]) -> float:
+    """Largest peak-to-trough fall of a P&L series"""
+    pnl = np.asarray(pnl_history, dtype=float)
+    if pnl.size == 0:
+        return 0.0
+    return float(np.max(np.maximum.accumulate(pnl) - pnl))
+
+
+def simulate_game(seed: int, policy: Optional[Callable[[GameEngine], None]] = None,
+                  game_duration: int = GAME_DURATION) -> dict:
+    """Play one full game with a scripted policy on a simulated clock and return its summary"""
+    policy = policy or ScriptedPolicy()
+
+    engine = GameEngine.new_game(game_duration=game_duration, clock=SimulatedClock(), seed=seed)
+    greeks_path = {name: [] for name in GREEK_NAMES}
+    pnl_path = [0.0]
+    quotes_answered, quotes_filled = 0, 0
+
+    while engine.step():
+        had_quote = engine.pending_quote is not None
+        policy(engine)
+        if had_quote and engine.pending_quote is None:
+            quotes_answered += 1
+            quotes_filled += bool(engine.result)
+
+        greeks = engine.book.compute_greeks(engine.stock.last_price, engine.market_vol)
+        for name in GREEK_NAMES:
+            greeks_path[name].append(greeks[name])
+        # All-in P&L: mark-to-market value (premiums and fees paid in cash) against the starting cash
+        pnl_path.append(engine.book.compute_book_value(engine.stock.last_price, engine.market_vol) - STARTING_CASH)
+
+    stock, book = engine.stock, engine.book
+    summary = {
+        "seed": seed,
+        "ticker": stock.ticker,
+        "ticks": engine.tick_count,
+        "final_price": float(stock.last_price),
+        "final_pnl": float(pnl_path[-1]),
+        "max_drawdown": max_drawdown(pnl_path),
+        "quote_requests": len(engine.quote_request_history),
+        "quotes_filled": quotes_filled,
+        "fill_rate": quotes_filled / quotes_answered if quotes_answered else 0.0,
+        "nb_trades": len(book.trade_history),
+    }
+    for name, path in greeks_path.items():
+        path = np.asarray(path, dtype=float)
+        summary[f"{name}_final"] = float(path[-1]) if path.size else 0.0
+        summary[f"{name}_mean"] = float(path.mean()) if path.size else 0.0
+        summary[f"{name}_max_abs"] = float(np.abs(path).max()) if path.size else 0.0
+    return summary
+
+
+def game_seeds(n_games: int, seed: int) -> List[int]:
+    """Independent per-game seeds derived from a root seed (stable whatever the number of workers)"""
+    return [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(n_games)]
+
+
+def iter_games(n_games: int, seed: int = 0, n_workers: Optional[int] = None,
+               policy: Optional[Callable[[GameEngine], None]] = None,
+               game_duration: int = GAME_DURATION, chunksize: int = 16) -> Iterator[dict]:
+    """Yield game summaries in seed order, spreading the games over a process pool"""
+    seeds = game_seeds(n_games, seed)
+    n_workers = n_workers or os.cpu_count() or 1
+
+    if n_workers == 1:
+        for game_seed in seeds:
+            yield simulate_game(game_seed, policy, game_duration)
+        return
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        yield from executor.map(
+            simulate_game, seeds, [policy] * n_games, [game_duration] * n_games, chunksize=chunksize
+        )
+
+
+def run_batch(n_games: int, output_path: str | Path, seed: int = 0, n_workers: Optional[int] = None,
+              policy: Optional[Callable[[GameEngine], None]] = None,
+              game_duration: int = GAME_DURATION, chunksize: int = 16, batch_size: int = 1_000) -> Path:
+    """
+    Simulate n_games and stream one summary row per game to CSV, or to Parquet when the path ends
+    with .parquet (requires pyarrow). Rows are flushed every batch_size games.
+    """
+    output_path = Path(output_path)
+    games = iter_games(n_games, seed, n_workers, policy, game_duration, chunksize)
+
+    if output_path.suffix == ".parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError("Writing Parquet requires pyarrow, use a .csv output instead.") from exc
+
+        writer, rows = None, []
+        for summary in games:
+            rows.append(summary)
+            if len(rows) >= batch_size:
+                table = pa.Table.from_pylist(rows)
+                writer = writer or pq.ParquetWriter(output_path, table.schema)
+                writer.write_table(table)
+                rows = []
+        if rows:
+            table = pa.Table.from_pylist(rows)
+            writer = writer or pq.ParquetWriter(output_path, table.schema)
+            writer.write_table(table)
+        if writer is not None:
+            writer.close()
+        return output_path
+
+    with open(output_path, "w", newline="") as f:
+        writer = None
+        for i, summary in enumerate(games, start=1):
+            if writer is None:
+                writer = csv.DictWriter(f, fieldnames=list(summary))
+                writer.writeheader()
+            writer.writerow(summary)
+            if i % batch_size == 0:
+                f.flush()
+    return output_path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Simulate many seeded games with a scripted player")
+    parser.add_argument("--games", type=int, default=1_000, help="Number of games to simulate")
+    parser.add_argument("--seed", type=int, default=0, help="Root seed")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--duration", type=int, default=GAME_DURATION, help="Ticks per game")
+    parser.add_argument("--out", default="games.csv", help="Output file (.csv or .parquet)")
+    args = parser.parse_args()
+
+    path = run_batch(args.games, args.out, seed=args.seed, n_workers=args.workers, game_duration=args.duration)
+    print(f"{args.games} games written to {path}")
+
+
+if __name__ == "__main__":
+    main()
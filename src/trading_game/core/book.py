@@ -1,31 +1,96 @@
-from pydantic import BaseModel, Field
-from typing import Dict, Tuple
+import argparse
+import timeit
+from collections import deque
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple
 from datetime import datetime
-import secrets
+
+import numpy as np
 
 from trading_game.models.stock import Stock
-from .option_pricer import Strategy, Greeks
-from trading_game.config.settings import STARTING_CASH
+from trading_game.models.vol_surface import VolSurface
+from .leg_table import LegTable, GREEK_NAMES
+from .pricing_cache import PricingCache
+from .trade_journal import TradeJournal
+from .option_pricer import Strategy
+from trading_game.config.scenario_config import SPOT_SHOCKS, TIME_ROLLS_DAYS, VOL_SHOCKS
+from trading_game.config.settings import BASE, HISTORY_MAXLEN, STARTING_CASH
+from trading_game.utils.app_utils import new_id
+from trading_game.utils.history_buffer import HistoryBuffer
+
+# Stock fields kept in the journal to rebuild a stock position
+STOCK_FIELDS = {"name", "ticker", "sector", "init_price", "init_vol"}
+# Event fields drawn at booking time (ids, wall-clock time), taken from the recording on replay
+EVENT_ID_FIELDS = ("trade_id", "key", "time")
+
+
+def _without_ids(event: dict) -> dict:
+    return {name: value for name, value in event.items() if name not in EVENT_ID_FIELDS}
+
 
 class Book(BaseModel):
 
     """
     Portfolio Book for tracking options and stock positions
     Handles trade history, PnL calculation, and risk metrics
+    Every mutation is an event (see apply_event), appended to the journal when one is attached
     """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
 
     trades: Dict[str, Tuple[Strategy, int, float]] = Field(default_factory=dict, description="Trade positions: {ref_key: (Strategy, quantity, entry_price)}")
     stocks: Dict[str, Tuple[Stock, int, float]] = Field(default_factory=dict, description="Trade positions: {ref_key: (Stock, quantity, entry_price)}") # in case we add multiple stocks later
     stock_quantity: int = Field(default=0, description="Number of stock shares held")
     trade_history: Dict[str, Tuple[str, float, int,float, int, float, str, str]] = Field(default_factory=dict, description="Trade history: {trade_id: (time, spot_ref, quantity, price, asset_type, ref_key)}")
     cash: float = Field(default=STARTING_CASH, description="Cash available")
-    pnl_history: list[float] = Field(default=[0.0], description="History of PNL values")
+    pnl_history: HistoryBuffer = Field(
+        default_factory=lambda: HistoryBuffer([0.0], maxlen=HISTORY_MAXLEN), description="History of PNL values"
+    )
+    journal: Optional[TradeJournal] = Field(default=None, exclude=True, description="Append-only log of the mutations")
+
+    # Flattened columnar view of every option leg in `trades`, kept in sync by the mutating methods
+    _legs: LegTable = PrivateAttr(default_factory=LegTable)
+    # Secondary index of trade_history: {ref_key: [trade_id, ...]} in booking order
+    _trades_by_ref: Dict[str, List[str]] = PrivateAttr(default_factory=dict)
+    # Per-leg valuations memoized on (legs, spot, vol), shared by value / P&L / Greeks / positions
+    _pricing_cache: PricingCache = PrivateAttr(default_factory=PricingCache)
+    # Callbacks receiving every applied mutation event (game recorder)
+    _listeners: List[Callable[[dict], None]] = PrivateAttr(default_factory=list)
+    # Recorded events the next mutations must reproduce (game replay)
+    _expected: Optional[Deque[dict]] = PrivateAttr(default=None)
+
+    def model_post_init(self, __context) -> None:
+        """Build the leg table and the trade index from state passed at construction"""
+        self._legs.cache = self._pricing_cache
+        for strat_key, (strategy, quantity, entry_price) in self.trades.items():
+            self._legs.add(strat_key, strategy, quantity, entry_price)
+        for trade_id, record in self.trade_history.items():
+            self._trades_by_ref.setdefault(record[7], []).append(trade_id)
+
+    @property
+    def pricing_cache(self) -> PricingCache:
+        return self._pricing_cache
+
+    def _record_trade(self, trade_id: str, record: tuple) -> None:
+        """Write a trade_history record and keep the ref_key index in sync"""
+        previous = self.trade_history.get(trade_id)
+        if previous is not None:
+            # Overwritten record: drop the stale index entry
+            self._trades_by_ref[previous[7]].remove(trade_id)
+
+        self.trade_history[trade_id] = record
+        self._trades_by_ref.setdefault(record[7], []).append(trade_id)
+
+    def last_trade_price(self, ref_key: str, default: float) -> float:
+        """Price of the most recent trade on ref_key, or default if it was never traded"""
+        trade_ids = self._trades_by_ref.get(ref_key)
+        if trade_ids:
+            return self.trade_history[trade_ids[-1]][5]
+        return default
 
     @staticmethod
     def make_strat_key(strategy: Strategy) -> str:
-        """Generate a unique key for the strategy based on its name and a random token."""
-        token = secrets.token_hex(4)
-        strat_key = f"{strategy.name.replace(' ', '_').lower()}_{token}"
+        """Generate a unique key for the strategy based on its name and a monotonic id."""
+        strat_key = new_id(strategy.name.replace(' ', '_').lower())
         
         return strat_key
 
@@ -37,17 +102,18 @@ class Book(BaseModel):
         """ Check if the book has stocks"""
         return len(self.stocks) == 0
 
-    def add_pnl_point(self, spot_ref: float, vol_ref: float) -> None:
+    def add_pnl_point(self, spot_ref: float, vol_ref: float | VolSurface) -> None:
         """Add PNL computation to PNL history"""
         pnl = self.compute_book_pnl(spot_ref, vol_ref)
         self.pnl_history.append(pnl)
     
-    def add_trade_strategy(self, strategy: Strategy, quantity: int, spot_ref:float, volatility: float) -> str:
-        """Add a strategy trade (not individual legs) to the book"""
+    def add_trade_strategy(self, strategy: Strategy, quantity: int, spot_ref:float, volatility: float | VolSurface,
+                           trade_price: Optional[float] = None) -> str:
+        """Add a strategy trade (not individual legs) to the book, at trade_price (default: its theoretical price)"""
 
-        # Generate trade_id for the strategy trade according to time
+        # Generate a collision-free trade_id, the time is kept in the record
         timestamp = datetime.now().strftime('%H_%M_%S')
-        trade_id = f"strat_{timestamp}"
+        trade_id = new_id("strat")
 
         # Create a unique key for the strategy (based on its name and legs)
         strat_key = Book.make_strat_key(strategy)
@@ -55,88 +121,260 @@ class Book(BaseModel):
         # If quantity is zero, raise error
         if quantity == 0:
             raise ValueError("Quantity must be non-zero.")
-        
-        # Extract strikes from strategy for record-keeping
-        strikes = [opt.K for opt in strategy.options]
-
-        # Extract maturities from strategy for record-keeping
-        maturities = [opt.T for opt in strategy.options]
-
-        # Add the strategy trade to the book
-        trade_price= strategy.price(spot_ref, volatility)
-        self.trades[strat_key] = (strategy, quantity, trade_price)
-
-        # Record in trade history
-        self.trade_history[trade_id] = (
-            timestamp,          # time of trade
-            spot_ref,           # current spot reference
-            quantity,           # quantity bought/sold
-            strikes,            # strategy strikes
-            maturities,         # strategy maturities
-            trade_price,        # transaction price
-            strategy,           # asset type
-            strat_key           # internal reference key
-        )
 
-        # Update the amount of cash available
-        self.cash= self.cash - quantity * trade_price
+        # Book the strategy at its execution price, else its theoretical price
+        trade_price = float(strategy.price(spot_ref, volatility) if trade_price is None else trade_price)
+        event = {
+            "event": "strategy",
+            "trade_id": trade_id,
+            "key": strat_key,
+            "time": timestamp,
+            "spot": float(spot_ref),
+            "quantity": int(quantity),
+            "price": trade_price,
+            "strategy": strategy.model_dump(),
+        }
+        self._commit(event, strategy=strategy)
 
-        return trade_id
+        return event["trade_id"]
 
     def add_trade_stock(self, stock: Stock, quantity: int, spot_ref: float) -> str:
         """Update the quantity of the underlying stock and keep a track record of the trade"""
 
-        # Generate trade_id for the strategy trade according to time
+        # Generate a collision-free trade_id, the time is kept in the record
         timestamp = datetime.now().strftime('%H_%M_%S')
-        trade_id = f"stock_{timestamp}"
+        trade_id = new_id("stock")
 
         # Safety check
         if quantity == 0:
             raise ValueError("Quantity must be non-zero.")
 
-        # Update the stock quantity held - Only 1 stock
-        self.stock_quantity += quantity
+        # The 'price' of a stock trade is the spot reference
+        event = {
+            "event": "stock",
+            "trade_id": trade_id,
+            "key": f"{stock.ticker}",
+            "time": timestamp,
+            "spot": float(spot_ref),
+            "quantity": int(quantity),
+            "stock": stock.model_dump(include=STOCK_FIELDS),
+        }
+        self._commit(event, stock=stock)
+
+        return event["trade_id"]
 
-        # Define stock key (unique reference)
-        stock_key = f"{stock.ticker}"
+    def adjust_cash(self, amount: float, reason: str = "") -> None:
+        """Cash movement outside the booked trade price (execution premium, fees...), journaled like the trades"""
+        self._commit({"event": "cash", "amount": float(amount), "reason": reason})
 
-        # The 'price' of a stock trade is the spot reference
-        trade_price = spot_ref
+    def roll_time(self, dt: float, spot_ref: float) -> float:
+        """
+        Time decay: shorten the remaining maturity of every leg by dt years (in the leg table only,
+        the Strategy objects keep their booking maturities). Expired legs settle at intrinsic value into cash.
+        Returns the settlement cash.
+        """
+        if dt <= 0 or len(self._legs) == 0:
+            return 0.0
+        return self._commit({"event": "roll", "dt": float(dt), "spot": float(spot_ref)})
+
+    # ---- Event sourcing ----
+    def subscribe(self, callback: Callable[[dict], None]) -> None:
+        """Call callback(event) after every mutation"""
+        self._listeners.append(callback)
+
+    def expect_events(self, events: List[dict]) -> None:
+        """
+        Replay mode: the next mutations must reproduce these recorded events, in order, and take their ids
+        and timestamps, so the book ends up bit-identical to the recorded one.
+        """
+        self._expected = deque(events)
+
+    def _commit(self, event: dict, strategy: Optional[Strategy] = None, stock: Optional[Stock] = None):
+        """Apply a mutation event, then append it to the journal (snapshotting the book when one is due)"""
+        if self._expected is not None:
+            recorded = self._expected.popleft() if self._expected else None
+            if recorded is None or _without_ids(recorded) != _without_ids(event):
+                raise ValueError(f"Book mutation {_without_ids(event)} differs from the recorded one {recorded}.")
+            event.update(recorded)
+
+        result = self.apply_event(event, strategy, stock)
+        if self.journal is not None:
+            self.journal.append(event)
+            if self.journal.snapshot_due():
+                self.journal.write_snapshot(self.state_dict())
+        for callback in self._listeners:
+            callback(event)
+        return result
+
+    def apply_event(self, event: dict, strategy: Optional[Strategy] = None, stock: Optional[Stock] = None):
+        """
+        Apply one journal event to the book. Live mutations pass the Strategy / Stock they already hold,
+        a replay rebuilds them from the event. Returns the settlement cash of a roll, whether a position was removed.
+        """
+        kind = event["event"]
+
+        if kind == "strategy":
+            strategy = strategy or Strategy.model_validate(event["strategy"])
+            strat_key, quantity, trade_price = event["key"], event["quantity"], event["price"]
+
+            # Add the strategy trade to the book
+            self.trades[strat_key] = (strategy, quantity, trade_price)
+            self._legs.add(strat_key, strategy, quantity, trade_price)
+
+            # Record in trade history
+            self._record_trade(event["trade_id"], (
+                event["time"],                          # time of trade
+                event["spot"],                          # current spot reference
+                quantity,                               # quantity bought/sold
+                [opt.K for opt in strategy.options],    # strategy strikes
+                [opt.T for opt in strategy.options],    # strategy maturities
+                trade_price,                            # transaction price
+                strategy,                               # asset type
+                strat_key                               # internal reference key
+            ))
+
+            # Update the amount of cash available
+            self.cash = self.cash - quantity * trade_price
+
+        elif kind == "stock":
+            stock_key, quantity, trade_price = event["key"], event["quantity"], event["spot"]
+            if stock is None:
+                held = self.stocks.get(stock_key)
+                stock = held[0] if held is not None else Stock(**event["stock"])
+
+            # Update the stock quantity held - Only 1 stock
+            self.stock_quantity += quantity
+
+            # Register trade in the book : update the quantity held
+            if stock_key in self.stocks:
+                existing_stock, existing_qty, _ = self.stocks[stock_key]
+                self.stocks[stock_key] = (stock, existing_qty + quantity, trade_price)
+            else:
+                self.stocks[stock_key] = (stock, quantity, trade_price)
+
+            # Record in trade history
+            self._record_trade(event["trade_id"], (
+                event["time"],      # time of trade
+                event["spot"],      # current spot reference
+                quantity,           # quantity bought/sold
+                None,
+                None,
+                trade_price,        # transaction price
+                stock.ticker,       # asset type
+                stock_key           # internal reference key
+            ))
+
+            # Update the amount of cash available
+            self.cash = self.cash - quantity * trade_price
+
+        elif kind == "cash":
+            self.cash = self.cash + event["amount"]
+
+        elif kind == "roll":
+            settlement = self._legs.roll(event["dt"], event["spot"])
+            self.cash = self.cash + settlement
+            return settlement
+
+        elif kind == "remove":
+            position_key = event["key"]
+            if position_key in self.trades:
+                del self.trades[position_key]
+                self._legs.remove(position_key)
+                return True
+            return self.stocks.pop(position_key, None) is not None
+
+        elif kind == "clear":
+            # Remove all strategy and stock positions
+            self.trades.clear()
+            self.stocks.clear()
+            self._legs.clear()
+
+            # Reset aggregate stock quantity
+            self.stock_quantity = 0
+
+            # Clear trade history
+            self.trade_history.clear()
+            self._trades_by_ref.clear()
 
-        # Register trade in the book : update the quantity held
-        if stock_key in self.stocks:
-            existing_stock, existing_qty, _ = self.stocks[stock_key]
-            new_quantity = existing_qty + quantity
-            self.stocks[stock_key] = (stock, new_quantity, trade_price)
         else:
-            self.stocks[stock_key] = (stock, quantity, trade_price)
-
-        # Record in trade history
-        self.trade_history[trade_id] = (
-            timestamp,          # time of trade
-            spot_ref,           # current spot reference
-            quantity,           # quantity bought/sold
-            None,
-            None,
-            trade_price,        # transaction price
-            stock.ticker,       # asset type
-            stock_key           # internal reference key
-        )
-        # Update the amount of cash available
-        self.cash= self.cash - quantity * trade_price
+            raise ValueError(f"Unknown book event: {kind}")
 
-        return trade_id
+    def state_dict(self) -> dict:
+        """
+        Positions, trade history, cash and leg table as plain data (journal snapshots).
+        Each strategy is stored once, trade records point to it through their ref_key.
+        """
+        strategies = {strat_key: strategy.model_dump() for strat_key, (strategy, _, _) in self.trades.items()}
+        history = {}
+        for trade_id, (timestamp, spot_ref, quantity, _, _, trade_price, asset, ref_key) in self.trade_history.items():
+            if isinstance(asset, Strategy):
+                if ref_key not in strategies:
+                    strategies[ref_key] = asset.model_dump()
+                asset = None
+            history[trade_id] = [timestamp, spot_ref, quantity, trade_price, asset, ref_key]
+
+        return {
+            "cash": self.cash,
+            "stock_quantity": self.stock_quantity,
+            "strategies": strategies,
+            "trades": {strat_key: [quantity, price] for strat_key, (_, quantity, price) in self.trades.items()},
+            "stocks": {
+                stock_key: [stock.model_dump(include=STOCK_FIELDS), quantity, price]
+                for stock_key, (stock, quantity, price) in self.stocks.items()
+            },
+            "history": history,
+            "legs": self._legs.state(),
+        }
 
-    def compute_book_value(self, spot_ref: float, volatility: float) -> float:
-        """Calculate total mark-to-market value of the book."""
+    def load_state(self, state: dict) -> None:
+        """Replace the book content with a state_dict()"""
+        strategies = {strat_key: Strategy.model_validate(dump) for strat_key, dump in state["strategies"].items()}
+        self.trades = {strat_key: (strategies[strat_key], quantity, price)
+                       for strat_key, (quantity, price) in state["trades"].items()}
+        self.stocks = {stock_key: (Stock(**fields), quantity, price)
+                       for stock_key, (fields, quantity, price) in state["stocks"].items()}
 
-        value = 0.0
+        self.trade_history.clear()
+        self._trades_by_ref.clear()
+        for trade_id, (timestamp, spot_ref, quantity, trade_price, ticker, ref_key) in state["history"].items():
+            if ticker is None:
+                strategy = strategies[ref_key]
+                record = (timestamp, spot_ref, quantity, [opt.K for opt in strategy.options],
+                          [opt.T for opt in strategy.options], trade_price, strategy, ref_key)
+            else:
+                record = (timestamp, spot_ref, quantity, None, None, trade_price, ticker, ref_key)
+            self._record_trade(trade_id, record)
 
-        # ---- Strategies ----
-        for strat_key, (strategy, quantity, entry_price) in self.trades.items():
-            if isinstance(strategy, Strategy):
-                strat_value = strategy.price(spot_ref, volatility)
-                value += quantity * strat_value
+        self._legs.load_state(state["legs"])
+        self.cash = state["cash"]
+        self.stock_quantity = state["stock_quantity"]
+
+    @classmethod
+    def restore(cls, journal: TradeJournal, stocks: Optional[Dict[str, Stock]] = None) -> "Book":
+        """
+        Rebuild a book from its journal (latest snapshot, then the events appended after it) and keep
+        journaling to it. stocks maps tickers to the live Stock objects to attach to the stock positions.
+        """
+        state, tail = journal.recover()
+        book = cls()
+        if state is not None:
+            book.load_state(state)
+        for event in tail:
+            book.apply_event(event)
+
+        for stock_key, stock in (stocks or {}).items():
+            if stock_key in book.stocks:
+                _, quantity, price = book.stocks[stock_key]
+                book.stocks[stock_key] = (stock, quantity, price)
+
+        book.journal = journal
+        return book
+
+    def compute_book_value(self, spot_ref: float, volatility: float | VolSurface) -> float:
+        """Calculate total mark-to-market value of the book."""
+
+        # ---- Strategies (one vectorized pass over all legs) ----
+        value = self._legs.value_and_pnl(spot_ref, volatility)["value"]
 
         # ---- Stocks ----
         for stock_key, (stock, quantity, entry_price) in self.stocks.items():
@@ -170,49 +408,25 @@ class Book(BaseModel):
         return total_stock_pnl
 
 
-    def compute_book_pnl(self, spot_ref: float, volatility: float) -> float:
+    def compute_book_pnl(self, spot_ref: float, volatility: float | VolSurface) -> float:
         """Compute total PnL of the book using trade history."""
 
-        total_pnl = 0.0
-
         # ---- PnL Strategies ----
-        for strat_key, (strategy, quantity, entry_price) in self.trades.items():
-
-            # Mark-to-market PnL
-            if isinstance(strategy, Strategy):
-                current_price = strategy.price(spot_ref, volatility)
-
-                # Find the last trade price for this strategy from trade history
-                matching_trades = [
-                    record for record in self.trade_history.values()
-                    if record[7] == strat_key and isinstance(record[6], Strategy)
-                ]
-                if matching_trades:
-                    entry_trade_price = matching_trades[-1][5]
-                else:
-                    entry_trade_price = entry_price  # fallback
-
-                pnl = quantity * (current_price - entry_trade_price)
-                total_pnl += pnl
+        # Mark-to-market against the trade price recorded when the strategy was booked
+        # (the same price add_trade_strategy writes to trade_history)
+        total_pnl = self._legs.value_and_pnl(spot_ref, volatility)["pnl"]
 
         # ---- PnL Stocks ----
         for stock_key, (stock, quantity, entry_price) in self.stocks.items():
-            # Find last stock trade
-            matching_trades = [
-                record for record in self.trade_history.values()
-                if record[7] == stock_key and isinstance(record[6], str)
-            ]
-            if matching_trades:
-                entry_trade_price = matching_trades[-1][5]
-            else:
-                entry_trade_price = entry_price
+            # Last stock trade, looked up through the ref_key index
+            entry_trade_price = self.last_trade_price(stock_key, entry_price)
 
             pnl = quantity * (spot_ref - entry_trade_price)
             total_pnl += pnl
 
         return total_pnl
     
-    def strategy_pnl(self, strat_key:float, spot_ref: float, volatility: float) -> float:
+    def strategy_pnl(self, strat_key:float, spot_ref: float, volatility: float | VolSurface) -> float:
         """Compute PnL for a specific strategy in the book."""
 
         if strat_key not in self.trades:
@@ -223,43 +437,71 @@ class Book(BaseModel):
         if not isinstance(strategy, Strategy):
             raise ValueError(f"The key {strat_key} does not correspond to a Strategy.")
 
-        current_price = strategy.price(spot_ref, volatility)
+        # Priced from the leg table, which holds the remaining maturities
+        current_price = self._legs.strategy_price(strat_key, spot_ref, volatility)
 
-        # Find the last trade price for this strategy from trade history
-        matching_trades = [
-            record for record in self.trade_history.values()
-            if record[7] == strat_key and isinstance(record[6], Strategy)
-        ]
-        if matching_trades:
-            entry_trade_price = matching_trades[-1][5]
-        else:
-            entry_trade_price = entry_price  # fallback
+        # Last trade price for this strategy, looked up through the ref_key index
+        entry_trade_price = self.last_trade_price(strat_key, entry_price)
 
         pnl = quantity * (current_price - entry_trade_price)
 
         return pnl
 
-    def compute_greeks(self, spot_ref: float, volatility: float) -> Dict[str, float]:
-        """Calculate aggregated Greeks for the entire portfolio."""
+    def _scenario_pnl(self, spots: np.ndarray, vol_scales, time_rolls, volatility: float | VolSurface) -> np.ndarray:
+        """Book pnl (strategies + stocks) for broadcastable arrays of scenario spots, vol scales and time rolls"""
+        pnl = self._legs.scenario_pnl(spots, vol_scales, time_rolls, volatility)
+        for stock_key, (stock, quantity, entry_price) in self.stocks.items():
+            pnl = pnl + quantity * (spots - self.last_trade_price(stock_key, entry_price))
+        return pnl
 
-        # Initialize total Greeks
-        total_greeks = {
-            "delta": 0.0,
-            "gamma": 0.0,
-            "vega": 0.0,
-            "theta": 0.0,
-            "rho": 0.0
+    def scenario_grid(self, spot_ref: float, volatility: float | VolSurface,
+                      spot_shocks: Sequence[float] = SPOT_SHOCKS, vol_shocks: Sequence[float] = VOL_SHOCKS,
+                      time_rolls: Sequence[float] = TIME_ROLLS_DAYS) -> Dict[str, np.ndarray]:
+        """
+        Full revaluation of the book over a spot x vol x time grid, in one vectorized pass over every leg.
+        Shocks are relative (spot * (1 + spot_shock), each leg vol * (1 + vol_shock)), time rolls in business days.
+        Returns the axes, the scenario pnl (n_spot, n_vol, n_time) and its change versus the current pnl.
+        """
+        spot_shocks = np.asarray(spot_shocks, dtype=float)
+        vol_shocks = np.asarray(vol_shocks, dtype=float)
+        time_rolls = np.asarray(time_rolls, dtype=float)
+
+        spots = spot_ref * (1 + spot_shocks)[:, None, None]
+        pnl = self._scenario_pnl(
+            spots, (1 + vol_shocks)[None, :, None], (time_rolls / BASE)[None, None, :], volatility
+        )
+        pnl = np.broadcast_to(pnl, (len(spot_shocks), len(vol_shocks), len(time_rolls)))
+
+        return {
+            "spot_shocks": spot_shocks,
+            "vol_shocks": vol_shocks,
+            "time_rolls": time_rolls,
+            "pnl": pnl,
+            "pnl_change": pnl - self.compute_book_pnl(spot_ref, volatility),
         }
 
-        # ---- 1️⃣ From strategies ----
-        for strat_key, (strategy, quantity, _) in self.trades.items():
-            if isinstance(strategy, Strategy):
-                greeks_calc = Greeks(strategy=strategy)
-                strat_greeks = greeks_calc.all_greeks(spot_ref, volatility)
+    def stress_test(self, spot_ref: float, volatility: float | VolSurface, scenarios: List[dict]) -> List[dict]:
+        """
+        P&L change under a list of stress scenarios ({"spot_shock", "vol_shock"}, optional "time_roll" in days,
+        e.g. the presets of config.scenario_config), revalued together in one pass.
+        """
+        if not scenarios:
+            return []
+
+        spot_shocks = np.array([scenario["spot_shock"] for scenario in scenarios], dtype=float)
+        vol_shocks = np.array([scenario["vol_shock"] for scenario in scenarios], dtype=float)
+        time_rolls = np.array([scenario.get("time_roll", 0) for scenario in scenarios], dtype=float)
+
+        pnl = self._scenario_pnl(spot_ref * (1 + spot_shocks), 1 + vol_shocks, time_rolls / BASE, volatility)
+        base_pnl = self.compute_book_pnl(spot_ref, volatility)
+        return [{**scenario, "pnl": float(p), "pnl_change": float(p - base_pnl)} for scenario, p in zip(scenarios, pnl)]
+
+    def compute_greeks(self, spot_ref: float, volatility: float | VolSurface) -> Dict[str, float]:
+        """Calculate aggregated Greeks for the entire portfolio."""
 
-                # Aggregate weighted greeks
-                for greek_name, greek_value in strat_greeks.items():
-                    total_greeks[greek_name] += quantity * greek_value
+        # ---- 1️⃣ From strategies (quantity-weighted, one vectorized pass over all legs) ----
+        book_totals = self._legs.book_totals(spot_ref, volatility)
+        total_greeks = {greek_name: book_totals[greek_name] for greek_name in GREEK_NAMES}
 
         # ---- 2️⃣ From stocks ----
         for stock_key, (stock, quantity, _) in self.stocks.items():
@@ -268,7 +510,7 @@ class Book(BaseModel):
 
         return total_greeks
 
-    def compute_greeks_cash(self, spot_ref: float, volatility: float) -> Dict[str, float]:
+    def compute_greeks_cash(self, spot_ref: float, volatility: float | VolSurface) -> Dict[str, float]:
         """
         Calculate portfolio Greeks expressed in cash terms.
         Conventions used here:
@@ -298,7 +540,7 @@ class Book(BaseModel):
         return cash_greeks
 
     
-    def get_positions_summary(self, spot_ref: float, volatility: float) -> Dict:
+    def get_positions_summary(self, spot_ref: float, volatility: float | VolSurface) -> Dict:
         """Get a summary of all positions in the book (strategies + stocks)."""
 
         # ---- 1️⃣ Global summary ----
@@ -311,12 +553,17 @@ class Book(BaseModel):
         }
 
         # ---- 2️⃣ Strategies summary ----
+        legs = self._legs.evaluate(spot_ref, volatility)
+        strat_values = {name: self._legs.per_strategy(legs[name]) for name in ("price",) + GREEK_NAMES}
+        strat_values["price"] = strat_values["price"] + self._legs.settled  # Expired legs at their payoff
+
         for strat_key, (strategy, quantity, entry_price) in self.trades.items():
             if isinstance(strategy, Strategy):
 
                 # Greeks + current value
-                strat_greeks = Greeks(strategy=strategy).all_greeks(spot_ref, volatility)
-                current_value = strategy.price(spot_ref, volatility)
+                idx = self._legs.key_index[strat_key]
+                strat_greeks = {name: float(strat_values[name][idx]) for name in GREEK_NAMES}
+                current_value = float(strat_values["price"][idx])
                 strat_side = "LONG" if quantity > 0 else "SHORT"
 
                 summary["strategies"].append({
@@ -362,34 +609,17 @@ class Book(BaseModel):
     # If the player wants to reset their book
     def clear_book(self):
         """Clear all positions and trade history (keeps stock objects structure)."""
-        
-        # Remove all strategy and stock positions
-        self.trades.clear()
-        self.stocks.clear()
-
-        # Reset aggregate stock quantity
-        self.stock_quantity = 0
-
-        # Clear trade history
-        self.trade_history.clear()
+        self._commit({"event": "clear"})
 
-    
     def remove_position(self, position_key: str) -> bool:
         """Remove a strategy or stock position from the book by its key."""
 
-        # Try removing a strategy position
-        if position_key in self.trades:
-            del self.trades[position_key]
-            return True
+        # Nothing found
+        if position_key not in self.trades and position_key not in self.stocks:
+            return False
 
-        # Try removing a stock position
-        if position_key in self.stocks:
-            del self.stocks[position_key]
-            return True
+        return self._commit({"event": "remove", "key": position_key})
 
-        # Nothing found
-        return False
-    
     @staticmethod
     def _exposure_level(x: float, low: float, high: float) -> str:
         """ Check if the exposure is in the limits range"""
@@ -401,3 +631,85 @@ class Book(BaseModel):
             return "high"
 
 
+def benchmark_scenario_grid(n_legs: int = 500, n_spots: int = 50, n_vols: int = 20, seed: int = 0,
+                            repeat: int = 10) -> dict:
+    """
+    Milliseconds of a scenario_grid over a book of n_legs random call / put spread legs, on n_spots x n_vols
+    x 5 time rolls, with a flat vol and with a vol surface (best of repeat runs). The target is under 100 ms.
+    """
+    spot = 100.0
+    surface = VolSurface(spot_ref=spot, atm_vol=0.25)
+    rng = np.random.default_rng(seed)
+    book = Book()
+    while len(book._legs) < n_legs:
+        k = float(rng.uniform(70, 130))
+        t = float(rng.choice([0.02, 0.1, 0.25, 0.5, 1.0]))
+        factory = Strategy.call_spread if rng.random() < 0.5 else Strategy.put_spread
+        book.add_trade_strategy(factory(k, k + 10, t, 0.03), int(rng.integers(1, 6)) * int(rng.choice([-1, 1])),
+                                spot, surface)
+
+    spot_shocks, vol_shocks = np.linspace(-0.3, 0.3, n_spots), np.linspace(-0.5, 1.5, n_vols)
+    time_rolls = [0, 1, 5, 10, 21]
+    report = {}
+    for name, volatility in (("flat", 0.25), ("surface", surface)):
+        grid = lambda: book.scenario_grid(spot, volatility, spot_shocks, vol_shocks, time_rolls)
+        grid()
+        report[name] = min(timeit.repeat(grid, number=1, repeat=repeat)) * 1e3
+    return report
+
+
+def benchmark_trade_lookup(n_trades: int = 10_000, n_strategies: int = 50, seed: int = 0, repeat: int = 5) -> dict:
+    """
+    Book n_trades trades (n_strategies strategies, stock trades otherwise), then time the P&L of the book and of
+    each strategy, looking the last trade price up through the ref_key index against scanning trade_history
+    for every position (best of repeat runs). Returns milliseconds of each phase and the lookup speedup.
+    """
+    rng = np.random.default_rng(seed)
+    stock = Stock(name="Benchmark", ticker="BNCH", sector="Tech", init_price=100.0, init_vol=0.2)
+    book = Book(cash=1e12)
+    strategy_at = set(np.linspace(0, n_trades - 1, n_strategies, dtype=int).tolist())
+
+    start = timeit.default_timer()
+    for i in range(n_trades):
+        if i in strategy_at:
+            k = float(rng.uniform(80.0, 120.0))
+            book.add_trade_strategy(Strategy.call_spread(k, k + 5.0, 0.5, 0.03), 1, 100.0, 0.2)
+        else:
+            book.add_trade_stock(stock, int(rng.choice([-10, 10])), float(rng.uniform(95.0, 105.0)))
+    booking_ms = (timeit.default_timer() - start) * 1e3
+
+    def scanned_price(ref_key: str, default: float) -> float:
+        matching = [record for record in book.trade_history.values() if record[7] == ref_key]
+        return matching[-1][5] if matching else default
+
+    def pnl(last_price) -> float:
+        total = book._legs.value_and_pnl(100.0, 0.2)["pnl"]
+        for stock_key, (_, quantity, entry_price) in book.stocks.items():
+            total += quantity * (100.0 - last_price(stock_key, entry_price))
+        for strat_key, (_, quantity, entry_price) in book.trades.items():
+            current = book._legs.strategy_price(strat_key, 100.0, 0.2)
+            total += quantity * (current - last_price(strat_key, entry_price))
+        return total
+
+    report = {"booking_ms": booking_ms}
+    for name, last_price in (("indexed", book.last_trade_price), ("scanned", scanned_price)):
+        report[f"{name}_ms"] = min(timeit.repeat(lambda: pnl(last_price), number=1, repeat=repeat)) * 1e3
+    report["speedup"] = report["scanned_ms"] / report["indexed_ms"]
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Book scenario grid and last-trade lookups on a large history")
+    parser.add_argument("--legs", type=int, default=500, help="Option legs in the scenario grid book")
+    parser.add_argument("--trades", type=int, default=10_000, help="Trades in the lookup book")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for name, ms in benchmark_scenario_grid(args.legs, seed=args.seed).items():
+        print(f"{name:>10}  {ms:8.2f} ms")
+    for name, value in benchmark_trade_lookup(args.trades, seed=args.seed).items():
+        print(f"{name:>10}  {value:8.2f}{'x' if name == 'speedup' else ' ms'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List
+
+from trading_game.config.settings import RISK_THRESHOLDS
+from trading_game.models.vol_surface import VolSurface
+from .book import Book
+
+
+class BookSnapshot(BaseModel):
+    """
+    Read-only view of the book at one market state (one tick), computed once and shared by every layout:
+    totals, Greeks and cash Greeks, exposure levels and one row per position.
+    All figures come from a single pricing pass (the book's pricing cache serves the repeated lookups).
+    """
+
+    tick: int = 0
+    spot_ref: float
+    cash: float
+    total_value: float
+    total_pnl: float
+    greeks: Dict[str, float]
+    greeks_cash: Dict[str, float]
+    exposure: Dict[str, str] = Field(description="Exposure level per Greek: neutral, moderate or high")
+    strategies: List[dict] = Field(default_factory=list, description="One row per strategy position")
+    stocks: List[dict] = Field(default_factory=list, description="One row per stock position")
+    stock_position: int = 0
+    stock_pnl: float = 0.0
+
+    @classmethod
+    def take(cls, book: Book, spot_ref: float, volatility: float | VolSurface, tick: int = 0) -> "BookSnapshot":
+        """Value the book once at (spot_ref, volatility)"""
+        summary = book.get_positions_summary(spot_ref, volatility)
+        greeks = summary["total_greeks"]
+
+        strategies = []
+        for row in summary["strategies"]:
+            strategy, quantity, _ = book.trades[row["key"]]
+            strategies.append({
+                **row,
+                "signed_quantity": quantity,
+                "strikes": [opt.K for opt in strategy.options],
+                "maturities": [opt.T for opt in strategy.options],
+                "pnl": book.strategy_pnl(row["key"], spot_ref, volatility),
+                "delta_cash": row["delta"] * spot_ref,
+                "gamma_cash": 0.5 * row["gamma"] * spot_ref ** 2,
+            })
+
+        return cls(
+            tick=tick,
+            spot_ref=spot_ref,
+            cash=book.cash,
+            total_value=summary["total_value"],
+            total_pnl=summary["total_pnl"],
+            greeks=greeks,
+            greeks_cash=book.compute_greeks_cash(spot_ref, volatility),
+            exposure={
+                name: Book._exposure_level(greeks[name], low, high) for name, (low, high) in RISK_THRESHOLDS.items()
+            },
+            strategies=strategies,
+            stocks=summary["stocks"],
+            stock_position=book.stock_quantity,
+            stock_pnl=book.stocks_pnl(spot_ref),
+        )
+
+    def is_empty(self) -> bool:
+        """No strategy and no stock position"""
+        return not self.strategies and not self.stocks
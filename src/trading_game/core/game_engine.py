@@ -0,0 +1,355 @@
+from collections import deque
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Deque, Dict, List, Literal, Optional
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+from trading_game.config.settings import (
+    GAME_DURATION, MARKET_DEPTH, MAX_OPTION_POSITION, TIME_DECAY, TIME_SCALE, TRANSACTION_COST
+)
+from trading_game.core.book import Book
+from trading_game.core.game_recorder import GameRecorder
+from trading_game.core.legs import price_legs
+from trading_game.core.manual_trading import Order, OrderExecutor, OrderSide, OrderType, StrategyOrder
+from trading_game.core.quote_request import QuoteRequest
+from trading_game.models.clock import Clock, WallClock
+from trading_game.models.shock import MarketShock, StateShock
+from trading_game.models.stock import Stock
+from trading_game.models.street import Street
+from trading_game.models.vol_surface import VolSurface
+from trading_game.utils.app_utils import new_id, pick, spawn_rngs
+
+
+class GameEngine(BaseModel):
+    """
+    Headless game loop: owns the market (Stock, MarketShock, Street), the player (Book, OrderExecutor)
+    and the client quote-request state. Pure Python, so games can run without a browser;
+    the Streamlit app is a thin adapter that calls step() on each autorefresh.
+    With a SimulatedClock a whole game runs as fast as the CPU allows, with the same moves as a real-time game.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    clock: Clock = Field(default_factory=WallClock, exclude=True)
+    rng: Optional[np.random.Generator] = Field(default=None, exclude=True, repr=False)  # Client flow stream
+    stock: Stock
+    street: Street
+    shock: MarketShock
+    vol_surface: Optional[VolSurface] = None
+    book: Book = Field(default_factory=Book)
+    order_executor: OrderExecutor = Field(
+        default_factory=lambda: OrderExecutor(max_position_size=MAX_OPTION_POSITION, market_depth=MARKET_DEPTH)
+    )
+
+    # Game flow
+    game_duration: int = GAME_DURATION
+    tick_count: int = 0
+    game_over: bool = False
+    time_decay: bool = TIME_DECAY
+
+    # Market shock
+    shock_happened: bool = False
+    shocked_vol: float = -999
+
+    # Quote requests
+    quote_request: Optional[QuoteRequest] = None
+    quote_request_history: List[QuoteRequest] = Field(default_factory=list)
+    result: Optional[bool] = None
+    quote_chat_history: List[dict] = Field(default_factory=list)
+    pending_quote: Optional[str] = None
+    last_quote_tick: int = 0
+    quote_cleared_tick: int = -999
+
+    # Recording of the ticks and player actions (see GameRecorder), quote requests served by a replay
+    recorder: Optional[GameRecorder] = Field(default=None, exclude=True, repr=False)
+    _replay_quotes: Optional[Deque[QuoteRequest]] = PrivateAttr(default=None)
+
+    @classmethod
+    def new_game(cls, game_duration: int = GAME_DURATION, clock: Optional[Clock] = None,
+                 seed: Optional[int | np.random.SeedSequence] = None, time_decay: bool = TIME_DECAY):
+        """
+        Start a game on a random stock with a random street and shock.
+        The stock, shock, street and client flow each draw from their own stream spawned from seed,
+        so a given seed always replays the same market whatever the player does.
+        """
+        clock = clock or WallClock()
+        market_rng, shock_rng, street_rng, client_rng = spawn_rngs(seed, 4)
+        stock = Stock.stock(clock=clock, rng=market_rng)
+        return cls(
+            clock=clock,
+            rng=client_rng,
+            stock=stock,
+            vol_surface=VolSurface.from_stock(stock),
+            street=Street.street(rng=street_rng),
+            shock=MarketShock.shock(name=stock.name, sector=stock.sector, clock=clock, rng=shock_rng),
+            game_duration=game_duration,
+            time_decay=time_decay
+        )
+
+    # ---- Game loop ----
+    def _recorded(self):
+        """Context of an engine call: book mutations inside it are replayed by the engine itself"""
+        return self.recorder.engine_call() if self.recorder is not None else nullcontext()
+
+    def step(self) -> bool:
+        """Play one tick. Returns False once the game is over."""
+        with self._recorded():
+            played = self._play_tick()
+        if played and self.recorder is not None:
+            self.recorder.record_tick(self)
+        return played
+
+    def _play_tick(self) -> bool:
+        if self.game_over:
+            return False
+
+        if self.tick_count >= self.game_duration:
+            self.game_over = True
+            return False
+
+        # Move time forward (no-op for the wall clock)
+        self.clock.advance()
+
+        # Valuations of the previous tick are stale
+        self.book.pricing_cache.new_tick(self.tick_count)
+
+        # Update shock
+        shock_dict = self.manage_shock()
+
+        # Update stock
+        previous_time = self.stock.last_time
+        self.stock.move_stock(shock_dict, self.shocked_vol)
+
+        # Time decay over the same dt as the stock move
+        if self.time_decay:
+            self.book.roll_time((self.stock.last_time - previous_time) / TIME_SCALE, self.stock.last_price)
+        if self.vol_surface is not None:
+            self.vol_surface.follow(self.stock)
+
+        # Resting orders crossed by the new market
+        self.order_executor.on_tick(self.stock.last_price, self.market_vol)
+        self.book_fills()
+
+        # Update PNL history
+        self.book.add_pnl_point(self.stock.last_price, self.market_vol)
+
+        # Update tick count
+        self.tick_count += 1
+
+        # Client flow for the new tick
+        self.manage_quote_requests()
+        return True
+
+    def manage_shock(self) -> Dict[str, str | Literal['positive', 'negative'] | StateShock | float]:
+        shock = self.shock
+
+        # If more than 12 ticks and shock hasn't already happened a shock happens on the market
+        if shock.shock_state == StateShock.NONE and self.tick_count >= 12 and not self.shock_happened:
+            shock.trigger_shock()
+            self.shock_happened = True
+            self.shocked_vol = self.stock.init_vol * shock.vol_spike
+
+        # If the shock just happened, the effect starts fading
+        elif shock.shock_state == StateShock.HAPPENING:
+            shock.decay_shock()
+
+        # If the shock is almost gone, back to initial state
+        elif shock.shock_state == StateShock.DECAY and abs(self.stock.last_vol - self.stock.init_vol) < 0.01:
+            shock.stop_shock()
+
+        return shock.model_dump()
+
+    # ---- Client quote requests ----
+    def manage_quote_requests(self) -> None:
+        """Manages the timing of quote requests (safe to call several times per tick)"""
+        current_tick = self.tick_count
+
+        # Clear chat three ticks after market response
+        if current_tick == self.quote_cleared_tick + 3:
+            self.clear_chat()
+
+            # Reset for next quote
+            self.quote_request = None
+            self.result = None
+
+        # First quote at tick 3, then 4 ticks after the previous one was cleared
+        first_quote = current_tick >= 3 and self.last_quote_tick == 0
+        next_quote = (self.quote_cleared_tick > 0 and current_tick == self.quote_cleared_tick + 4
+                      and current_tick > self.last_quote_tick)
+        if first_quote or next_quote:
+            self._new_quote_request()
+
+    def queue_quote_requests(self, quote_requests: List[QuoteRequest]) -> None:
+        """Serve these quote requests in order instead of drawing new ones (replay)"""
+        self._replay_quotes = deque(quote_requests)
+
+    def _new_quote_request(self) -> None:
+        if self._replay_quotes is not None:
+            quote_request = self._replay_quotes.popleft()
+        else:
+            investor = pick(self.street.investors, self.rng)
+            level = 'easy' if len(self.quote_request_history) <= 3 else 'hard'
+            quote_request = QuoteRequest(investor=investor, level=level, init_price=self.stock.last_price, rng=self.rng)
+        if self.recorder is not None:
+            self.recorder.record_quote_request(quote_request)
+        self.quote_request = quote_request
+        self.quote_request_history.append(quote_request)
+
+        message = quote_request.generate_request_message()
+        self.add_quote_request(message, quote_request.request_id)
+        self.last_quote_tick = self.tick_count
+
+    def respond_to_quote(self, bid: float, ask: float) -> bool:
+        """Answer the pending quote request with a bid/ask, the client hits, lifts or passes"""
+        with self._recorded():
+            quote_id = self.pending_quote
+            self.add_player_response(quote_id, bid, ask)
+
+            result = self.quote_request.evaluate_bid_ask(bid, ask, self.stock.last_price, self.market_vol)
+            self.result = result
+            final_answer = self.quote_request.generate_response_message(result)
+            self.add_market_response(quote_id, final_answer)
+
+        if self.recorder is not None:
+            self.recorder.record_response(bid, ask, result)
+        return result
+
+    # ---- Orders ----
+    @property
+    def market_vol(self) -> float | VolSurface:
+        """Vol orders are executed and re-evaluated on: the surface when there is one, else the stock's vol"""
+        return self.vol_surface if self.vol_surface is not None else self.stock.last_vol
+
+    def place_order(self, order: Order) -> bool:
+        """
+        Submit an order to the executor and match it at once, its fills are booked. The rest of a limit order
+        stays in the order book and fills on later ticks. Returns whether it was fully executed
+        """
+        submitted = GameRecorder.dump_order(order) if self.recorder is not None else None
+
+        with self._recorded():
+            executor = self.order_executor
+            if not self._affordable(order):
+                executor.reject_order(order, "Insufficient cash")
+                filled = False
+            else:
+                filled = executor.submit_order(order) and (
+                    executor.execute_strategy_order(order, self.market_vol) if isinstance(order, StrategyOrder)
+                    else executor.execute_vanilla_order(order, self.market_vol)
+                )
+            self.book_fills()
+
+        if submitted is not None:
+            self.recorder.record_order(submitted, filled)
+        return filled
+
+    def cancel_order(self, order_id: str) -> bool:
+        """Cancel a pending order (its filled part stays in the book)"""
+        cancelled = self.order_executor.cancel_order(order_id)
+        if self.recorder is not None:
+            self.recorder.record_amend("cancel", {"order_id": order_id}, cancelled)
+        return cancelled
+
+    def replace_order(self, order_id: str, quantity: Optional[int] = None, limit_price: Optional[float] = None) -> bool:
+        """
+        Amend a resting order (new total quantity and / or limit), matched again at the current market when it
+        loses its time priority. Returns False if the order is not resting
+        """
+        with self._recorded():
+            replaced = self.order_executor.replace_order(
+                order_id, quantity, limit_price, self.stock.last_price, self.market_vol
+            )
+            self.book_fills()
+
+        if self.recorder is not None:
+            self.recorder.record_amend(
+                "replace", {"order_id": order_id, "quantity": quantity, "limit_price": limit_price}, replaced
+            )
+        return replaced
+
+    def trade_stock(self, quantity: int) -> bool:
+        """
+        Buy (quantity > 0) or sell shares of the stock at the current spot, paying the premium and the transaction
+        cost. Returns False (nothing booked) if the cash does not cover them
+        """
+        spot = float(self.stock.last_price)
+        fees = abs(quantity) * spot * TRANSACTION_COST
+        traded = max(quantity, 0) * spot + fees <= self.book.cash
+
+        if traded:
+            with self._recorded():
+                self.book.add_trade_stock(self.stock, quantity, spot)
+                self.book.adjust_cash(-fees, "transaction cost")
+
+        if self.recorder is not None:
+            self.recorder.record_stock_trade(quantity, traded)
+        return traded
+
+    def _affordable(self, order: Order) -> bool:
+        """Buy orders need the cash to pay their limit (market orders: the current price) and transaction costs"""
+        if order.side == OrderSide.SELL:
+            return True
+        if order.order_type == OrderType.LIMIT:
+            price = order.limit_price
+        else:
+            price = abs(price_legs(order.to_legs(), order.spot_price, self.market_vol))
+        return price * order.quantity * (1 + TRANSACTION_COST) <= self.book.cash
+
+    def book_fills(self) -> None:
+        """Book the fills of the executor: the traded strategy at its fill price (paying the premium), and the fees"""
+        for order, fill in self.order_executor.take_fills():
+            self.book.add_trade_strategy(
+                order.to_strategy(), order.booked_quantity(fill.quantity), self.stock.last_price, self.market_vol,
+                trade_price=order.booked_price(fill.price),
+            )
+            self.book.adjust_cash(-fill.price * fill.quantity * TRANSACTION_COST, "transaction cost")
+
+    # ---- Chat ----
+    def add_quote_request(self, message: str, quote_id: str) -> None:
+        """Add a new quote request to the chat"""
+        self.quote_chat_history.append({
+            'msg_id': new_id("msg"),
+            'type': 'request',
+            'message': message,
+            'quote_id': quote_id,
+            'timestamp': datetime.now().strftime("%H:%M:%S")
+        })
+        self.pending_quote = quote_id
+
+    def add_player_response(self, quote_id: str, bid: float, ask: float) -> None:
+        """Add player's bid/ask response to the chat"""
+        self.quote_chat_history.append({
+            'msg_id': new_id("msg"),
+            'type': 'player_response',
+            'quote_id': quote_id,
+            'bid': bid,
+            'ask': ask,
+            'timestamp': datetime.now().strftime("%H:%M:%S")
+        })
+
+    def add_market_response(self, quote_id: str, final_answer: str) -> None:
+        self.quote_chat_history.append({
+            'msg_id': new_id("msg"),
+            'type': 'market_response',
+            'quote_id': quote_id,
+            'message': final_answer,
+            'timestamp': datetime.now().strftime("%H:%M:%S")
+        })
+
+        # Process result if exists (add trade to book)
+        if self.result:
+            qty = self.quote_request.quantity
+            way = 1 if self.quote_request.way == "sell" else -1
+            self.book.add_trade_strategy(
+                self.quote_request.strat,
+                qty * way,
+                self.stock.last_price,
+                self.market_vol)
+
+        self.quote_cleared_tick = self.tick_count
+        self.pending_quote = None
+
+    def clear_chat(self) -> None:
+        """Clear the chat history"""
+        self.quote_chat_history = list()
@@ -0,0 +1,342 @@
+import hashlib
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, List, Optional
+
+import numpy as np
+
+from trading_game.core.book import Book
+from trading_game.core.manual_trading import Order, OrderExecutor, StrategyOrder, VanillaOrder
+from trading_game.core.quote_request import QuoteRequest
+from trading_game.models.clock import Clock
+from trading_game.models.stock import Stock
+from trading_game.utils.history_buffer import HistoryBuffer
+
+if TYPE_CHECKING:
+    from trading_game.core.game_engine import GameEngine
+
+# Ticks between two checkpoints of the whole game state (seek granularity)
+CHECKPOINT_EVERY = 10
+
+ORDER_CLASSES = {cls.__name__: cls for cls in (VanillaOrder, StrategyOrder)}
+# Status buckets of the OrderExecutor
+ORDER_BUCKETS = ("pending_orders", "executed_orders", "rejected_orders", "cancelled_orders")
+
+
+class ReplayDivergence(ValueError):
+    """The replayed game differs from the recording"""
+
+
+class ReplayClock(Clock):
+    """Clock serving the recorded tick times: times[0] is the time at the replay start, advance() moves to the next"""
+    times: List[float]
+    index: int = 0
+
+    def now(self) -> float:
+        return self.times[self.index]
+
+    def advance(self, n_ticks: int = 1) -> float:
+        self.index = min(self.index + n_ticks, len(self.times) - 1)
+        return self.now()
+
+
+def book_digest(book: Book) -> str:
+    """Hash of the full book state (positions, history, cash, leg table, P&L history), equal only if bit-identical"""
+    state = book.state_dict()
+    state["pnl_history"] = book.pnl_history.tolist()
+    return hashlib.sha256(json.dumps(state, separators=(",", ":")).encode()).hexdigest()
+
+
+class GameRecorder:
+    """
+    Records a game so it can be replayed exactly: the output of every tick (stock move, shock state), each client
+    quote request, each player response, order, cancel, replace and stock trade, and every book mutation, tagged
+    "engine" when the engine made it (time decay, fills) and "player" otherwise. Every checkpoint_every ticks the whole
+    game state is checkpointed with a digest of the book. Records are kept in memory and, with a path, appended as JSON lines.
+    """
+
+    def __init__(self, path: Optional[str | Path] = None, checkpoint_every: int = CHECKPOINT_EVERY):
+        self.path = Path(path) if path is not None else None
+        self.checkpoint_every = checkpoint_every
+        self.records: List[dict] = []
+        self._engine_depth = 0
+        self._file = None
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_file"] = None
+        return state
+
+    def attach(self, engine) -> None:
+        """Start recording a game (its current state is the first checkpoint)"""
+        engine.recorder = self
+        engine.book.subscribe(self.record_book_event)
+        self.checkpoint(engine)
+
+    def _append(self, record: dict) -> None:
+        self.records.append(record)
+        if self.path is not None:
+            if self._file is None:
+                self._file = open(self.path, "a")
+            self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @classmethod
+    def load(cls, path: str | Path) -> "GameRecorder":
+        """Recording saved as JSON lines"""
+        recorder = cls()
+        with open(path) as f:
+            recorder.records = [json.loads(line) for line in f if line.endswith("\n")]
+        return recorder
+
+    # ---- Hooks called by the engine ----
+    @contextmanager
+    def engine_call(self) -> Iterator[None]:
+        """Book mutations inside an engine call are tagged "engine" (the replayed engine makes them again)"""
+        self._engine_depth += 1
+        try:
+            yield
+        finally:
+            self._engine_depth -= 1
+
+    def record_tick(self, engine) -> None:
+        stock, shock = engine.stock, engine.shock
+        self._append({
+            "type": "tick",
+            "tick": engine.tick_count,
+            "time": stock.last_time,
+            "price": stock.last_price,
+            "vol": stock.last_vol,
+            "shock_state": shock.shock_state.name,
+            "shock_time": shock.shock_time,
+        })
+        if engine.tick_count % self.checkpoint_every == 0 or engine.tick_count >= engine.game_duration:
+            self.checkpoint(engine)
+
+    def record_quote_request(self, quote_request: QuoteRequest) -> None:
+        self._append({"type": "quote", "quote": quote_request.model_dump(mode="json")})
+
+    def record_response(self, bid: float, ask: float, result: bool) -> None:
+        self._append({"type": "response", "bid": bid, "ask": ask, "result": bool(result)})
+
+    def record_order(self, submitted: dict, filled: bool) -> None:
+        self._append({"type": "order", "order": submitted, "filled": bool(filled)})
+
+    def record_amend(self, action: str, arguments: dict, result: bool) -> None:
+        """Cancel or replace of a resting order"""
+        self._append({"type": action, **arguments, "result": bool(result)})
+
+    def record_stock_trade(self, quantity: int, traded: bool) -> None:
+        self._append({"type": "stock", "quantity": int(quantity), "result": bool(traded)})
+
+    def record_book_event(self, event: dict) -> None:
+        self._append({"type": "book", "source": "engine" if self._engine_depth else "player", "event": event})
+
+    def checkpoint(self, engine) -> None:
+        """Record the whole game state and the book digest"""
+        self._append({
+            "type": "checkpoint",
+            "tick": engine.tick_count,
+            "state": engine_state(engine),
+            "digest": book_digest(engine.book),
+        })
+
+    # ---- Orders ----
+    @staticmethod
+    def dump_order(order: Order) -> dict:
+        return {"class": type(order).__name__, **order.model_dump(mode="json")}
+
+    @staticmethod
+    def load_order(data: dict, clock: Clock) -> Order:
+        data = dict(data)
+        return ORDER_CLASSES[data.pop("class")].model_validate({**data, "clock": clock})
+
+
+def engine_state(engine) -> dict:
+    """JSON-able state of the whole game (market, book, orders, client flow) at a tick boundary"""
+    executor = engine.order_executor
+    return {
+        "engine": engine.model_dump(mode="json", exclude={"stock", "book", "order_executor"}),
+        "clock_time": engine.clock.now(),
+        "stock": engine.stock.model_dump(mode="json"),
+        "book": {**engine.book.state_dict(), "pnl_history": engine.book.pnl_history.tolist()},
+        "executor": {
+            **{name: [GameRecorder.dump_order(order) for order in getattr(executor, name).values()]
+               for name in ORDER_BUCKETS},
+            "books": executor.book_states(),
+            "max_position_size": executor.max_position_size,
+            "current_position": executor.current_position,
+            "market_depth": executor.market_depth,
+            "executed_value": executor.executed_value,
+        },
+    }
+
+
+def load_engine_state(state: dict, clock: Clock):
+    """Rebuild a GameEngine from engine_state() on the given clock"""
+    from trading_game.core.game_engine import GameEngine
+
+    stock_state = state["stock"]
+    stock = Stock.model_validate({**stock_state, "clock": clock})
+
+    # ---- Book ----
+    book = Book()
+    book.load_state(state["book"])
+    book.pnl_history = HistoryBuffer(state["book"]["pnl_history"], maxlen=book.pnl_history.maxlen)
+    for stock_key, (_, quantity, price) in book.stocks.items():
+        if stock_key == stock.ticker:
+            book.stocks[stock_key] = (stock, quantity, price)
+
+    # ---- Orders ----
+    executor_state = state["executor"]
+    executor = OrderExecutor(
+        max_position_size=executor_state["max_position_size"],
+        current_position=executor_state["current_position"],
+        market_depth=executor_state["market_depth"],
+        executed_value=executor_state["executed_value"],
+        **{name: {order["order_id"]: GameRecorder.load_order(order, clock) for order in executor_state[name]}
+           for name in ORDER_BUCKETS},
+    )
+    executor.load_book_states(executor_state["books"])
+
+    engine = GameEngine.model_validate({
+        **state["engine"], "clock": clock, "stock": stock, "book": book, "order_executor": executor
+    })
+    engine.shock.clock = clock
+
+    # ---- Stock state (its validators reset the histories, they run again when the engine is validated) ----
+    for name in ("price_history", "vol_history", "time_history"):
+        setattr(stock, name, HistoryBuffer(stock_state[name], maxlen=stock.history_maxlen))
+    stock.last_price, stock.last_vol, stock.last_time = (
+        stock_state["last_price"], stock_state["last_vol"], stock_state["last_time"]
+    )
+    return engine
+
+
+class GameReplayer:
+    """
+    Plays a recording back through a GameEngine: the stock follows the recorded path, the recorded quote requests
+    are served, player responses, orders and book mutations are applied again in their recorded order.
+    Every engine-made book mutation must match its recording and every checkpoint's book digest must match,
+    otherwise ReplayDivergence is raised. seek() fast-forwards from the closest checkpoint.
+    """
+
+    def __init__(self, records: List[dict]):
+        self.records = records
+        self.checkpoints = [i for i, record in enumerate(records) if record["type"] == "checkpoint"]
+        if not self.checkpoints:
+            raise ValueError("The recording has no checkpoint.")
+        self.engine = None
+        self.cursor = 0
+
+    @classmethod
+    def load(cls, path: str | Path) -> "GameReplayer":
+        return cls(GameRecorder.load(path).records)
+
+    def _restore(self, index: int) -> None:
+        """Restore the checkpoint at records[index] and queue the recorded inputs that follow it"""
+        checkpoint = self.records[index]
+        tail = self.records[index + 1:]
+        ticks = [record for record in tail if record["type"] == "tick"]
+
+        clock = ReplayClock(times=[checkpoint["state"]["clock_time"]] + [record["time"] for record in ticks])
+        engine = load_engine_state(checkpoint["state"], clock)
+        stock = engine.stock
+        stock.load_path(
+            np.array([stock.last_price] + [record["price"] for record in ticks]),
+            np.array([stock.last_vol] + [record["vol"] for record in ticks]),
+        )
+        engine.queue_quote_requests([
+            QuoteRequest.model_validate(record["quote"]) for record in tail if record["type"] == "quote"
+        ])
+        engine.book.expect_events([
+            record["event"] for record in tail if record["type"] == "book" and record["source"] == "engine"
+        ])
+
+        if book_digest(engine.book) != checkpoint["digest"]:
+            raise ReplayDivergence(f"Checkpoint of tick {checkpoint['tick']} does not restore its book.")
+        self.engine, self.cursor = engine, index + 1
+
+    def seek(self, tick: int) -> "GameEngine":
+        """State of the game after `tick` ticks (and the player actions before the next one)"""
+        if self.engine is None or self.engine.tick_count > tick:
+            start = max((i for i in self.checkpoints if self.records[i]["tick"] <= tick), default=self.checkpoints[0])
+            self._restore(start)
+        else:
+            # Jump to a later checkpoint when there is one on the way
+            later = [i for i in self.checkpoints if i >= self.cursor and self.records[i]["tick"] <= tick]
+            if later and self.records[later[-1]]["tick"] > self.engine.tick_count:
+                self._restore(later[-1])
+        return self.play(until_tick=tick)
+
+    def play(self, until_tick: Optional[int] = None, realtime: bool = False, speed: float = 1.0) -> "GameEngine":
+        """
+        Replay records until the end (or until the engine is about to play tick until_tick + 1), at max speed
+        or, with realtime, waiting the recorded time between ticks (divided by speed).
+        """
+        if self.engine is None:
+            self._restore(self.checkpoints[0])
+        engine = self.engine
+
+        while self.cursor < len(self.records):
+            record = self.records[self.cursor]
+            if record["type"] == "tick" and until_tick is not None and record["tick"] > until_tick:
+                break
+            if realtime and record["type"] == "tick":
+                time.sleep(max(record["time"] - engine.stock.last_time, 0.0) / speed)
+
+            try:
+                self._apply(engine, record)
+            except ReplayDivergence:
+                raise
+            except ValueError as exc:
+                # A book mutation that does not match its recording
+                raise ReplayDivergence(f"At tick {engine.tick_count}: {exc}") from exc
+            self.cursor += 1
+
+        return engine
+
+    @staticmethod
+    def _apply(engine, record: dict) -> None:
+        """Feed one record back through the engine and check its outcome"""
+        kind = record["type"]
+
+        if kind == "tick":
+            engine.step()
+            if engine.tick_count != record["tick"] or engine.shock.shock_state.name != record["shock_state"]:
+                raise ReplayDivergence(f"Tick {record['tick']} replayed as tick {engine.tick_count} "
+                                       f"with shock {engine.shock.shock_state.name}.")
+            engine.shock.shock_time = record["shock_time"]
+
+        elif kind == "response":
+            if engine.respond_to_quote(record["bid"], record["ask"]) != record["result"]:
+                raise ReplayDivergence(f"Quote response at tick {engine.tick_count} changed outcome.")
+
+        elif kind == "order":
+            if engine.place_order(GameRecorder.load_order(record["order"], engine.clock)) != record["filled"]:
+                raise ReplayDivergence(f"Order {record['order']['order_id']} changed outcome.")
+
+        elif kind == "cancel":
+            if engine.cancel_order(record["order_id"]) != record["result"]:
+                raise ReplayDivergence(f"Cancel of order {record['order_id']} changed outcome.")
+
+        elif kind == "replace":
+            if engine.replace_order(record["order_id"], record["quantity"], record["limit_price"]) != record["result"]:
+                raise ReplayDivergence(f"Replace of order {record['order_id']} changed outcome.")
+
+        elif kind == "stock":
+            if engine.trade_stock(record["quantity"]) != record["result"]:
+                raise ReplayDivergence(f"Stock trade at tick {engine.tick_count} changed outcome.")
+
+        elif kind == "book" and record["source"] == "player":
+            engine.book.apply_event(record["event"])
+
+        elif kind == "checkpoint" and book_digest(engine.book) != record["digest"]:
+            raise ReplayDivergence(f"Book state differs from the recording at tick {record['tick']}.")
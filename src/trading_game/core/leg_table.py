@@ -0,0 +1,328 @@
+import numpy as np
+from typing import Dict, List, Optional
+
+from scipy.special import ndtr
+
+from .option_pricer import Strategy, black_scholes_price, black_scholes_valuation, leg_vol
+from .pricing_cache import PricingCache
+from trading_game.models.vol_surface import VolSurface
+
+GREEK_NAMES = ("delta", "gamma", "vega", "theta", "rho")
+# Initial number of leg / strategy slots of a table, doubled when full
+INITIAL_CAPACITY = 64
+# Scenario x leg values evaluated at once by LegTable.scenario_pnl (keeps its temporaries in cache)
+SCENARIO_BLOCK_SIZE = 1 << 15
+
+
+def _block(values: np.ndarray, rows: slice) -> np.ndarray:
+    """Leading rows of an array, or the array itself when it broadcasts along the leading axis"""
+    return values[rows] if values.shape[0] > 1 else values
+
+
+class LegTable:
+    """
+    Columnar (structure-of-arrays) store of every option leg held in a Book.
+    Each leg row points to its strategy through `owner`, strategies are stored once with their
+    quantity and entry price, so the whole book is marked to market in one vectorized evaluation.
+    Maturities can be rolled down in place (roll): expired legs are settled at intrinsic value and dropped,
+    their payoff is kept per strategy in `settled` so P&L stays continuous through expiry.
+    With a PricingCache, the per-leg valuation is memoized on (fingerprint, spot, vol) and shared by every view.
+    Columns are views of the used slots of preallocated buffers whose capacity doubles when full (as in
+    HistoryBuffer), so booking a strategy is amortized O(legs) and removals / rolls compact them in place.
+    """
+
+    # Leg columns: strike, maturity, rate, type_sign, position, quantity (of the strategy), owner (strategy index)
+    LEG_COLUMNS = ("strike", "maturity", "rate", "type_sign", "position", "quantity", "owner")
+    # Strategy columns, settled being the payoff of the expired legs per unit of strategy
+    STRATEGY_COLUMNS = ("strategy_quantity", "entry_price", "settled")
+
+    def __init__(self, cache: Optional[PricingCache] = None):
+        self.cache = cache
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop every leg and strategy"""
+        self._leg_buffers = {name: np.empty(INITIAL_CAPACITY, dtype=np.intp if name == "owner" else float)
+                             for name in self.LEG_COLUMNS}
+        self._strategy_buffers = {name: np.empty(INITIAL_CAPACITY) for name in self.STRATEGY_COLUMNS}
+        self._n_legs = 0
+        self.keys: List[str] = []
+        self.key_index: Dict[str, int] = {}
+        self._update_views()
+
+    def _update_views(self) -> None:
+        """Point every column at the used slots of its buffer (after a change of size or of buffer)"""
+        for name, buffer in self._leg_buffers.items():
+            setattr(self, name, buffer[:self._n_legs])
+        for name, buffer in self._strategy_buffers.items():
+            setattr(self, name, buffer[:len(self.keys)])
+        self._fingerprint = None
+
+    @staticmethod
+    def _reserve(buffers: Dict[str, np.ndarray], size: int) -> None:
+        """Make the buffers hold at least size slots, doubling their capacity"""
+        capacity = len(next(iter(buffers.values())))
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity)
+        for name, buffer in buffers.items():
+            grown = np.empty(capacity, dtype=buffer.dtype)
+            grown[:len(buffer)] = buffer
+            buffers[name] = grown
+
+    def __getstate__(self) -> dict:
+        # Columns are views of the buffers: they are rebuilt from them once unpickled / copied
+        state = self.__dict__.copy()
+        for name in self.LEG_COLUMNS + self.STRATEGY_COLUMNS:
+            del state[name]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._update_views()
+
+    def __len__(self) -> int:
+        return self._n_legs
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.key_index
+
+    def fingerprint(self) -> int:
+        """Canonical hash of the leg columns that drive per-leg prices, recomputed after a change"""
+        if self._fingerprint is None:
+            self._fingerprint = hash(tuple(
+                column.tobytes() for column in (self.strike, self.maturity, self.rate, self.type_sign, self.position)
+            ))
+        return self._fingerprint
+
+    def add(self, key: str, strategy: Strategy, quantity: int, entry_price: float) -> None:
+        """Append the legs of a newly booked strategy"""
+        if key in self.key_index:
+            raise ValueError(f"Strategy with key {key} already in the leg table.")
+
+        owner = len(self.keys)
+        legs = slice(self._n_legs, self._n_legs + len(strategy.options))
+        self._reserve(self._leg_buffers, legs.stop)
+        self._reserve(self._strategy_buffers, owner + 1)
+
+        columns = self._leg_buffers
+        columns["strike"][legs] = [opt.K for opt in strategy.options]
+        columns["maturity"][legs] = [opt.T for opt in strategy.options]
+        columns["rate"][legs] = [opt.r for opt in strategy.options]
+        columns["type_sign"][legs] = [opt.type_sign for opt in strategy.options]
+        columns["position"][legs] = [opt.position for opt in strategy.options]
+        columns["quantity"][legs] = quantity
+        columns["owner"][legs] = owner
+        self._n_legs = legs.stop
+
+        columns = self._strategy_buffers
+        columns["strategy_quantity"][owner] = quantity
+        columns["entry_price"][owner] = entry_price
+        columns["settled"][owner] = 0.0
+        self.keys.append(key)
+        self.key_index[key] = owner
+        self._update_views()
+
+    def remove(self, key: str) -> bool:
+        """Remove the legs of a strategy, returns False if the key is unknown"""
+        if key not in self.key_index:
+            return False
+
+        removed = self.key_index[key]
+        self._keep_legs(self.owner != removed)
+        self.owner[self.owner > removed] -= 1
+
+        # Shift the next strategies down one slot
+        n_strategies = len(self.keys)
+        for buffer in self._strategy_buffers.values():
+            buffer[removed:n_strategies - 1] = buffer[removed + 1:n_strategies]
+        del self.keys[removed]
+        self.key_index = {k: idx for idx, k in enumerate(self.keys)}
+        self._update_views()
+        return True
+
+    def _keep_legs(self, keep: np.ndarray) -> None:
+        """Filter every leg column with a boolean mask, compacting the buffers in place"""
+        n_kept = int(np.count_nonzero(keep))
+        for buffer in self._leg_buffers.values():
+            buffer[:n_kept] = buffer[:self._n_legs][keep]
+        self._n_legs = n_kept
+        self._update_views()
+
+    def roll(self, dt: float, spot_ref: float) -> float:
+        """
+        Age every leg by dt years. Legs reaching maturity settle at intrinsic value against spot_ref
+        and are dropped (their strategies stay, with the payoff in `settled`).
+        Returns the settlement cash received by the book (negative when it pays).
+        """
+        if dt <= 0 or len(self) == 0:
+            return 0.0
+
+        self.maturity -= dt
+        self._fingerprint = None
+        expired = self.maturity <= 0
+        if not expired.any():
+            return 0.0
+
+        payoff = self.position[expired] * np.maximum(self.type_sign[expired] * (spot_ref - self.strike[expired]), 0.0)
+        self.settled += np.bincount(self.owner[expired], weights=payoff, minlength=len(self.keys))
+        cash = float(np.dot(self.quantity[expired], payoff))
+
+        self._keep_legs(~expired)
+        return cash
+
+    # ---- Persistence ----
+    def state(self) -> dict:
+        """Every column as plain lists (JSON / msgpack friendly, floats round-trip exactly)"""
+        state = {name: getattr(self, name).tolist() for name in self.LEG_COLUMNS + self.STRATEGY_COLUMNS}
+        state["keys"] = list(self.keys)
+        return state
+
+    def load_state(self, state: dict) -> None:
+        """Restore the columns written by state(), rolled maturities and settled payoffs included"""
+        self.clear()
+        self.keys = list(state["keys"])
+        self.key_index = {key: idx for idx, key in enumerate(self.keys)}
+        self._n_legs = len(state["strike"])
+        for buffers, size in ((self._leg_buffers, self._n_legs), (self._strategy_buffers, len(self.keys))):
+            self._reserve(buffers, size)
+            for name, buffer in buffers.items():
+                buffer[:size] = state[name]
+        self._update_views()
+
+    def leg_vols(self, volatility: float | VolSurface):
+        """Vol of every leg: the flat vol, or one vectorized surface lookup"""
+        return leg_vol(volatility, self.strike, self.maturity)
+
+    def evaluate(self, spot_ref: float, volatility: float | VolSurface) -> dict:
+        """
+        Price and Greeks of every leg (per unit of strategy) in a single vectorized pass.
+        Returns {"price": array, "delta": array, ...} with one entry per leg, read-only when cached.
+        """
+        if len(self) == 0:
+            empty = np.empty(0)
+            return {name: empty for name in ("price",) + GREEK_NAMES}
+        if self.cache is None:
+            return self._valuation(spot_ref, volatility)
+        return self.cache.get(self.fingerprint(), spot_ref, volatility, lambda: self._valuation(spot_ref, volatility))
+
+    def _valuation(self, spot_ref: float, volatility: float | VolSurface) -> dict:
+        legs = black_scholes_valuation(
+            spot_ref, self.leg_vols(volatility), self.strike, self.maturity, self.rate, self.type_sign, self.position
+        )
+        for values in legs.values():
+            values.flags.writeable = False
+        return legs
+
+    def leg_prices(self, spot_ref: float, volatility: float | VolSurface) -> np.ndarray:
+        """Price of every leg: from the cached valuation when there is a cache, else a prices-only pass"""
+        if self.cache is not None:
+            return self.evaluate(spot_ref, volatility)["price"]
+        return black_scholes_price(
+            spot_ref, self.leg_vols(volatility), self.strike, self.maturity, self.rate, self.type_sign, self.position
+        )
+
+    def value_and_pnl(self, spot_ref: float, volatility: float | VolSurface) -> dict:
+        """Quantity-weighted mark-to-market value and pnl"""
+        realized = float(np.dot(self.strategy_quantity, self.settled - self.entry_price))
+        if len(self) == 0:
+            return {"value": 0.0, "pnl": realized}
+
+        value = float(np.dot(self.quantity, self.leg_prices(spot_ref, volatility)))
+        return {"value": value, "pnl": value + realized}
+
+    def scenario_pnl(self, spots, vol_scales, time_rolls, volatility: float | VolSurface) -> np.ndarray:
+        """
+        Quantity-weighted pnl of the table under scenarios, vectorized over scenarios x legs.
+        spots, vol_scales (multiplying each leg's current vol) and time_rolls (years) broadcast together and
+        the result has their broadcast shape: pass them on separate axes for a full grid. Every term that does not
+        depend on the spot is computed once on its small (vol, time, leg) shape, puts are valued as calls through
+        put-call parity and legs sharing a strike, maturity and rate are netted, so only d1, d2 and the two CDFs
+        are evaluated per (scenario, distinct leg), by blocks of leading scenario rows of about SCENARIO_BLOCK_SIZE
+        values that stay in cache. Legs expiring within a roll count at intrinsic value.
+        """
+        spots, vol_scales, time_rolls = (np.asarray(x, dtype=float) for x in (spots, vol_scales, time_rolls))
+        shape = np.broadcast_shapes(spots.shape, vol_scales.shape, time_rolls.shape)
+        realized = float(np.dot(self.strategy_quantity, self.settled - self.entry_price))
+        if len(self) == 0:
+            return np.full(shape, realized)
+
+        # Same number of dimensions (at least one) for all inputs, so blocks are sliced on the leading axis
+        ndim = max(len(shape), 1)
+        spots, vol_scales, time_rolls = (x.reshape((1,) * (ndim - x.ndim) + x.shape)
+                                         for x in (spots, vol_scales, time_rolls))
+        weights = self.quantity * self.position
+        is_put = self.type_sign < 0
+        put_weight = float(np.dot(weights, is_put))
+        put_strikes = weights * is_put * self.strike
+
+        # ---- Distinct legs: calls sharing a strike, maturity and rate (hence a vol) are netted ----
+        (strike, maturity, rate), distinct = np.unique(
+            np.stack([self.strike, self.maturity, self.rate]), axis=1, return_inverse=True
+        )
+        distinct = distinct.ravel()
+        weights = np.bincount(distinct, weights=weights, minlength=len(strike))
+        put_strikes = np.bincount(distinct, weights=put_strikes, minlength=len(strike))
+
+        # ---- Spot-independent terms (vol x time x distinct legs) ----
+        t = np.maximum(maturity - time_rolls[..., None], 0.0)
+        sigma = leg_vol(volatility, strike, maturity) * vol_scales[..., None]
+        vol_sqrt_t = sigma * np.sqrt(t)
+        # Expired legs: d1 = d2 = +/-inf, so the call is worth its intrinsic value (discount factor is 1)
+        vol_sqrt_t = np.where(t > 0, vol_sqrt_t, np.finfo(float).tiny)
+        inv_vol_sqrt_t = 1 / vol_sqrt_t
+        carry = (rate + 0.5 * sigma * sigma) * t * inv_vol_sqrt_t
+        discount = np.exp(-rate * t)
+        weighted_strike = weights * strike * discount
+        log_strike = np.log(strike)
+
+        # ---- Full grid: d1, d2 and the CDFs, by blocks of leading rows ----
+        n_rows = max(spots.shape[0], vol_scales.shape[0], time_rolls.shape[0])
+        row_size = len(strike) * int(np.prod(shape[1:], dtype=int))
+        step = max(SCENARIO_BLOCK_SIZE // row_size, 1)
+        calls = np.empty(shape if shape else (1,))
+        for start in range(0, n_rows, step):
+            rows = slice(start, start + step)
+            s = _block(spots, rows)
+            d1 = (np.log(s)[..., None] - log_strike) * _block(inv_vol_sqrt_t, rows)
+            d1 += _block(carry, rows)
+            d2 = d1 - _block(vol_sqrt_t, rows)
+            d2 = ndtr(d2, out=d2)
+            d2 *= _block(weighted_strike, rows)
+            calls[rows] = s * (ndtr(d1, out=d1) @ weights) - d2.sum(axis=-1)
+
+        # ---- Put-call parity: P = C - S + K e^{-rT} ----
+        parity = discount @ put_strikes - spots * put_weight
+        return (calls + parity + realized).reshape(shape)
+
+    def per_strategy(self, leg_values: np.ndarray) -> np.ndarray:
+        """Sum leg values by strategy (one value per strategy, in insertion order)"""
+        return np.bincount(self.owner, weights=leg_values, minlength=len(self.keys))
+
+    def strategy_price(self, key: str, spot_ref: float, volatility: float | VolSurface) -> float:
+        """Price of one strategy from its remaining legs, expired legs counting at their settled payoff"""
+        idx = self.key_index[key]
+        legs = self.owner == idx
+        if self.cache is not None:
+            prices = self.evaluate(spot_ref, volatility)["price"][legs]
+        else:
+            prices = black_scholes_price(
+                spot_ref, leg_vol(volatility, self.strike[legs], self.maturity[legs]),
+                self.strike[legs], self.maturity[legs], self.rate[legs], self.type_sign[legs], self.position[legs]
+            )
+        return float(prices.sum()) + float(self.settled[idx])
+
+    def book_totals(self, spot_ref: float, volatility: float | VolSurface) -> dict:
+        """
+        Quantity-weighted totals for the whole table:
+        value (mark-to-market), pnl (versus entry prices) and the five Greeks.
+        """
+        legs = self.evaluate(spot_ref, volatility)
+        value = float(np.dot(self.quantity, legs["price"]))
+        totals = {
+            "value": value,
+            "pnl": value + float(np.dot(self.strategy_quantity, self.settled - self.entry_price)),
+        }
+        for name in GREEK_NAMES:
+            totals[name] = float(np.dot(self.quantity, legs[name]))
+        return totals
@@ -1,10 +1,18 @@
-from pydantic import BaseModel, Field, model_validator
-from typing import Optional, List, Literal
+import math
+
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
+from typing import Dict, Hashable, Optional, List, Literal, Tuple
 from enum import Enum
 from datetime import datetime
-import time
 
+from trading_game.core import legs
+from trading_game.core.legs import Leg, price_legs, spot_band
 from trading_game.core.option_pricer import Strategy, Option
+from trading_game.core.order_book import BUY, SELL, Fill, OrderBook, TriggerIndex
+from trading_game.core.pricing_cache import vol_key
+from trading_game.models.clock import Clock, WallClock
+from trading_game.models.vol_surface import VolSurface
+from trading_game.utils.app_utils import new_id
 
 class OrderSide(Enum):
     BUY = "Buy"
@@ -38,34 +46,78 @@ class StrategyType(Enum):
     PUT_BUTTERFLY = "PutButterfly"
 
 
+# Leg factories of the strategy types (see StrategyOrder.to_legs)
+TWO_STRIKE_LEGS = {
+    StrategyType.CALL_SPREAD: legs.call_spread,
+    StrategyType.PUT_SPREAD: legs.put_spread,
+    StrategyType.STRANGLE: legs.strangle,
+    StrategyType.BULL_RISK_REVERSAL: legs.risk_reversal_bullish,
+    StrategyType.BEAR_RISK_REVERSAL: legs.risk_reversal_bearish,
+}
+CALENDAR_TYPES = {StrategyType.CALL_CALENDAR_SPREAD: "call", StrategyType.PUT_CALENDAR_SPREAD: "put"}
+BUTTERFLY_TYPES = {StrategyType.CALL_BUTTERFLY: "call", StrategyType.PUT_BUTTERFLY: "put"}
+
+
 class Order(BaseModel):
     """Base class for all orders"""
     order_id: Optional[str] = None
-    timestamp: Optional[float] = Field(default_factory=time.time)
+    timestamp: Optional[float] = None
     side: OrderSide
     order_type: OrderType
     status: OrderStatus = OrderStatus.PENDING
     quantity: int = Field(..., gt=0, description="Quantity must be > 0")
-    executed_price: Optional[float] = None
+    filled_quantity: int = 0
+    executed_price: Optional[float] = None  # Average price of the fills
     executed_time: Optional[float] = None
     rejection_reason: Optional[str] = None
+    clock: Clock = Field(default_factory=WallClock, exclude=True)
 
     @model_validator(mode='after')
     def set_order_id(self):
         if self.order_id is None:
-            self.order_id = f"ORD_{int(self.timestamp * 1000)}"
+            self.order_id = new_id("ORD")
         return self
 
-    def execute(self, price: float) -> bool:
-        """Execute the order at given price"""
-        if self.status != OrderStatus.PENDING:
+    @model_validator(mode='after')
+    def set_timestamp(self):
+        if self.timestamp is None:
+            self.timestamp = self.clock.now()
+        return self
+
+    @property
+    def remaining_quantity(self) -> int:
+        return self.quantity - self.filled_quantity
+
+    @property
+    def side_sign(self) -> int:
+        return BUY if self.side == OrderSide.BUY else SELL
+
+    def fill(self, price: float, quantity: int) -> bool:
+        """Fill part of the order at given price, it is executed once fully filled"""
+        if self.status != OrderStatus.PENDING or not 0 < quantity <= self.remaining_quantity:
             return False
-        
-        self.executed_price = price
-        self.executed_time = time.time()
-        self.status = OrderStatus.EXECUTED
+
+        filled = self.filled_quantity + quantity
+        previous = self.executed_price if self.executed_price is not None else 0.0
+        self.executed_price = (previous * self.filled_quantity + price * quantity) / filled
+        self.filled_quantity = filled
+        self.executed_time = self.clock.now()
+        if filled == self.quantity:
+            self.status = OrderStatus.EXECUTED
         return True
 
+    def execute(self, price: float) -> bool:
+        """Execute the remaining quantity of the order at given price"""
+        return self.fill(price, self.remaining_quantity)
+
+    def booked_quantity(self, quantity: int) -> int:
+        """Signed quantity of to_strategy() bought by a fill of quantity"""
+        return quantity if self.side == OrderSide.BUY else -quantity
+
+    def booked_price(self, price: float) -> float:
+        """Price of one unit of to_strategy() for a fill at price"""
+        return price
+
     def reject(self, reason: str) -> None:
         """Reject the order with a reason"""
         self.status = OrderStatus.REJECTED
@@ -131,6 +183,23 @@ class VanillaOrder(Order):
             options=[opt]
         )
 
+    def booked_quantity(self, quantity: int) -> int:
+        # The side is already in the position of the to_strategy() leg
+        return quantity
+
+    def booked_price(self, price: float) -> float:
+        return price * self.side_sign
+
+    def instrument(self) -> Tuple[Leg, ...]:
+        """Legs of one unit of the traded option whatever the side (key of its order book)"""
+        factory = legs.call if self.option_type == "call" else legs.put
+        return factory(self.strike, self.maturity, self.risk_free_rate)
+
+    def to_legs(self) -> Tuple[Leg, ...]:
+        """Frozen legs of the order (one unit), for pricing without building pydantic objects"""
+        unit_legs = self.instrument()
+        return unit_legs if self.side == OrderSide.BUY else tuple(leg._replace(position=-leg.position) for leg in unit_legs)
+
 
 class StrategyOrder(Order):
     """Order for option strategies (Spreads, Straddle, Strangle, Calendars, Butterflies, RR)"""
@@ -329,227 +398,314 @@ class StrategyOrder(Order):
 
         raise ValueError(f"Unsupported strategy type for to_strategy(): {stype}")
 
+    def to_legs(self) -> Tuple[Leg, ...]:
+        """Frozen legs of the strategy (same layouts as to_strategy), for pricing without building pydantic objects"""
+        stype, k, t, r = self.strategy_type, self.strikes, self.maturity, self.risk_free_rate
+
+        if stype in TWO_STRIKE_LEGS:
+            return TWO_STRIKE_LEGS[stype](k[0], k[1], t, r)
+        if stype == StrategyType.STRADDLE:
+            return legs.straddle(k[0], t, r)
+        if stype in CALENDAR_TYPES:
+            if self.short_maturity is None or self.long_maturity is None:
+                raise ValueError(f"{stype.value} requires short_maturity and long_maturity")
+            return legs.calendar_spread(k[0], self.short_maturity, self.long_maturity, r, CALENDAR_TYPES[stype])
+        if stype in BUTTERFLY_TYPES:
+            return legs.butterfly(k[0], k[1], k[2], t, r, BUTTERFLY_TYPES[stype])
+
+        raise ValueError(f"Unsupported strategy type for to_legs(): {stype}")
+
+    def instrument(self) -> Tuple[Leg, ...]:
+        """Legs of one unit of the strategy, the same for both sides (key of its order book)"""
+        return self.to_legs()
+
 
 
 class OrderExecutor(BaseModel):
-    """Executor that processes and executes orders"""
-    pending_orders: List[Order] = Field(default_factory=list)
-    executed_orders: List[Order] = Field(default_factory=list)
-    rejected_orders: List[Order] = Field(default_factory=list)
+    """
+    Executor that processes and executes orders. Each instrument has a price-time priority OrderBook where the
+    orders meet each other and the market, which trades at the theoretical price (up to market_depth per side
+    and tick, None: unlimited). The part of an order that cannot fill at once rests in its book and fills
+    on later ticks (on_tick): each book is indexed on the spot band where the market stays inside its best bid and
+    ask, so a tick only prices and matches the books whose band the spot left.
+    Fills are collected for the owner of the executor to book them (take_fills).
+    Orders are kept in one bucket per status, each indexed by order_id in submission order, and the execution
+    summary is served from running totals, so lookups, fills and cancels do not scan the orders.
+    """
+    pending_orders: Dict[str, Order] = Field(default_factory=dict)
+    executed_orders: Dict[str, Order] = Field(default_factory=dict)
+    rejected_orders: Dict[str, Order] = Field(default_factory=dict)
+    cancelled_orders: Dict[str, Order] = Field(default_factory=dict)
     max_position_size: Optional[int] = 1000
     current_position: int = 0
+    market_depth: Optional[int] = None
+    executed_value: float = 0.0  # Sum of price * quantity over every fill (filled parts of cancelled orders too)
+
+    # Order book of each instrument (unit legs), fills not yet taken
+    _books: Dict[Tuple[Leg, ...], OrderBook] = PrivateAttr(default_factory=dict)
+    _fills: List[Tuple[Order, Fill]] = PrivateAttr(default_factory=list)
+    _n_books: int = PrivateAttr(default=0)
+    _tick: int = PrivateAttr(default=0)
+
+    # Spot bands of the books around the market of the last tick (_spot, _volatility), valid while the vol keeps
+    # the key _trigger_vol (None: not indexed); books the market still crosses (depth exhausted, resting market
+    # orders) are matched every tick
+    _triggers: TriggerIndex = PrivateAttr(default_factory=TriggerIndex)
+    _watched: Dict[Tuple[Leg, ...], None] = PrivateAttr(default_factory=dict)
+    _spot: Optional[float] = PrivateAttr(default=None)
+    _volatility: Optional[float | VolSurface] = PrivateAttr(default=None)
+    _trigger_vol: Optional[Hashable] = PrivateAttr(default=None)
+    _last_vol: Optional[Hashable] = PrivateAttr(default=None)
 
     def submit_order(self, order: Order) -> bool:
         """Submit a new order"""
+        if self.get_order(order.order_id) is not None:
+            # Not indexed, the id belongs to the first order
+            order.reject("Duplicate order id")
+            return False
+
         # Risk checks
         if not self._check_position_limits(order):
-            order.reject("Position limit exceeded")
-            self.rejected_orders.append(order)
+            self.reject_order(order, "Position limit exceeded")
             return False
         
-        self.pending_orders.append(order)
+        self.pending_orders[order.order_id] = order
         return True
 
-    def _check_position_limits(self, order: Order) -> bool:
-        """Check if order respects position limits"""
-        position_change = order.quantity if order.side == OrderSide.BUY else -order.quantity
+    def reject_order(self, order: Order, reason: str) -> None:
+        order.reject(reason)
+        self.rejected_orders[order.order_id] = order
+
+    def _is_pending(self, order: Order) -> bool:
+        return self.pending_orders.get(order.order_id) is order
+
+    def _check_position_limits(self, order: Order, quantity: Optional[int] = None) -> bool:
+        """Check if order (or quantity more of it) respects position limits"""
+        quantity = order.quantity if quantity is None else quantity
+        position_change = quantity if order.side == OrderSide.BUY else -quantity
         new_position = self.current_position + position_change
         
         if abs(new_position) > self.max_position_size:
             return False
         return True
 
-    def execute_vanilla_order(self, order: VanillaOrder, option_class) -> bool:
-        """Execute a vanilla option order using the Option class"""
-        if order not in self.pending_orders:
+    def order_book(self, instrument: Tuple[Leg, ...]) -> OrderBook:
+        """Order book of an instrument (created empty), with its market depth restored on its first use of a tick"""
+        book = self._books.get(instrument)
+        if book is None:
+            self._n_books += 1
+            book = self._books[instrument] = OrderBook(self.market_depth, created=self._n_books, tick=self._tick)
+        elif book.tick != self._tick:
+            book.new_tick(self._tick)
+        return book
+
+    def _settle(self, instrument: Tuple[Leg, ...], book: OrderBook, market_price: Optional[float] = None) -> None:
+        """Drop a book left empty, else index it on the spot band where the market stays inside its best bid / ask"""
+        self._triggers.discard(instrument)
+        self._watched.pop(instrument, None)
+        if not len(book):
+            del self._books[instrument]
+            return
+        if self._trigger_vol is None:
+            return
+
+        if market_price is None:
+            market_price = abs(price_legs(instrument, self._spot, self._volatility))
+        bid, ask = book.best_bid(), book.best_ask()
+        bid = -math.inf if bid is None else bid
+        ask = math.inf if ask is None else ask
+        if bid < market_price < ask:
+            self._triggers.set(
+                instrument, *spot_band(instrument, self._spot, self._volatility, market_price, bid, ask)
+            )
+        else:
+            self._watched[instrument] = None
+
+    def execute_vanilla_order(self, order: VanillaOrder, volatility: Optional[float | VolSurface] = None) -> bool:
+        """Execute a vanilla option order, priced on volatility if given (else the order vol)"""
+        if not self._is_pending(order):
             return False
         
-        # Create option instance
-        opt = option_class(
-            K=order.strike,
-            T=order.maturity,
-            r=order.risk_free_rate,
-            option_type=order.option_type,
-            position=1 if order.side == OrderSide.BUY else -1
-        )
-        
-        market_price = opt.price(s=order.spot_price, sigma=order.volatility)
-        
-        # Check if order can execute
-        if not order.can_execute(abs(market_price)):
+        market_price = price_legs(order.to_legs(), order.spot_price, volatility if volatility is not None else order.volatility)
+        return self._match(order, order.instrument(), abs(market_price))
+
+    def execute_strategy_order(self, order: StrategyOrder, volatility: Optional[float | VolSurface] = None) -> bool:
+        """Execute a strategy order, priced on volatility if given (else the order vol)"""
+        if not self._is_pending(order):
             return False
         
-        # Execute order
-        success = order.execute(abs(market_price))
-        if success:
-            self.pending_orders.remove(order)
-            self.executed_orders.append(order)
-            
-            # Update position
-            position_change = order.quantity if order.side == OrderSide.BUY else -order.quantity
-            self.current_position += position_change
-            
-        return success
-
-    def execute_strategy_order(self, order: StrategyOrder, strategy_class) -> bool:
-        if order not in self.pending_orders:
+        try:
+            order_legs = order.to_legs()
+        except ValueError as exc:
+            del self.pending_orders[order.order_id]
+            self.reject_order(order, str(exc))
             return False
         
-        # Create strategy based on type
-        if order.strategy_type == StrategyType.CALL_SPREAD:
-            strat = strategy_class.call_spread(
-                k1=order.strikes[0],
-                k2=order.strikes[1],
-                t=order.maturity,
-                r=order.risk_free_rate,
-            )
-        
-        elif order.strategy_type == StrategyType.PUT_SPREAD:
-            strat = strategy_class.put_spread(
-                k1=order.strikes[0],
-                k2=order.strikes[1],
-                t=order.maturity,
-                r=order.risk_free_rate,
-            )
-        
-        elif order.strategy_type == StrategyType.STRADDLE:
-            strat = strategy_class.straddle(
-                k=order.strikes[0],
-                t=order.maturity,
-                r=order.risk_free_rate,
-            )
-        
-        elif order.strategy_type == StrategyType.STRANGLE:
-            strat = strategy_class.strangle(
-                k1=order.strikes[0],
-                k2=order.strikes[1],
-                t=order.maturity,
-                r=order.risk_free_rate,
-            )
-
-        elif order.strategy_type == StrategyType.BULL_RISK_REVERSAL:
-            strat = strategy_class.risk_reversal_bullish(
-                k1=order.strikes[0],
-                k2=order.strikes[1],
-                t=order.maturity,
-                r=order.risk_free_rate,
-            )
-
-        elif order.strategy_type == StrategyType.BEAR_RISK_REVERSAL:
-            strat = strategy_class.risk_reversal_bearish(
-                k1=order.strikes[0],
-                k2=order.strikes[1],
-                t=order.maturity,
-                r=order.risk_free_rate,
-            )
-
-        elif order.strategy_type == StrategyType.CALL_BUTTERFLY:
-            strat = strategy_class.butterfly(
-                k1=order.strikes[0],
-                k2=order.strikes[1],
-                k3=order.strikes[2],
-                t=order.maturity,
-                r=order.risk_free_rate,
-                option_type="call",
-            )
+        # Prix de marché de la stratégie
+        market_price = abs(price_legs(order_legs, order.spot_price, volatility if volatility is not None else order.volatility))
+        order.net_premium = market_price
+        return self._match(order, order_legs, market_price)
 
-        elif order.strategy_type == StrategyType.PUT_BUTTERFLY:
-            strat = strategy_class.butterfly(
-                k1=order.strikes[0],
-                k2=order.strikes[1],
-                k3=order.strikes[2],
-                t=order.maturity,
-                r=order.risk_free_rate,
-                option_type="put",
-            )
+    def _match(self, order: Order, instrument: Tuple[Leg, ...], market_price: float) -> bool:
+        """
+        Send an order to the book of its instrument (if it already rests there, let the market fill it),
+        returns whether it is fully executed
+        """
+        book = self.order_book(instrument)
+        if order.order_id in book:
+            fills = book.match_market(market_price)
+        else:
+            limit = order.limit_price if order.order_type == OrderType.LIMIT else None
+            fills = book.submit(order.order_id, order.side_sign, order.remaining_quantity, limit, market_price)
+        self._apply_fills(fills)
+        self._settle(instrument, book)
+        return order.status == OrderStatus.EXECUTED
+
+    def _apply_fills(self, fills: List[Fill]) -> None:
+        for fill in fills:
+            order = self.pending_orders[fill.order_id]
+            order.fill(fill.price, fill.quantity)
+            self._fills.append((order, fill))
+
+            # Update position (strategy counts as 1 position unit per quantity) and traded notional
+            self.current_position += order.side_sign * fill.quantity
+            self.executed_value += float(fill.price * fill.quantity)
+
+            if order.status == OrderStatus.EXECUTED:
+                del self.pending_orders[order.order_id]
+                self.executed_orders[order.order_id] = order
+
+    def _match_market(self, instrument: Tuple[Leg, ...], spot_price: float, volatility: float | VolSurface) -> None:
+        """Let the market fill the resting orders of a book it crosses"""
+        book = self.order_book(instrument)
+        market_price = abs(price_legs(instrument, spot_price, volatility))
+        self._apply_fills(book.match_market(market_price))
+        self._settle(instrument, book, market_price)
+
+    def on_tick(self, spot_price: float, volatility: float | VolSurface) -> None:
+        """
+        New tick: fill the resting orders crossed by the market at the new spot / vol (pass the vol surface orders
+        are executed on, so they are re-evaluated on the same prices). At an unchanged vol, only the books whose
+        spot band the new spot left (or that the market still crossed) are priced and matched.
+        The bands only hold at the vol they were drawn at: when the vol (or the surface state) moves, every book is
+        priced and matched, and indexed again once the vol holds for a tick.
+        """
+        self._tick += 1
+        self._spot, self._volatility = spot_price, volatility
+        key = vol_key(volatility)
+
+        if key == self._trigger_vol:
+            instruments = dict.fromkeys(self._triggers.crossed(spot_price))
+            instruments.update(self._watched)
+            self._watched.clear()
+        else:
+            self._triggers.clear()
+            self._watched.clear()
+            self._trigger_vol = key if key == self._last_vol else None
+            instruments = self._books
+        self._last_vol = key
+
+        # Books in creation order, whichever were triggered
+        for instrument in sorted(instruments, key=lambda instrument: self._books[instrument].created):
+            self._match_market(instrument, spot_price, volatility)
+
+    def take_fills(self) -> List[Tuple[Order, Fill]]:
+        """Fills applied since the last call, in order"""
+        fills, self._fills = self._fills, []
+        return fills
+
+    def _resting_book(self, order: Order) -> Optional[OrderBook]:
+        """Order book the order rests in (None if it was never sent to one)"""
+        book = self._books.get(order.instrument())
+        return book if book is not None and order.order_id in book else None
 
-        elif order.strategy_type == StrategyType.CALL_CALENDAR_SPREAD:
-            # Utilise les 2 maturités
-            if order.short_maturity is None or order.long_maturity is None:
-                order.reject("Missing maturities for Call Calendar Spread")
-                self.pending_orders.remove(order)
-                self.rejected_orders.append(order)
-                return False
-
-            strat = strategy_class.calendar_spread(
-                k=order.strikes[0],
-                t1=order.short_maturity,
-                t2=order.long_maturity,
-                r=order.risk_free_rate,
-                option_type="call",
-            )
+    def cancel_order(self, order_id: str) -> bool:
+        """Cancel a pending order by ID (its filled part stays)"""
+        order = self.pending_orders.get(order_id)
+        if order is None or not order.cancel():
+            return False
 
-        elif order.strategy_type == StrategyType.PUT_CALENDAR_SPREAD:
-            if order.short_maturity is None or order.long_maturity is None:
-                order.reject("Missing maturities for Put Calendar Spread")
-                self.pending_orders.remove(order)
-                self.rejected_orders.append(order)
-                return False
-
-            strat = strategy_class.calendar_spread(
-                k=order.strikes[0],
-                t1=order.short_maturity,
-                t2=order.long_maturity,
-                r=order.risk_free_rate,
-                option_type="put",
-            )
+        del self.pending_orders[order_id]
+        self.cancelled_orders[order_id] = order
+        book = self._resting_book(order)
+        if book is not None:
+            book.cancel(order_id)
+            self._settle(order.instrument(), book)
+        return True
 
-        else:
-            order.reject("Unsupported strategy type")
-            self.pending_orders.remove(order)
-            self.rejected_orders.append(order)
-            return False
-        
-        # Prix de marché de la stratégie
-        market_price = abs(strat.price(s=order.spot_price, sigma=order.volatility))
-        order.net_premium = market_price
-        
-        # Check if order can execute (limit / market)
-        if not order.can_execute(market_price):
+    def replace_order(self, order_id: str, quantity: Optional[int] = None, limit_price: Optional[float] = None,
+                      spot_price: Optional[float] = None, volatility: Optional[float | VolSurface] = None) -> bool:
+        """
+        Amend a resting order: quantity is its new total quantity (filled part included), limit_price its new limit.
+        A lower quantity keeps the time priority, otherwise the order is requeued and matched again, the market
+        being priced at spot_price / volatility (default: the order's). Returns False if the order is not resting.
+        """
+        order = self.pending_orders.get(order_id)
+        book = self._resting_book(order) if order is not None else None
+        if book is None:
             return False
-        
-        # Execute order
-        success = order.execute(market_price)
-        if success:
-            self.pending_orders.remove(order)
-            self.executed_orders.append(order)
-            
-            # Update position (strategy counts as 1 position unit per quantity)
-            position_change = order.quantity if order.side == OrderSide.BUY else -order.quantity
-            self.current_position += position_change
-            
-        return success
-
+        quantity = order.quantity if quantity is None else quantity
+        if quantity <= order.filled_quantity:
+            raise ValueError(f"Quantity must be above the {order.filled_quantity} already filled.")
+        if limit_price is not None and order.order_type != OrderType.LIMIT:
+            raise ValueError("Only limit orders have a limit price.")
+        if quantity > order.quantity and not self._check_position_limits(order, quantity - order.quantity):
+            raise ValueError("Position limit exceeded")
+
+        instrument = order.instrument()
+        market_price = abs(price_legs(
+            instrument,
+            order.spot_price if spot_price is None else spot_price,
+            order.volatility if volatility is None else volatility,
+        ))
+        order.quantity = quantity
+        if limit_price is not None:
+            order.limit_price = limit_price
+        book = self.order_book(instrument)
+        self._apply_fills(book.replace(order_id, order.remaining_quantity, limit_price, market_price))
+        self._settle(instrument, book)
+        return True
 
-    def cancel_order(self, order_id: str) -> bool:
-        """Cancel a pending order by ID"""
-        for order in self.pending_orders:
-            if order.order_id == order_id:
-                if order.cancel():
-                    self.pending_orders.remove(order)
-                    return True
-        return False
+    def book_states(self) -> List[dict]:
+        """Resting order ids (in arrival order) and market depth left of every book, in creation order"""
+        depth = math.inf if self.market_depth is None else self.market_depth
+        return [{
+            "orders": [resting.order_id for resting in book.resting()],
+            "market_left": [book.market_left[side] if book.tick == self._tick else depth for side in (BUY, SELL)],
+        } for book in self._books.values()]
+
+    def load_book_states(self, states: List[dict]) -> None:
+        """Put pending orders back in their books as given by book_states(), without matching"""
+        for state in states:
+            for order_id in state["orders"]:
+                order = self.pending_orders[order_id]
+                limit = order.limit_price if order.order_type == OrderType.LIMIT else None
+                book = self.order_book(order.instrument())
+                book.submit(order_id, order.side_sign, order.remaining_quantity, limit)
+            book.market_left = dict(zip((BUY, SELL), state["market_left"]))
+
+    def get_order(self, order_id: str) -> Optional[Order]:
+        """Order by ID, whatever its status"""
+        for bucket in (self.pending_orders, self.executed_orders, self.rejected_orders, self.cancelled_orders):
+            order = bucket.get(order_id)
+            if order is not None:
+                return order
+        return None
 
     def get_order_status(self, order_id: str) -> Optional[OrderStatus]:
         """Get status of an order by ID"""
-        all_orders = self.pending_orders + self.executed_orders + self.rejected_orders
-        for order in all_orders:
-            if order.order_id == order_id:
-                return order.status
-        return None
+        order = self.get_order(order_id)
+        return order.status if order is not None else None
 
     def get_execution_summary(self) -> dict:
         """Get summary of all executions"""
         return {
             "total_executed": len(self.executed_orders),
             "total_rejected": len(self.rejected_orders),
+            "total_cancelled": len(self.cancelled_orders),
             "pending": len(self.pending_orders),
             "current_position": self.current_position,
-            "total_executed_value": sum(
-                o.executed_price * o.quantity 
-                for o in self.executed_orders 
-                if o.executed_price is not None
-            )
+            "total_executed_value": self.executed_value,
         }
 
 #Exemple to show how to use the OrderExecutor with vanilla and strategy orders
@@ -570,7 +726,7 @@ vanilla = VanillaOrder(
 )
 
 executor.submit_order(vanilla)
-executor.execute_vanilla_order(vanilla, option_pricer=pricer)
+executor.execute_vanilla_order(vanilla)
 
 # Ordre strategy
 spread = StrategyOrder(
@@ -587,5 +743,5 @@ spread = StrategyOrder(
 )
 
 executor.submit_order(spread)
-executor.execute_strategy_order(spread, strategy_pricer=Strategy)
+executor.execute_strategy_order(spread)
 '''
\ No newline at end of file
@@ -1,10 +1,221 @@
+import argparse
+import time
+
 import numpy as np
-from scipy.stats import norm
-from typing import Literal, List, Optional
+from scipy.special import ndtr
+from typing import Callable, Literal, List, Optional
 from pydantic import BaseModel, Field, model_validator
 from trading_game.config.settings import BASE
 
 from trading_game.config.strat_pool import generate_random_strat_data
+from trading_game.models.vol_surface import VolSurface
+
+
+def leg_vol(sigma, k, t):
+    """Vol to price legs of strike k and maturity t: sigma itself, or its lookup when sigma is a VolSurface"""
+    return sigma.vol(k, t) if isinstance(sigma, VolSurface) else sigma
+
+
+# Vectorized Black-Scholes kernel
+def black_scholes_d1_d2(s, sigma, k, t, r) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compute d1 and d2 in a single pass, broadcasting over all inputs.
+    sigma * sqrt(T) is computed once and shared by both terms.
+    """
+    vol_sqrt_t = sigma * np.sqrt(t)
+    d1 = (np.log(s / k) + (r + 0.5 * sigma * sigma) * t) / vol_sqrt_t
+    d2 = d1 - vol_sqrt_t
+    return d1, d2
+
+
+def black_scholes_price(s, sigma, k, t, r, type_sign, position=1) -> np.ndarray:
+    """
+    Black-Scholes price broadcasting over spots, vols and legs.
+    type_sign is +1 for calls and -1 for puts: w * (S N(w d1) - K e^{-rT} N(w d2))
+    """
+    d1, d2 = black_scholes_d1_d2(s, sigma, k, t, r)
+    discounted_strike = k * np.exp(-r * t)
+    return (type_sign * ((s * ndtr(type_sign * d1)) - (discounted_strike * ndtr(type_sign * d2)))) * position
+
+
+def _norm_pdf(x) -> np.ndarray:
+    return np.exp(-0.5 * x * x) / np.sqrt(2 * np.pi)
+
+
+def black_scholes_valuation(s, sigma, k, t, r, type_sign, position=1, with_price: bool = True) -> dict:
+    """
+    Price and all five Greeks from a single evaluation of d1, d2, the discount factor, the CDFs and the pdf.
+    Broadcasts like black_scholes_price, so passing leg arrays evaluates every leg at once.
+    Conventions match Greeks.calculate_single_option_greeks (vega and rho per 1%, theta per day).
+    """
+    d1, d2 = black_scholes_d1_d2(s, sigma, k, t, r)
+    sqrt_t = np.sqrt(t)
+    pdf_d1 = _norm_pdf(d1)
+    cdf_d1 = ndtr(d1)
+    cdf_w_d2 = ndtr(type_sign * d2)
+    discounted_strike = k * np.exp(-r * t)
+    is_put = type_sign < 0
+
+    valuation = {}
+    if with_price:
+        valuation["price"] = (type_sign * ((s * ndtr(type_sign * d1)) - (discounted_strike * cdf_w_d2))) * position
+
+    first_term = -(s * pdf_d1 * sigma) / (2 * sqrt_t)
+    second_term = -type_sign * r * discounted_strike * cdf_w_d2
+    valuation.update({
+        "delta": position * (cdf_d1 - is_put),
+        "gamma": position * pdf_d1 / (s * sigma * sqrt_t),
+        "vega": position * s * pdf_d1 * sqrt_t / 100,
+        "theta": position * (first_term + second_term) / BASE,
+        "rho": type_sign * position * k * t * np.exp(-r * t) * cdf_w_d2 / 100
+    })
+    return valuation
+
+
+def black_scholes_greeks(s, sigma, k, t, r, type_sign, position=1) -> dict:
+    """All five Greeks in a single pass (see black_scholes_valuation)"""
+    return black_scholes_valuation(s, sigma, k, t, r, type_sign, position, with_price=False)
+
+
+def black_scholes_price_vega(s, sigma, k, t, r, type_sign, position=1) -> tuple[np.ndarray, np.ndarray]:
+    """Price and vega per unit of vol (not per 1% as in black_scholes_valuation), sharing d1 and d2"""
+    d1, d2 = black_scholes_d1_d2(s, sigma, k, t, r)
+    discounted_strike = k * np.exp(-r * t)
+    price = (type_sign * ((s * ndtr(type_sign * d1)) - (discounted_strike * ndtr(type_sign * d2)))) * position
+    vega = position * s * _norm_pdf(d1) * np.sqrt(t)
+    return price, vega
+
+
+# Implied volatility
+IMPLIED_VOL_BOUNDS = (1e-4, 5.0)
+IMPLIED_VOL_SCAN_POINTS = 16  # Log-spaced vols scanned for a bracket when the bounds do not give one
+IMPLIED_VOL_EXTREMUM_STEPS = 40  # Bisections locating the extremum of a value not monotonic in vol
+
+
+def solve_implied_vol(value_and_vega: Callable[[np.ndarray, np.ndarray], tuple[np.ndarray, np.ndarray]],
+                      target, initial_vol=0.3, vol_bounds: tuple[float, float] = IMPLIED_VOL_BOUNDS,
+                      tol: float = 1e-8, max_iter: int = 100) -> dict:
+    """
+    Vectorized safeguarded Newton solver for value(sigma) = target.
+    value_and_vega(sigma, idx) returns the model value and its derivative in sigma for the flat indices idx.
+    Each element keeps a bracket [low, high] on which the value crosses the target: Newton steps leaving
+    the bracket fall back to bisection, and only unconverged elements are re-evaluated. When the vol bounds
+    do not bracket the target (values not monotonic in vol, e.g. butterflies), a log-spaced vol grid is
+    scanned and the crossing nearest initial_vol is kept.
+    Returns {"vol", "converged", "iterations"} shaped like target. Targets that cannot be reached within
+    vol_bounds (e.g. below intrinsic value) or not solved within max_iter get a NaN vol and converged=False.
+    """
+    target = np.asarray(target, dtype=float)
+    shape, target = target.shape, target.ravel()
+    n = target.size
+    low, high = vol_bounds
+
+    vol = np.full(n, np.nan)
+    converged = np.zeros(n, dtype=bool)
+    iterations = np.zeros(n, dtype=int)
+    initial = np.clip(np.broadcast_to(np.asarray(initial_vol, dtype=float), shape).ravel(), low, high)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        # ---- Bracket ----
+        all_idx = np.arange(n)
+        lo, hi = np.full(n, low), np.full(n, high)
+        f_lo = value_and_vega(lo, all_idx)[0] - target
+        f_hi = value_and_vega(hi, all_idx)[0] - target
+        # A bound within tol of the target counts as a crossing (deep ITM prices at their intrinsic value)
+        f_lo[np.abs(f_lo) <= tol] = 0.0
+        f_hi[np.abs(f_hi) <= tol] = 0.0
+        finite = np.isfinite(target)
+        bracketed = finite & (np.sign(f_lo) != np.sign(f_hi))
+
+        # Values not monotonic in vol (butterflies, calendars) may cross the target twice inside the bounds
+        scan = np.flatnonzero(finite & ~bracketed)
+        if scan.size:
+            rows, scan_lo, scan_hi, scan_f_lo, scan_f_hi = _scan_bracket(
+                value_and_vega, target, scan, initial, vol_bounds
+            )
+            lo[rows], hi[rows], f_lo[rows], f_hi[rows] = scan_lo, scan_hi, scan_f_lo, scan_f_hi
+            bracketed[rows] = True
+
+        idx = np.flatnonzero(bracketed)
+        increasing = (f_hi > f_lo)[idx]
+        lo, hi = lo[idx], hi[idx]
+        sigma = np.clip(initial[idx], lo, hi)
+
+        # ---- Newton / bisection iterations on the active elements ----
+        for it in range(1, max_iter + 1):
+            if idx.size == 0:
+                break
+
+            value, vega = value_and_vega(sigma, idx)
+            f = value - target[idx]
+            iterations[idx] = it
+
+            done = np.abs(f) <= tol
+            vol[idx[done]] = sigma[done]
+            converged[idx[done]] = True
+
+            above = (f > 0) == increasing
+            lo = np.where(above, lo, sigma)
+            hi = np.where(above, sigma, hi)
+
+            newton = sigma - f / vega
+            in_bracket = np.isfinite(newton) & (newton > lo) & (newton < hi)
+            sigma = np.where(in_bracket, newton, 0.5 * (lo + hi))
+
+            keep = ~done
+            idx, increasing, lo, hi, sigma = idx[keep], increasing[keep], lo[keep], hi[keep], sigma[keep]
+
+    return {"vol": vol.reshape(shape), "converged": converged.reshape(shape), "iterations": iterations.reshape(shape)}
+
+
+def _scan_bracket(value_and_vega: Callable[[np.ndarray, np.ndarray], tuple[np.ndarray, np.ndarray]],
+                  target: np.ndarray, idx: np.ndarray, initial: np.ndarray, vol_bounds: tuple[float, float]):
+    """
+    Brackets of the flat indices idx whose value is not monotonic in vol, nearest to their initial vol.
+    A log-spaced vol grid is scanned for crossings of the target. Where none shows, both crossings may lie
+    in one grid cell around the extremum of the value: it is located by bisection on the sign of the vega,
+    and bracketed with its neighbour on the side of the initial vol.
+    Returns (rows, lo, hi, f_lo, f_hi) for the indices that got a bracket.
+    """
+    grid = np.geomspace(*vol_bounds, IMPLIED_VOL_SCAN_POINTS)
+    columns = np.arange(idx.size)
+    f_grid = np.stack([value_and_vega(np.full(idx.size, v), idx)[0] for v in grid]) - target[idx]
+
+    # ---- Crossings between grid points ----
+    crossing = np.sign(f_grid[:-1]) != np.sign(f_grid[1:])
+    distance = np.abs(np.log(grid[:-1] * grid[1:])[:, None] - 2.0 * np.log(initial[idx]))
+    cell = np.argmin(np.where(crossing, distance, np.inf), axis=0)
+    found = crossing[cell, columns]
+    lo, hi = grid[cell], grid[cell + 1]
+    f_lo, f_hi = f_grid[cell, columns], f_grid[cell + 1, columns]
+
+    # ---- Crossings around the extremum of the value ----
+    rest = np.flatnonzero(~found)
+    if rest.size:
+        sign = np.sign(f_grid[0, rest])
+        peak = np.argmax(-sign * f_grid[:, rest], axis=0)
+        left = grid[np.maximum(peak - 1, 0)]
+        right = grid[np.minimum(peak + 1, len(grid) - 1)]
+        a, b = left.copy(), right.copy()
+        for _ in range(IMPLIED_VOL_EXTREMUM_STEPS):
+            mid = 0.5 * (a + b)
+            rising = -sign * value_and_vega(mid, idx[rest])[1] > 0
+            a, b = np.where(rising, mid, a), np.where(rising, b, mid)
+        extremum = 0.5 * (a + b)
+        f_extremum = value_and_vega(extremum, idx[rest])[0] - target[idx[rest]]
+        reached = np.sign(f_extremum) != sign
+
+        take_left = initial[idx[rest]] <= extremum
+        side = np.where(take_left, left, right)
+        f_side = value_and_vega(side, idx[rest])[0] - target[idx[rest]]
+        lo[rest] = np.where(take_left, side, extremum)
+        hi[rest] = np.where(take_left, extremum, side)
+        f_lo[rest] = np.where(take_left, f_side, f_extremum)
+        f_hi[rest] = np.where(take_left, f_extremum, f_side)
+        found[rest] = reached
+
+    return idx[found], lo[found], hi[found], f_lo[found], f_hi[found]
+
 
 # Vanilla Option Pricer using Black-Scholes Model
 class Option(BaseModel):
@@ -20,31 +231,91 @@ class Option(BaseModel):
             raise ValueError("Position must be +1 (long) or -1 (short)")
         return self
 
-    def d1(self, s: float, sigma: float) -> float:
-        return (np.log(s / self.K) + (self.r + 0.5 * sigma ** 2) * self.T) / (sigma * np.sqrt(self.T))
+    def d1(self, s: float, sigma: float | VolSurface) -> float:
+        return black_scholes_d1_d2(s, leg_vol(sigma, self.K, self.T), self.K, self.T, self.r)[0]
+
+    def d2(self, s: float, sigma: float | VolSurface) -> float:
+        return black_scholes_d1_d2(s, leg_vol(sigma, self.K, self.T), self.K, self.T, self.r)[1]
 
-    def d2(self, s: float, sigma: float) -> float:
-        return self.d1(s, sigma) - sigma * np.sqrt(self.T)
+    @property
+    def type_sign(self) -> int:
+        """+1 for calls, -1 for puts"""
+        return 1 if self.option_type == 'call' else -1
 
-    def call_price(self, s: float, sigma: float) -> float:
-        d1, d2 = self.d1(s, sigma), self.d2(s, sigma)
-        return ((s * norm.cdf(d1)) - (self.K * np.exp(-self.r * self.T) * norm.cdf(d2))) * self.position
+    def call_price(self, s: float, sigma: float | VolSurface) -> float:
+        return black_scholes_price(s, leg_vol(sigma, self.K, self.T), self.K, self.T, self.r, 1, self.position)
 
-    def put_price(self, s: float, sigma: float) -> float:
-        d1, d2 = self.d1(s, sigma), self.d2(s, sigma)
-        return ((self.K * np.exp(-self.r * self.T) * norm.cdf(-d2)) - (s * norm.cdf(-d1))) * self.position
+    def put_price(self, s: float, sigma: float | VolSurface) -> float:
+        return black_scholes_price(s, leg_vol(sigma, self.K, self.T), self.K, self.T, self.r, -1, self.position)
 
-    def price(self, s: float, sigma: float) -> float:
+    def price(self, s: float, sigma: float | VolSurface) -> float:
         return self.call_price(s, sigma) if self.option_type == 'call' else self.put_price(s, sigma)
 
+    def price_batch(self, s_array, sigma_array) -> np.ndarray:
+        """Price the option over broadcastable arrays of spots and vols (or a VolSurface)"""
+        s_array, sigma_array = np.asarray(s_array, dtype=float), np.asarray(leg_vol(sigma_array, self.K, self.T), dtype=float)
+        return black_scholes_price(s_array, sigma_array, self.K, self.T, self.r, self.type_sign, self.position)
+
+    def price_vega(self, s, sigma) -> tuple[np.ndarray, np.ndarray]:
+        """Price and vega per unit of vol over broadcastable arrays of spots and vols (or a VolSurface)"""
+        return black_scholes_price_vega(s, leg_vol(sigma, self.K, self.T), self.K, self.T, self.r, self.type_sign, self.position)
+
+    def implied_vol(self, price, s, initial_vol=0.3, tol: float = 1e-8, max_iter: int = 100) -> dict:
+        """
+        Implied vols of an array of prices (same sign convention as price()) at broadcastable spots.
+        Returns {"vol", "converged", "iterations"}, see solve_implied_vol.
+        """
+        price, s = np.broadcast_arrays(np.asarray(price, dtype=float), np.asarray(s, dtype=float))
+        flat_s = s.ravel()
+        return solve_implied_vol(
+            lambda sigma, idx: self.price_vega(flat_s[idx], sigma),
+            price, initial_vol=initial_vol, tol=tol, max_iter=max_iter
+        )
+
 # Strategy Pricer
 class Strategy(BaseModel):
     name: str
     options: List[Option]
 
-    def price(self, s: float, sigma: float) -> float:
+    def price(self, s: float, sigma: float | VolSurface) -> float:
         return sum(option.price(s, sigma) for option in self.options)
 
+    def price_batch(self, s_array, sigma_array) -> np.ndarray:
+        """
+        Price the strategy over broadcastable arrays of spots and vols (or a VolSurface).
+        Each leg is evaluated once over the whole grid and legs are accumulated in order,
+        so results match the scalar sum() exactly.
+        """
+        s_array = np.asarray(s_array, dtype=float)
+        if not isinstance(sigma_array, VolSurface):
+            s_array, sigma_array = np.broadcast_arrays(s_array, np.asarray(sigma_array, dtype=float))
+        total = np.zeros(s_array.shape)
+        for option in self.options:
+            total = total + option.price_batch(s_array, sigma_array)
+        return total
+
+    def price_vega(self, s, sigma) -> tuple[np.ndarray, np.ndarray]:
+        """Strategy price and vega per unit of vol, accumulated leg by leg"""
+        price, vega = 0.0, 0.0
+        for option in self.options:
+            leg_price, leg_vega = option.price_vega(s, sigma)
+            price, vega = price + leg_price, vega + leg_vega
+        return price, vega
+
+    def implied_vol(self, price, s, initial_vol=0.3, tol: float = 1e-8, max_iter: int = 100) -> dict:
+        """
+        Flat implied vols (same vol on every leg) of an array of strategy prices at broadcastable spots.
+        Strategies that are not monotonic in vol (calendars, risk reversals) are solved on the bracket
+        of the vol bounds; prices without a sign change there are reported as not converged.
+        Returns {"vol", "converged", "iterations"}, see solve_implied_vol.
+        """
+        price, s = np.broadcast_arrays(np.asarray(price, dtype=float), np.asarray(s, dtype=float))
+        flat_s = s.ravel()
+        return solve_implied_vol(
+            lambda sigma, idx: self.price_vega(flat_s[idx], sigma),
+            price, initial_vol=initial_vol, tol=tol, max_iter=max_iter
+        )
+
     @classmethod
     def call(cls, k: float, t: float, r: float):
         opts = [Option(K=k, T=t, r=r, option_type="call")]
@@ -137,8 +408,8 @@ class Strategy(BaseModel):
         return cls(name=f"{option_type.capitalize()} Butterfly", options=opts)
 
     @staticmethod
-    def generate_random_strategy(level: Literal['easy', 'hard'], s: float):
-        random_strat_name, random_strat_data = generate_random_strat_data(level, s)
+    def generate_random_strategy(level: Literal['easy', 'hard'], s: float, rng: Optional[np.random.Generator] = None):
+        random_strat_name, random_strat_data = generate_random_strat_data(level, s, rng)
         generation_method = getattr(Strategy, random_strat_name)
         return generation_method(**random_strat_data)
     
@@ -156,138 +427,172 @@ class Greeks(BaseModel):
     def _is_strategy(self) -> bool:
         return self.strategy is not None
 
+    def _legs(self) -> List[Option]:
+        return self.strategy.options if self._is_strategy() else [self.option]
+
     @staticmethod
-    def calculate_single_option_greeks(option: Option, s: float, sigma: float) -> dict:
+    def calculate_single_option_greeks(option: Option, s: float, sigma: float | VolSurface) -> dict:
         """
         Calculate Greeks for a single option
         Returns raw Greeks (not multiplied by position or quantity)
         """
-        
-        d1 = option.d1(s, sigma)
-        d2 = option.d2(s, sigma)
-        
-        # Delta
-        if option.option_type == 'call':
-            delta = option.position * norm.cdf(d1)
-        else:
-            delta = option.position * (norm.cdf(d1) - 1)
-        
-        # Gamma
-        gamma = option.position * norm.pdf(d1) / (s * sigma * np.sqrt(option.T))
-        
-        # Vega
-        vega = option.position * s * norm.pdf(d1) * np.sqrt(option.T) / 100
-    
-        # Theta
-        first_term = -(s * norm.pdf(d1) * sigma) / (2 * np.sqrt(option.T))
-        if option.option_type == 'call':
-            second_term = -option.r * option.K * np.exp(-option.r * option.T) * norm.cdf(d2)
-        else:
-            second_term = option.r * option.K * np.exp(-option.r * option.T) * norm.cdf(-d2)
-        theta = option.position * (first_term + second_term) / BASE
-        
-        # Rho
-        if option.option_type == 'call':
-            rho = option.position * option.K * option.T * np.exp(-option.r * option.T) * norm.cdf(d2) / 100
-        else:
-            rho = -option.position * option.K * option.T* np.exp(-option.r * option.T) * norm.cdf(-d2) / 100
-        
-        return {
-            "delta": delta,
-            "gamma": gamma,
-            "vega": vega,
-            "theta": theta,
-            "rho": rho
-        }
-    
+        greeks = black_scholes_greeks(s, leg_vol(sigma, option.K, option.T), option.K, option.T, option.r, option.type_sign, option.position)
+        return {name: float(value) for name, value in greeks.items()}
+
+    def leg_greeks(self, s: float, sigma: float | VolSurface) -> dict:
+        """
+        Fused Greeks engine: evaluates every leg exactly once, vectorized across legs.
+        Returns {greek_name: array of per-leg values}
+        """
+        legs = self._legs()
+        strikes = np.array([opt.K for opt in legs], dtype=float)
+        maturities = np.array([opt.T for opt in legs], dtype=float)
+        return black_scholes_greeks(
+            s, leg_vol(sigma, strikes, maturities),
+            strikes,
+            maturities,
+            np.array([opt.r for opt in legs], dtype=float),
+            np.array([opt.type_sign for opt in legs], dtype=float),
+            np.array([opt.position for opt in legs], dtype=float),
+        )
+
+    @staticmethod
+    def _total(leg_greeks: dict) -> dict:
+        return {name: float(values.sum()) for name, values in leg_greeks.items()}
+
     def delta(self, s: float, sigma: float) -> float:
         """Calculate total Delta"""
-        if self._is_strategy():
-            return sum(self.calculate_single_option_greeks(opt, s, sigma)["delta"] for opt in self.strategy.options)
-        else:
-            return self.calculate_single_option_greeks(self.option, s, sigma)["delta"]
-    
+        return float(self.leg_greeks(s, sigma)["delta"].sum())
+
     def gamma(self, s: float, sigma: float) -> float:
         """Calculate total Gamma"""
-        if self._is_strategy():
-            return sum(self.calculate_single_option_greeks(opt, s, sigma)["gamma"] for opt in self.strategy.options)
-        else:
-            return self.calculate_single_option_greeks(self.option, s, sigma)["gamma"]
-    
+        return float(self.leg_greeks(s, sigma)["gamma"].sum())
+
     def vega(self, s: float, sigma: float) -> float:
         """Calculate total Vega"""
-        if self._is_strategy():
-            return sum(self.calculate_single_option_greeks(opt, s, sigma)["vega"] for opt in self.strategy.options)
-        else:
-            return self.calculate_single_option_greeks(self.option, s, sigma)["vega"]
-    
+        return float(self.leg_greeks(s, sigma)["vega"].sum())
+
     def theta(self, s: float, sigma: float) -> float:
         """Calculate total Theta"""
-        if self._is_strategy():
-            return sum(self.calculate_single_option_greeks(opt, s, sigma)["theta"] for opt in self.strategy.options)
-        else:
-            return self.calculate_single_option_greeks(self.option, s, sigma)["theta"]
-    
+        return float(self.leg_greeks(s, sigma)["theta"].sum())
+
     def rho(self, s: float, sigma: float) -> float:
         """Calculate total Rho"""
-        if self._is_strategy():
-            return sum(self.calculate_single_option_greeks(opt, s, sigma)["rho"] for opt in self.strategy.options)
-        else:
-            return self.calculate_single_option_greeks(self.option, s, sigma)["rho"]
+        return float(self.leg_greeks(s, sigma)["rho"].sum())
 
     def all_greeks(self, s: float, sigma: float) -> dict:
-        """ Calculate all Greeks at once """
-        return {
-            "delta": self.delta(s, sigma),
-            "gamma": self.gamma(s, sigma),
-            "vega": self.vega(s, sigma),
-            "theta": self.theta(s, sigma),
-            "rho": self.rho(s, sigma),
-        }
-    
-    def greeks_by_leg(self, s: float, sigma: float) -> List[dict]:
-        """ Return Greeks breakdown by leg """
-        if self._is_strategy():
-            legs = []
-            for idx, option in enumerate(self.strategy.options):
-                leg_greeks = self.calculate_single_option_greeks(option, s, sigma)
-                leg_info = {
-                    "leg_index": idx,
-                    "option_type": option.option_type.upper(),
-                    "strike": option.K,
-                    "maturity": option.T,
-                    "dte": int(option.T * BASE),
-                    "position": "LONG" if option.position > 0 else "SHORT",
-                    "delta": leg_greeks["delta"],
-                    "gamma": leg_greeks["gamma"],
-                    "vega": leg_greeks["vega"],
-                    "theta": leg_greeks["theta"],
-                    "rho": leg_greeks["rho"]
-                }
-                legs.append(leg_info)
-            return legs
-        else:
-            leg_greeks = self.calculate_single_option_greeks(self.option, s, sigma)
+        """ Calculate all Greeks at once (single pass over the legs) """
+        return self._total(self.leg_greeks(s, sigma))
+
+    def greeks_by_leg(self, s: float, sigma: float, leg_greeks: Optional[dict] = None) -> List[dict]:
+        """ Return Greeks breakdown by leg, reusing precomputed leg Greeks when given """
+        if leg_greeks is None:
+            leg_greeks = self.leg_greeks(s, sigma)
+
+        legs = []
+        for idx, option in enumerate(self._legs()):
             leg_info = {
-                "leg_index": 0,
-                "option_type": self.option.option_type.upper(),
-                "strike": self.option.K,
-                "maturity": self.option.T,
-                "dte": int(self.option.T * BASE),
-                "position": "LONG" if self.option.position > 0 else "SHORT",
-                "delta": leg_greeks["delta"],
-                "gamma": leg_greeks["gamma"],
-                "vega": leg_greeks["vega"],
-                "theta": leg_greeks["theta"],
-                "rho": leg_greeks["rho"]
+                "leg_index": idx,
+                "option_type": option.option_type.upper(),
+                "strike": option.K,
+                "maturity": option.T,
+                "dte": int(option.T * BASE),
+                "position": "LONG" if option.position > 0 else "SHORT",
+                "delta": float(leg_greeks["delta"][idx]),
+                "gamma": float(leg_greeks["gamma"][idx]),
+                "vega": float(leg_greeks["vega"][idx]),
+                "theta": float(leg_greeks["theta"][idx]),
+                "rho": float(leg_greeks["rho"][idx])
             }
-            return [leg_info]
-    
+            legs.append(leg_info)
+        return legs
+
     def summary(self, s: float, sigma: float) -> dict:
         """ Get complete summary with total Greeks and per-leg breakdown """
+        leg_greeks = self.leg_greeks(s, sigma)
         return {
             "instrument_type": "Strategy" if self._is_strategy() else "Option",
             "name": self.strategy.name if self._is_strategy() else f"{self.option.option_type.upper()} {self.option.K}",
-            "total_greeks": self.all_greeks(s, sigma),
-            "legs": self.greeks_by_leg(s, sigma)
-        }
\ No newline at end of file
+            "total_greeks": self._total(leg_greeks),
+            "legs": self.greeks_by_leg(s, sigma, leg_greeks)
+        }
+
+
+def _best_time(func, repeat: int) -> tuple[float, object]:
+    """Fastest of repeat runs of func (seconds) and its result"""
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def benchmark_price_batch(n_points: int = 10_000, seed: int = 0, repeat: int = 3) -> dict:
+    """
+    Scalar price() loop against one price_batch() call on n_points random (spot, vol) pairs, for a call and a
+    butterfly (best of repeat runs). Returns the seconds of both paths and the speedup per instrument.
+    """
+    rng = np.random.default_rng(seed)
+    spots = rng.uniform(50.0, 150.0, n_points)
+    vols = rng.uniform(0.05, 0.8, n_points)
+    instruments = {
+        "call": Option(K=100.0, T=0.5, r=0.04, option_type="call"),
+        "butterfly": Strategy.butterfly(90.0, 100.0, 110.0, 0.5, 0.04),
+    }
+
+    report = {}
+    for name, instrument in instruments.items():
+        scalar_seconds, scalar = _best_time(
+            lambda: [instrument.price(s, sigma) for s, sigma in zip(spots.tolist(), vols.tolist())], repeat
+        )
+        batch_seconds, batch = _best_time(lambda: instrument.price_batch(spots, vols), repeat)
+
+        report[name] = {
+            "scalar_s": scalar_seconds,
+            "batch_s": batch_seconds,
+            "speedup": scalar_seconds / batch_seconds,
+            "max_abs_diff": float(np.max(np.abs(batch - np.asarray(scalar, dtype=float)))),
+        }
+    return report
+
+
+def benchmark_implied_vol(n_prices: int = 100_000, seed: int = 0, repeat: int = 3) -> dict:
+    """
+    Implied vols per second of one implied_vol() call on n_prices prices of random (spot, vol) pairs, for a call,
+    a put and a butterfly (best of repeat runs), with the share of converged elements.
+    """
+    rng = np.random.default_rng(seed)
+    spots = rng.uniform(70.0, 130.0, n_prices)
+    vols = rng.uniform(0.05, 1.0, n_prices)
+    instruments = {
+        "call": Option(K=100.0, T=0.5, r=0.04, option_type="call"),
+        "put": Option(K=100.0, T=0.5, r=0.04, option_type="put"),
+        "butterfly": Strategy.butterfly(90.0, 100.0, 110.0, 0.5, 0.04),
+    }
+
+    report = {}
+    for name, instrument in instruments.items():
+        prices = instrument.price_batch(spots, vols)
+        seconds, result = _best_time(lambda: instrument.implied_vol(prices, spots), repeat)
+        report[name] = {"seconds": seconds, "ivs_per_s": n_prices / seconds,
+                        "converged": float(result["converged"].mean())}
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Scalar vs vectorized Black-Scholes pricing, implied vol throughput")
+    parser.add_argument("--points", type=int, default=10_000, help="(spot, vol) pairs priced")
+    parser.add_argument("--ivs", type=int, default=100_000, help="Prices inverted into implied vols")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for name, row in benchmark_price_batch(args.points, args.seed).items():
+        print(f"{name:>10}  scalar {row['scalar_s'] * 1e3:9.2f} ms  batch {row['batch_s'] * 1e3:7.3f} ms  "
+              f"speedup {row['speedup']:8.1f}x  max |diff| {row['max_abs_diff']:.1e}")
+    for name, row in benchmark_implied_vol(args.ivs, args.seed).items():
+        print(f"{name:>10}  implied vols {row['ivs_per_s']:12,.0f} /s  converged {row['converged']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
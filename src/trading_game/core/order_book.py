@@ -0,0 +1,354 @@
+import argparse
+import heapq
+import itertools
+import math
+import time
+from bisect import bisect_left, bisect_right, insort
+from operator import itemgetter
+from typing import Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+BUY, SELL = 1, -1
+
+# Cancelled entries tolerated in the heaps (beyond twice the live orders) before they are rebuilt
+HEAP_SLACK = 64
+
+
+class Fill(NamedTuple):
+    """`quantity` of order `order_id` traded at `price` against the order `counterparty` (None: the market)"""
+    order_id: str
+    price: float
+    quantity: int
+    counterparty: Optional[str]
+
+
+class RestingOrder:
+    """Remaining quantity of an order resting in an OrderBook (market orders rest at an infinite limit)"""
+    __slots__ = ("order_id", "side", "limit", "quantity", "seq")
+
+    def __init__(self, order_id: str, side: int, limit: float, quantity: int, seq: int):
+        self.order_id = order_id
+        self.side = side
+        self.limit = limit
+        self.quantity = quantity
+        self.seq = seq
+
+    def __repr__(self) -> str:
+        return f"RestingOrder({self.order_id!r}, side={self.side}, limit={self.limit}, quantity={self.quantity})"
+
+
+class OrderBook:
+    """
+    Limit order book of one instrument with price-time priority. Bids and asks are heaps keyed on
+    (price, arrival sequence); cancelled or amended entries are skipped lazily when they reach the top.
+    The market trades at its (theoretical) price, up to market_depth per side and tick (None: unlimited),
+    and competes with the resting orders on price, resting orders winning ties. So an incoming order first
+    takes the better priced resting orders, then the market, and its remainder rests; on each tick the
+    market fills the resting orders its new price crosses (match_market). Orders are never crossed at rest.
+    `created` orders books by creation and `tick` is the tick of the last depth reset, both set by their owner.
+    """
+
+    def __init__(self, market_depth: Optional[int] = None, created: int = 0, tick: int = 0):
+        self.market_depth = market_depth
+        self.created = created
+        self.bids: List[Tuple[float, int, RestingOrder]] = []  # (-limit, seq, order)
+        self.asks: List[Tuple[float, int, RestingOrder]] = []  # (limit, seq, order)
+        self.orders: Dict[str, RestingOrder] = {}
+        self._seq = itertools.count()
+        self._stale = 0
+        self.new_tick(tick)
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self.orders
+
+    def new_tick(self, tick: int = 0) -> None:
+        """Restore the market depth on both sides"""
+        depth = math.inf if self.market_depth is None else self.market_depth
+        self.market_left = {BUY: depth, SELL: depth}
+        self.tick = tick
+
+    # ---- Heaps ----
+    def _best(self, heap: list) -> Optional[RestingOrder]:
+        """Live order on top of a heap, dropping the stale entries above it"""
+        orders = self.orders
+        while heap:
+            order = heap[0][2]
+            if orders.get(order.order_id) is order:
+                return order
+            heapq.heappop(heap)
+            self._stale -= 1
+        return None
+
+    def _push(self, order: RestingOrder) -> None:
+        if order.side == BUY:
+            heapq.heappush(self.bids, (-order.limit, order.seq, order))
+        else:
+            heapq.heappush(self.asks, (order.limit, order.seq, order))
+
+    def _discard(self, order: RestingOrder) -> None:
+        """Take an order out of the book, its heap entry goes stale"""
+        del self.orders[order.order_id]
+        self._stale += 1
+        if self._stale > 2 * len(self.orders) + HEAP_SLACK:
+            self.bids = [entry for entry in self.bids if self.orders.get(entry[2].order_id) is entry[2]]
+            self.asks = [entry for entry in self.asks if self.orders.get(entry[2].order_id) is entry[2]]
+            heapq.heapify(self.bids)
+            heapq.heapify(self.asks)
+            self._stale = 0
+
+    # ---- Order flow ----
+    def submit(self, order_id: str, side: int, quantity: int, limit: Optional[float] = None,
+               market_price: Optional[float] = None) -> List[Fill]:
+        """
+        Match an order (limit None: market order) against the resting orders and the market quoting
+        market_price (None: no market), then rest its remainder. Returns the fills of both sides of every trade.
+        """
+        if order_id in self.orders:
+            raise ValueError(f"Order {order_id} is already in the book.")
+        if quantity <= 0:
+            raise ValueError("Quantity must be > 0.")
+
+        limit = side * math.inf if limit is None else float(limit)
+        opposite = self.asks if side == BUY else self.bids
+        fills = []
+        while quantity:
+            best = self._best(opposite)
+            market = (market_price is not None and self.market_left[side] > 0
+                      and side * (limit - market_price) >= 0)
+
+            if best is not None and side * (limit - best.limit) >= 0 and (
+                    not market or side * (market_price - best.limit) >= 0):
+                # Trade at the resting price (a resting market order takes the market, else the incoming limit)
+                price = best.limit if math.isfinite(best.limit) else market_price
+                if price is None:
+                    if not math.isfinite(limit):
+                        break
+                    price = limit
+                traded = min(quantity, best.quantity)
+                fills.append(Fill(order_id, price, traded, best.order_id))
+                fills.append(Fill(best.order_id, price, traded, order_id))
+                best.quantity -= traded
+                if not best.quantity:
+                    self._discard(best)
+            elif market:
+                traded = min(quantity, self.market_left[side])
+                self.market_left[side] -= traded
+                fills.append(Fill(order_id, market_price, traded, None))
+            else:
+                break
+            quantity -= traded
+
+        if quantity:
+            order = RestingOrder(order_id, side, limit, quantity, next(self._seq))
+            self.orders[order_id] = order
+            self._push(order)
+        return fills
+
+    def cancel(self, order_id: str) -> Optional[RestingOrder]:
+        """Remove a resting order, returns it (None if it is not in the book)"""
+        order = self.orders.get(order_id)
+        if order is not None:
+            self._discard(order)
+        return order
+
+    def replace(self, order_id: str, quantity: Optional[int] = None, limit: Optional[float] = None,
+                market_price: Optional[float] = None) -> List[Fill]:
+        """
+        Amend the remaining quantity and / or the limit of a resting order. A smaller quantity at the same limit
+        keeps the time priority, otherwise the order is requeued and matched again like a new one.
+        """
+        order = self.orders.get(order_id)
+        if order is None:
+            raise ValueError(f"Order {order_id} is not in the book.")
+        quantity = order.quantity if quantity is None else quantity
+        limit = order.limit if limit is None else float(limit)
+        if quantity <= 0:
+            raise ValueError("Quantity must be > 0.")
+
+        if limit == order.limit and quantity <= order.quantity:
+            order.quantity = quantity
+            return []
+        self._discard(order)
+        return self.submit(order_id, order.side, quantity, None if math.isinf(limit) else limit, market_price)
+
+    def match_market(self, market_price: float) -> List[Fill]:
+        """Fill the resting orders crossed by the market price, best first, within the market depth left"""
+        fills = []
+        for side, heap in ((BUY, self.bids), (SELL, self.asks)):
+            while self.market_left[side] > 0:
+                best = self._best(heap)
+                if best is None or side * (best.limit - market_price) < 0:
+                    break
+                traded = min(best.quantity, self.market_left[side])
+                self.market_left[side] -= traded
+                fills.append(Fill(best.order_id, market_price, traded, None))
+                best.quantity -= traded
+                if not best.quantity:
+                    self._discard(best)
+        return fills
+
+    # ---- Views ----
+    def best_bid(self) -> Optional[float]:
+        best = self._best(self.bids)
+        return None if best is None else best.limit
+
+    def best_ask(self) -> Optional[float]:
+        best = self._best(self.asks)
+        return None if best is None else best.limit
+
+    def resting(self) -> List[RestingOrder]:
+        """Resting orders in arrival order (the order to submit them again to rebuild the book)"""
+        return sorted(self.orders.values(), key=lambda order: order.seq)
+
+    def levels(self, side: int) -> List[Tuple[float, int]]:
+        """(price, total quantity) of each price level of a side, best first"""
+        totals: Dict[float, int] = {}
+        for order in self.orders.values():
+            if order.side == side:
+                totals[order.limit] = totals.get(order.limit, 0) + order.quantity
+        return sorted(totals.items(), key=lambda level: -side * level[0])
+
+
+_level = itemgetter(0)
+
+
+class TriggerIndex:
+    """
+    Spot levels at which order books must be looked at again: each key (an instrument) has a band (low, high) of
+    spots and triggers once the spot leaves it. Both sides are kept sorted, so finding the keys a new spot triggers
+    is a bisection and only touches those keys. Keys must be orderable, they break ties between equal levels.
+    """
+
+    def __init__(self):
+        self.below: List[Tuple[float, Hashable]] = []  # (low, key), triggered by a spot <= low
+        self.above: List[Tuple[float, Hashable]] = []  # (high, key), triggered by a spot >= high
+        self.bands: Dict[Hashable, Tuple[float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self.bands)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.bands
+
+    def set(self, key: Hashable, low: float, high: float) -> None:
+        """(Re)place the band of a key, infinite bounds never trigger"""
+        self.discard(key)
+        if low > -math.inf:
+            insort(self.below, (low, key))
+        if high < math.inf:
+            insort(self.above, (high, key))
+        self.bands[key] = (low, high)
+
+    @staticmethod
+    def _remove(entries: List[Tuple[float, Hashable]], entry: Tuple[float, Hashable]) -> None:
+        i = bisect_left(entries, entry)
+        if i < len(entries) and entries[i] == entry:
+            del entries[i]
+
+    def discard(self, key: Hashable) -> None:
+        band = self.bands.pop(key, None)
+        if band is not None:
+            self._remove(self.below, (band[0], key))
+            self._remove(self.above, (band[1], key))
+
+    def crossed(self, spot: float) -> List[Hashable]:
+        """Remove and return the keys whose band the spot left (bound included), by level"""
+        low_end = bisect_left(self.below, spot, key=_level)
+        high_end = bisect_right(self.above, spot, key=_level)
+        keys = [key for _, key in reversed(self.below[low_end:])] + [key for _, key in self.above[:high_end]]
+        del self.below[low_end:]
+        del self.above[:high_end]
+        for key in keys:
+            low, high = self.bands.pop(key)
+            if low < spot:
+                self._remove(self.below, (low, key))
+            if high > spot:
+                self._remove(self.above, (high, key))
+        return keys
+
+    def clear(self) -> None:
+        self.below.clear()
+        self.above.clear()
+        self.bands.clear()
+
+
+def benchmark(n_ops: int = 200_000, n_instruments: int = 8, seed: int = 0) -> dict:
+    """
+    Throughput of a random order flow over n_instruments books: 60% limit submissions around a random-walk mid,
+    5% market orders, 20% cancels, 10% replaces and 5% market moves. Returns ops per second per kind and overall.
+    """
+    rng = np.random.default_rng(seed)
+    kinds = rng.choice(5, size=n_ops, p=[0.60, 0.05, 0.20, 0.10, 0.05]).tolist()
+    instruments = rng.integers(n_instruments, size=n_ops).tolist()
+    sides = np.where(rng.random(n_ops) < 0.5, BUY, SELL).tolist()
+    offsets = np.round(rng.normal(0.0, 0.5, size=n_ops), 2).tolist()
+    quantities = rng.integers(1, 100, size=n_ops).tolist()
+    picks = rng.random(n_ops).tolist()
+    moves = rng.normal(0.0, 0.2, size=n_ops).tolist()
+    order_ids = [f"ORD_{i}" for i in range(n_ops)]
+
+    books = [OrderBook(market_depth=500) for _ in range(n_instruments)]
+    mids = [10.0] * n_instruments
+    live: List[List[str]] = [[] for _ in range(n_instruments)]
+    names = ("limit", "market", "cancel", "replace", "tick")
+    counts, elapsed = dict.fromkeys(names, 0), dict.fromkeys(names, 0.0)
+    n_fills = 0
+
+    clock = time.perf_counter
+    for i in range(n_ops):
+        kind, k = kinds[i], instruments[i]
+        book, ids = books[k], live[k]
+        start = clock()
+        if kind == 0:
+            # Passive side of the mid, so most limits rest
+            fills = book.submit(order_ids[i], sides[i], quantities[i],
+                                mids[k] - sides[i] * (0.05 + abs(offsets[i])), mids[k])
+            ids.append(order_ids[i])
+        elif kind == 1:
+            fills = book.submit(order_ids[i], sides[i], quantities[i], None, mids[k])
+        elif kind == 2:
+            fills = []
+            if ids:
+                book.cancel(ids.pop(int(picks[i] * len(ids))))
+        elif kind == 3:
+            fills = []
+            if ids:
+                order_id = ids[int(picks[i] * len(ids))]
+                if order_id in book:
+                    fills = book.replace(order_id, quantities[i], mids[k] - sides[i] * abs(offsets[i]), mids[k])
+        else:
+            mids[k] = max(mids[k] + moves[i], 0.5)
+            book.new_tick()
+            fills = book.match_market(mids[k])
+        elapsed[names[kind]] += clock() - start
+        counts[names[kind]] += 1
+        n_fills += len(fills)
+
+        if len(ids) > 4 * len(book) + 1_000:
+            live[k] = [order_id for order_id in ids if order_id in book]
+
+    total = sum(elapsed.values())
+    report = {name: counts[name] / elapsed[name] for name in names if elapsed[name]}
+    report.update({"ops_per_s": n_ops / total, "seconds": total, "fills": n_fills,
+                   "resting": sum(len(book) for book in books)})
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Order book throughput on a random order flow")
+    parser.add_argument("--ops", type=int, default=200_000, help="Order operations")
+    parser.add_argument("--instruments", type=int, default=8, help="Order books")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    report = benchmark(args.ops, args.instruments, args.seed)
+    for name, value in report.items():
+        print(f"{name:>12}  {value:>14,.1f}" if isinstance(value, float) else f"{name:>12}  {value:>14,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+from trading_game.models.vol_surface import VolSurface
+
+# Number of (legs, spot, vol) evaluations kept
+PRICING_CACHE_SIZE = 128
+
+
+def vol_key(volatility: float | VolSurface) -> Hashable:
+    """Hashable key of a flat vol or of the current state of a vol surface"""
+    if isinstance(volatility, VolSurface):
+        return volatility.cache_key()
+    return float(volatility)
+
+
+class PricingCache:
+    """
+    Bounded LRU memo of pricing results keyed on (canonical legs hash, spot, vol), the rates being part of the legs.
+    Several views of the same book at the same market (value, P&L, Greeks, positions) then share one evaluation.
+    Entries are dropped when the tick changes (new_tick), hits and misses are counted for monitoring.
+    """
+
+    def __init__(self, maxsize: int = PRICING_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.tick: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, legs_key: Hashable, spot_ref: float, volatility: float | VolSurface, compute: Callable[[], object]):
+        """Cached result for these legs at (spot_ref, volatility), calling compute() on a miss"""
+        key = (legs_key, float(spot_ref), vol_key(volatility))
+        cached = self._entries.get(key)
+        if cached is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return cached
+
+        self.misses += 1
+        result = compute()
+        self._entries[key] = result
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return result
+
+    def new_tick(self, tick: int) -> None:
+        """Drop every entry when the market moves to a new tick"""
+        if tick != self.tick:
+            self.tick = tick
+            self._entries.clear()
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters"""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "tick": self.tick,
+        }
@@ -1,28 +1,52 @@
-import random
 from datetime import date, timedelta
 from typing import Literal, Optional
 
-from pydantic import BaseModel, model_validator
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 from trading_game.config.request_pool import get_random_quote_phrase, get_random_response_phrase
 from trading_game.config.settings import BASE
-from trading_game.core.option_pricer import Strategy
+from trading_game.core.option_pricer import Strategy, leg_vol
 from trading_game.models.street import Investor
+from trading_game.models.vol_surface import VolSurface
+from trading_game.utils.app_utils import new_id, pick
 
 
 
 class QuoteRequest(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    request_id: Optional[str] = None
     investor: Investor
     level: Literal['easy', 'hard']
     init_price: float
     strat: Optional[Strategy] = None
-    way: Literal['buy', 'sell'] = random.choice(['buy', 'sell'])
-    quantity: Optional[float] = random.choice([250_000, 500_000, 1_000_000, 2_000_000])
+    way: Optional[Literal['buy', 'sell']] = None
+    quantity: Optional[float] = None
+    rng: Optional[np.random.Generator] = Field(default=None, exclude=True, repr=False)
+
+    @model_validator(mode="after")
+    def set_request_id(self):
+        if self.request_id is None:
+            self.request_id = new_id("q")
+        return self
 
     @model_validator(mode="after")
     def set_strat(self):
         if self.strat is None:
-            self.strat = Strategy.generate_random_strategy(self.level, self.init_price)
+            self.strat = Strategy.generate_random_strategy(self.level, self.init_price, self.rng)
+        return self
+
+    @model_validator(mode="after")
+    def set_way(self):
+        if self.way is None:
+            self.way = pick(['buy', 'sell'], self.rng)
+        return self
+
+    @model_validator(mode="after")
+    def set_quantity(self):
+        if self.quantity is None:
+            self.quantity = pick([250_000, 500_000, 1_000_000, 2_000_000], self.rng)
         return self
 
     @staticmethod
@@ -60,7 +84,7 @@ class QuoteRequest(BaseModel):
         strikes_str = f"{strikes[0]} " if len(strikes)==1 else f"{'-'.join(strikes)}"
         qty_str = f"{int(self.quantity / 1_000)}k" if self.quantity < 1_000_000 else f"{int(self.quantity / 1_000_000)}m"
 
-        phrase = get_random_quote_phrase()
+        phrase = get_random_quote_phrase(self.rng)
 
         templates = [
             f"{phrase} a {maturities_str} {strikes_str} {name} in {qty_str}",
@@ -68,9 +92,9 @@ class QuoteRequest(BaseModel):
             f"{phrase} {maturities_str} {strikes_str} {name} {qty_str}"
         ]
 
-        return f"<strong> {self.investor.company} [{self.investor.name}]: </strong> {random.choice(templates)}"
+        return f"<strong> {self.investor.company} [{self.investor.name}]: </strong> {pick(templates, self.rng)}"
 
-    def evaluate_bid_ask(self, bid: float, ask: float, price: float, vol: float) -> bool:
+    def evaluate_bid_ask(self, bid: float, ask: float, price: float, vol: float | VolSurface) -> bool:
         mid = self.strat.price(price, vol)
         if self.way=='buy' and ask <= mid + 0.5 * self.investor.width_tolerance * mid:
             return True
@@ -78,10 +102,20 @@ class QuoteRequest(BaseModel):
             return True
         return False
 
+    def implied_vols(self, bid: float, ask: float, price: float, vol: float | VolSurface) -> dict:
+        """Flat implied vols of a bid/ask on the requested strategy, solved from the current vol"""
+        first_leg = self.strat.options[0]
+        result = self.strat.implied_vol([bid, ask], price, initial_vol=leg_vol(vol, first_leg.K, first_leg.T))
+        return {
+            "bid": float(result["vol"][0]),
+            "ask": float(result["vol"][1]),
+            "converged": bool(result["converged"].all())
+        }
+
     def generate_response_message(self, accept: bool) -> str:
         if accept:
-            return f"<strong> {self.investor.company} [{self.investor.name}]: </strong> {get_random_response_phrase(self.way)}"
-        return f"<strong> {self.investor.company} [{self.investor.name}]: </strong> {get_random_response_phrase('pass')}"
+            return f"<strong> {self.investor.company} [{self.investor.name}]: </strong> {get_random_response_phrase(self.way, self.rng)}"
+        return f"<strong> {self.investor.company} [{self.investor.name}]: </strong> {get_random_response_phrase('pass', self.rng)}"
 
 
 
@@ -0,0 +1,219 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from trading_game.config.settings import GAME_DURATION, REFRESH_INTERVAL, TIME_DECAY, TIME_SCALE
+from trading_game.config.shock_pool import NEWS_SHOCK_POOL, format_news
+from trading_game.core.book import Book
+from trading_game.models.shock import MarketShock
+from trading_game.models.stock import Stock
+from trading_game.models.vol_surface import VolSurface
+
+# One news shock per game on average, each news of the stock's sector being equally likely
+SHOCK_PROBABILITY = 1 / GAME_DURATION
+# Confidence levels of the VaR / ES
+CONFIDENCE_LEVELS = (0.95, 0.99)
+# Scenarios simulated and revalued at once (bounds the scenarios x legs temporaries)
+VAR_CHUNK_SIZE = 2_000
+# Scenario counts of the convergence report
+CONVERGENCE_SCENARIOS = (1_000, 2_000, 5_000, 10_000, 20_000, 50_000)
+
+
+def simulate_scenarios(stock: Stock, n_scenarios: int, horizon: int, dt: float = REFRESH_INTERVAL / 1_000,
+                       shock_probability: float = SHOCK_PROBABILITY,
+                       seed: Optional[int | np.random.SeedSequence | np.random.Generator] = None,
+                       live_shock: Optional[MarketShock] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Spot and vol of the stock after `horizon` ticks of dt seconds, for n_scenarios Monte Carlo paths.
+    Each tick triggers a news shock with probability shock_probability (at most one per path over the horizon),
+    the news being drawn from the sector's shock pool; paths sharing a (news, tick) are simulated together.
+    The paths carry on the vol decay of live_shock, the shock the stock is currently under (see Stock.simulate_paths).
+    Returns (spots, vol_scales), the vol scales being the horizon vol over the current one.
+    """
+    rng = np.random.default_rng(seed)
+    pool = NEWS_SHOCK_POOL.get(stock.sector, [])
+    p_shock = 1 - (1 - shock_probability) ** horizon if pool else 0.0
+
+    # Scenario group: -1 without shock, else news index * horizon + shock tick
+    shocked = rng.random(n_scenarios) < p_shock
+    groups = np.where(
+        shocked, rng.integers(max(len(pool), 1), size=n_scenarios) * horizon + rng.integers(horizon, size=n_scenarios), -1
+    )
+
+    spots, vols = np.empty(n_scenarios), np.empty(n_scenarios)
+    for group in np.unique(groups).tolist():
+        rows = np.flatnonzero(groups == group)
+        schedule = None
+        if group >= 0:
+            news = format_news(pool[group // horizon], stock.name)
+            schedule = {group % horizon: MarketShock(**news, clock=stock.clock)}
+        prices, path_vols = stock.simulate_paths(len(rows), horizon, dt, schedule, seed=rng, live_shock=live_shock)
+        spots[rows] = prices[:, -1]
+        vols[rows] = path_vols[:, -1]
+
+    return spots, vols / stock.last_vol
+
+
+def historical_scenarios(stock: Stock, horizon: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Spot and vol scenarios replaying every (overlapping) horizon-tick move of the stock history from the current
+    state. Returns (spots, vol_scales) like simulate_scenarios.
+    """
+    prices, vols = stock.price_history.view(), stock.vol_history.view()
+    if len(prices) <= horizon:
+        raise ValueError(f"Historical VaR over {horizon} ticks needs more than {horizon} prices, got {len(prices)}.")
+    return stock.last_price * prices[horizon:] / prices[:-horizon], vols[horizon:] / vols[:-horizon]
+
+
+def var_es(pnl_change: np.ndarray, levels: Sequence[float] = CONFIDENCE_LEVELS) -> Dict[float, Dict[str, float]]:
+    """
+    Value at Risk and Expected Shortfall of a sample of P&L changes, as positive losses:
+    VaR is the `level` quantile of the loss, ES the mean loss beyond it.
+    """
+    losses = -np.asarray(pnl_change, dtype=float)
+    if losses.size == 0:
+        raise ValueError("No scenario to compute the VaR from.")
+
+    result = {}
+    for level in levels:
+        var = float(np.quantile(losses, level))
+        result[level] = {"var": var, "es": float(losses[losses >= var].mean())}
+    return result
+
+
+def _time_roll(horizon: int, dt: float, time_decay: bool) -> float:
+    """Years the option maturities roll down over the horizon (only when they decay in game)"""
+    return horizon * dt / TIME_SCALE if time_decay else 0.0
+
+
+def _revalue_chunk(book: Book, stock: Stock, volatility: float | VolSurface, horizon: int, dt: float,
+                   shock_probability: float, time_decay: bool, live_shock: Optional[MarketShock], n_scenarios: int,
+                   seed: np.random.SeedSequence) -> np.ndarray:
+    """Book pnl under one chunk of simulated scenarios"""
+    spots, vol_scales = simulate_scenarios(stock, n_scenarios, horizon, dt, shock_probability, seed, live_shock)
+    return book._scenario_pnl(spots, vol_scales, _time_roll(horizon, dt, time_decay), volatility)
+
+
+# Book, stock and market of the worker processes, set once per pool instead of being pickled with every chunk
+_worker_context: Optional[tuple] = None
+
+
+def _init_worker(*context) -> None:
+    global _worker_context
+    _worker_context = context
+
+
+def _revalue_chunk_in_worker(n_scenarios: int, seed: np.random.SeedSequence) -> np.ndarray:
+    return _revalue_chunk(*_worker_context, n_scenarios, seed)
+
+
+def monte_carlo_var(book: Book, stock: Stock, volatility: float | VolSurface, n_scenarios: int = 10_000,
+                    horizon: int = 1, levels: Sequence[float] = CONFIDENCE_LEVELS, dt: float = REFRESH_INTERVAL / 1_000,
+                    shock_probability: float = SHOCK_PROBABILITY, time_decay: bool = TIME_DECAY,
+                    seed: Optional[int] = None, chunk_size: int = VAR_CHUNK_SIZE,
+                    n_workers: Optional[int] = 1, live_shock: Optional[MarketShock] = None) -> dict:
+    """
+    Monte Carlo VaR / ES of the book over `horizon` ticks by full revaluation: the stock paths follow its game
+    dynamics (diffusion, news shocks, vol decay of the live_shock in progress) and every scenario reprices every
+    leg at the horizon spot and vol.
+    Scenarios are simulated and revalued by chunks of chunk_size, each chunk seeded from seed, so the result
+    only depends on (seed, chunk_size) and not on n_workers (None: all cores).
+    Returns {"levels": {level: {"var", "es"}}, "mean", "std", "n_scenarios", "pnl_change"}.
+    """
+    sizes = [chunk_size] * (n_scenarios // chunk_size) + ([n_scenarios % chunk_size] if n_scenarios % chunk_size else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    context = (book, stock, volatility, horizon, dt, shock_probability, time_decay, live_shock)
+    n_workers = min(n_workers or os.cpu_count() or 1, len(sizes))
+
+    if n_workers <= 1:
+        chunks = [_revalue_chunk(*context, size, chunk_seed) for size, chunk_seed in zip(sizes, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker, initargs=context) as executor:
+            chunks = list(executor.map(_revalue_chunk_in_worker, sizes, seeds))
+
+    pnl_change = np.concatenate(chunks) - book.compute_book_pnl(stock.last_price, volatility)
+    return {
+        "levels": var_es(pnl_change, levels),
+        "mean": float(pnl_change.mean()),
+        "std": float(pnl_change.std()),
+        "n_scenarios": n_scenarios,
+        "pnl_change": pnl_change,
+    }
+
+
+def historical_var(book: Book, stock: Stock, volatility: float | VolSurface, horizon: int = 1,
+                   levels: Sequence[float] = CONFIDENCE_LEVELS, dt: float = REFRESH_INTERVAL / 1_000,
+                   time_decay: bool = TIME_DECAY) -> dict:
+    """Historical VaR / ES of the book over `horizon` ticks, revaluing it under every past move of the stock"""
+    spots, vol_scales = historical_scenarios(stock, horizon)
+    pnl = book._scenario_pnl(spots, vol_scales, _time_roll(horizon, dt, time_decay), volatility)
+    pnl_change = pnl - book.compute_book_pnl(stock.last_price, volatility)
+    return {
+        "levels": var_es(pnl_change, levels),
+        "mean": float(pnl_change.mean()),
+        "std": float(pnl_change.std()),
+        "n_scenarios": len(pnl_change),
+        "pnl_change": pnl_change,
+    }
+
+
+def convergence_report(book: Book, stock: Stock, volatility: float | VolSurface,
+                       scenario_counts: Sequence[int] = CONVERGENCE_SCENARIOS, **kwargs) -> List[dict]:
+    """
+    Monte Carlo VaR / ES and runtime for increasing numbers of scenarios (kwargs go to monte_carlo_var).
+    Each row holds n_scenarios, runtime (s), scenarios_per_s and the var_<level> / es_<level> figures.
+    """
+    rows = []
+    for n_scenarios in scenario_counts:
+        start = time.perf_counter()
+        result = monte_carlo_var(book, stock, volatility, n_scenarios=n_scenarios, **kwargs)
+        runtime = time.perf_counter() - start
+
+        row = {"n_scenarios": n_scenarios, "runtime": runtime, "scenarios_per_s": n_scenarios / runtime}
+        for level, figures in result["levels"].items():
+            row[f"var_{level:g}"] = figures["var"]
+            row[f"es_{level:g}"] = figures["es"]
+        rows.append(row)
+    return rows
+
+
+def main() -> None:
+    from trading_game.core.batch_runner import ScriptedPolicy
+    from trading_game.core.game_engine import GameEngine
+    from trading_game.models.clock import SimulatedClock
+
+    parser = argparse.ArgumentParser(description="VaR / ES convergence and runtime of a scripted game's book")
+    parser.add_argument("--seed", type=int, default=0, help="Game and scenario seed")
+    parser.add_argument("--ticks", type=int, default=GAME_DURATION // 2, help="Ticks played before measuring")
+    parser.add_argument("--horizon", type=int, default=1, help="VaR horizon in ticks")
+    parser.add_argument("--scenarios", type=int, nargs="+", default=list(CONVERGENCE_SCENARIOS))
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (0: all cores)")
+    parser.add_argument("--chunk", type=int, default=VAR_CHUNK_SIZE, help="Scenarios per chunk")
+    args = parser.parse_args()
+
+    engine = GameEngine.new_game(clock=SimulatedClock(), seed=args.seed)
+    policy = ScriptedPolicy()
+    for _ in range(args.ticks):
+        engine.step()
+        policy(engine)
+
+    stock, book = engine.stock, engine.book
+    print(f"{stock.ticker} after {engine.tick_count} ticks: {len(book.trades)} strategies, "
+          f"{len(book._legs)} legs, {book.stock_quantity} shares")
+    rows = convergence_report(book, stock, engine.vol_surface, args.scenarios, horizon=args.horizon,
+                              seed=args.seed, chunk_size=args.chunk, n_workers=args.workers or None,
+                              live_shock=engine.shock)
+
+    columns = list(rows[0])
+    print("  ".join(f"{column:>14}" for column in columns))
+    for row in rows:
+        print("  ".join(f"{row[column]:>14,.4g}" if isinstance(row[column], float) else f"{row[column]:>14,}"
+                        for column in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+import argparse
+import json
+import os
+import random
+import struct
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterator, Literal, Optional, Tuple
+
+# Events appended between two snapshots of the book
+JOURNAL_SNAPSHOT_EVERY = 10_000
+
+# Length prefix of a msgpack record (little-endian uint32)
+_LENGTH = struct.Struct("<I")
+
+
+def _msgpack():
+    try:
+        import msgpack
+    except ImportError as exc:
+        raise ImportError("A msgpack journal requires msgpack, use a .jsonl journal instead.") from exc
+    return msgpack
+
+
+class TradeJournal:
+    """
+    Append-only event log of a Book, with periodic snapshots of its full state.
+    Events are JSON lines, or length-prefixed msgpack records when the path ends with .msgpack (requires msgpack).
+    The snapshot (<path>.snapshot, same encoding) is written atomically every snapshot_every events and records
+    the number of events and the byte offset it covers: recovery loads it and only replays the tail.
+    A record torn by a crash at the end of the log is ignored and overwritten by the next append.
+    """
+
+    def __init__(self, path: str | Path, snapshot_every: int = JOURNAL_SNAPSHOT_EVERY,
+                 fmt: Optional[Literal["jsonl", "msgpack"]] = None):
+        self.path = Path(path)
+        self.snapshot_path = self.path.with_name(self.path.name + ".snapshot")
+        self.fmt = fmt or ("msgpack" if self.path.suffix == ".msgpack" else "jsonl")
+        if self.fmt == "msgpack":
+            _msgpack()
+        self.snapshot_every = snapshot_every
+        self.seq = 0  # Number of events in the log
+        self.offset = 0  # Byte offset of the end of the last complete event
+        self.snapshot_seq = 0  # Number of events covered by the last snapshot
+        self._file = None
+        self._scanned = False
+
+    def __getstate__(self) -> dict:
+        # The file handle stays in the owning process
+        state = self.__dict__.copy()
+        state["_file"] = None
+        return state
+
+    # ---- Encoding ----
+    def _encode(self, obj) -> bytes:
+        if self.fmt == "msgpack":
+            payload = _msgpack().packb(obj)
+            return _LENGTH.pack(len(payload)) + payload
+        return json.dumps(obj, separators=(",", ":")).encode() + b"\n"
+
+    def _records(self, start: int) -> Iterator[Tuple[int, bytes]]:
+        """(end offset, payload) of every complete record from byte offset start"""
+        if not self.path.exists():
+            return
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            if self.fmt == "msgpack":
+                data, pos = f.read(), 0
+                while pos + _LENGTH.size <= len(data):
+                    (size,) = _LENGTH.unpack_from(data, pos)
+                    end = pos + _LENGTH.size + size
+                    if end > len(data):
+                        return
+                    yield start + end, data[pos + _LENGTH.size:end]
+                    pos = end
+            else:
+                end = start
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        return
+                    end += len(line)
+                    yield end, line
+
+    def _decode(self, payload: bytes):
+        if self.fmt == "msgpack":
+            return _msgpack().unpackb(payload)
+        return json.loads(payload)
+
+    # ---- Writes ----
+    def append(self, event: dict) -> None:
+        """Append one event (flushed to the OS at once)"""
+        if self._file is None:
+            if not self._scanned:
+                self.recover()
+            self._file = open(self.path, "ab")
+            # Drop a torn record left by a crash
+            self._file.truncate(self.offset)
+        self._file.write(self._encode(event))
+        self._file.flush()
+        self.offset = self._file.tell()
+        self.seq += 1
+
+    def snapshot_due(self) -> bool:
+        return self.seq - self.snapshot_seq >= self.snapshot_every
+
+    def write_snapshot(self, state: dict) -> None:
+        """Atomically replace the snapshot with the state of the book after the last appended event"""
+        tmp_path = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(self._encode({"seq": self.seq, "offset": self.offset, "state": state}))
+        os.replace(tmp_path, self.snapshot_path)
+        self.snapshot_seq = self.seq
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # ---- Reads ----
+    def read_snapshot(self) -> Optional[dict]:
+        """Last snapshot ({"seq", "offset", "state"}), or None"""
+        if not self.snapshot_path.exists():
+            return None
+        payload = self.snapshot_path.read_bytes()
+        return self._decode(payload[_LENGTH.size:] if self.fmt == "msgpack" else payload)
+
+    def events(self, start: int = 0) -> Iterator[dict]:
+        """Every complete event from byte offset start, in order"""
+        for _, payload in self._records(start):
+            yield self._decode(payload)
+
+    def recover(self) -> Tuple[Optional[dict], list]:
+        """
+        Latest snapshot state (None without snapshot) and the events appended after it.
+        Also positions the journal after the last complete event, ready to append.
+        """
+        snapshot = self.read_snapshot()
+        self.seq, self.offset = (snapshot["seq"], snapshot["offset"]) if snapshot else (0, 0)
+        self.snapshot_seq = self.seq
+
+        tail = []
+        for end, payload in self._records(self.offset):
+            tail.append(self._decode(payload))
+            self.seq, self.offset = self.seq + 1, end
+        self._scanned = True
+        return (snapshot["state"] if snapshot else None), tail
+
+
+def benchmark(n_events: int = 1_000_000, snapshot_every: int = JOURNAL_SNAPSHOT_EVERY,
+              fmt: Literal["jsonl", "msgpack"] = "jsonl", strategy_every: int = 100, roll_every: int = 1_000,
+              seed: int = 0) -> dict:
+    """
+    Journal a book through n_events mutations in a temporary directory (a strategy trade every strategy_every
+    events, a maturity roll every roll_every, cash adjustments otherwise), then time its recovery: Book.restore
+    from the last snapshot and its tail, against replaying every event into an empty book.
+    Returns the seconds of each phase, the journal size and the tail length.
+    """
+    from trading_game.core.book import Book
+    from trading_game.core.option_pricer import Strategy
+
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as directory:
+        journal = TradeJournal(Path(directory) / f"book.{fmt}", snapshot_every, fmt)
+        book = Book(journal=journal)
+
+        start = time.perf_counter()
+        for i in range(n_events):
+            if i % roll_every == roll_every - 1:
+                book.roll_time(1e-4, 100.0)
+            elif i % strategy_every == 0:
+                k = rng.uniform(80.0, 120.0)
+                strategy = Strategy.call_spread(k, k + 5.0, rng.uniform(0.05, 2.0), 0.03)
+                book.add_trade_strategy(strategy, rng.choice([-2, -1, 1, 2]), 100.0, 0.2)
+            else:
+                book.adjust_cash(-rng.random(), "transaction cost")
+        journal.close()
+        journal_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        restored = Book.restore(TradeJournal(journal.path, snapshot_every, fmt))
+        restore_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        replayed = Book()
+        for event in TradeJournal(journal.path, snapshot_every, fmt).events():
+            replayed.apply_event(event)
+        replay_seconds = time.perf_counter() - start
+
+        expected = book.state_dict()
+        return {
+            "events": n_events,
+            "journal_bytes": journal.path.stat().st_size,
+            "tail_events": journal.seq - journal.snapshot_seq,
+            "journal_s": journal_seconds,
+            "restore_s": restore_seconds,
+            "full_replay_s": replay_seconds,
+            "identical": restored.state_dict() == expected and replayed.state_dict() == expected,
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Book recovery from its journal: snapshot + tail vs full replay")
+    parser.add_argument("--events", type=int, default=1_000_000, help="Book mutations journaled")
+    parser.add_argument("--snapshot-every", type=int, default=JOURNAL_SNAPSHOT_EVERY, help="Events between snapshots")
+    parser.add_argument("--format", choices=["jsonl", "msgpack"], default="jsonl")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # The package's module, not __main__: Book only accepts its own TradeJournal class
+    from trading_game.core.trade_journal import benchmark
+
+    for name, value in benchmark(args.events, args.snapshot_every, args.format, seed=args.seed).items():
+        if name.endswith("_s"):
+            print(f"{name:>14}  {value:10.3f} s")
+        else:
+            print(f"{name:>14}  {value:>10,}" if not isinstance(value, bool) else f"{name:>14}  {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+from abc import ABC, abstractmethod
+
+from pydantic import BaseModel, Field
+
+import time
+
+from trading_game.config.settings import REFRESH_INTERVAL
+
+
+
+class Clock(BaseModel, ABC):
+    """
+    Time source shared by the market models (Stock, MarketShock, Order).
+    The game loop calls advance() once per tick, now() returns the current time in seconds.
+    """
+
+    @abstractmethod
+    def now(self) -> float:
+        """Current time in seconds"""
+
+    def advance(self, n_ticks: int = 1) -> float:
+        return self.now()
+
+
+class WallClock(Clock):
+    """Real time: now() is time.time() and advance() does nothing"""
+
+    def now(self) -> float:
+        return time.time()
+
+
+class SimulatedClock(Clock):
+    """Deterministic time: each tick moves the clock forward by tick_length seconds"""
+    start: float = 0.0
+    tick_length: float = Field(default=REFRESH_INTERVAL / 1_000, gt=0, description="Seconds per tick")
+    current: float = None
+
+    def model_post_init(self, __context) -> None:
+        if self.current is None:
+            self.current = self.start
+
+    def now(self) -> float:
+        return self.current
+
+    def advance(self, n_ticks: int = 1) -> float:
+        self.current += n_ticks * self.tick_length
+        return self.current
@@ -1,10 +1,10 @@
 from enum import Enum
+import numpy as np
 from pydantic import BaseModel, Field
-from typing import Literal
-
-import time
+from typing import Literal, Optional
 
 from trading_game.config.shock_pool import get_random_news_for_sector, format_news
+from trading_game.models.clock import Clock, WallClock
 
 
 
@@ -21,20 +21,21 @@ class MarketShock(BaseModel):
     price_impact: float
     vol_spike: float
     vol_decay_rate: float
+    clock: Clock = Field(default_factory=WallClock, exclude=True)
 
     class Config:
         use_enum_values = False
         validate_assignment = True
 
     @classmethod
-    def shock(cls, name: str, sector: str):
-        random_data = get_random_news_for_sector(sector)
+    def shock(cls, name: str, sector: str, clock: Optional[Clock] = None, rng: Optional[np.random.Generator] = None):
+        random_data = get_random_news_for_sector(sector, rng)
         market_shock_data = format_news(random_data, name)
-        return cls(**market_shock_data)
+        return cls(**market_shock_data, clock=clock or WallClock())
 
     def trigger_shock(self) -> None:
         self.shock_state = StateShock.HAPPENING
-        self.shock_time = time.time()
+        self.shock_time = self.clock.now()
 
     def decay_shock(self) -> None:
         self.shock_state = StateShock.DECAY
@@ -1,43 +1,67 @@
-from pydantic import BaseModel, Field, model_validator
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, model_validator
+from typing import Dict, Optional, Tuple
 
-import time
 import numpy as np
 
-from trading_game.config.settings import RF
+from trading_game.config.settings import HISTORY_MAXLEN, RF, REFRESH_INTERVAL, TIME_SCALE
 from trading_game.config.stock_pool import get_random_stock
-from trading_game.models.shock import StateShock
+from trading_game.models.clock import Clock, WallClock
+from trading_game.models.shock import MarketShock, StateShock
+from trading_game.utils.app_utils import get_rng
+from trading_game.utils.history_buffer import HistoryBuffer
+
+# Number of normal draws fetched at once by move_stock
+NORMAL_BUFFER_SIZE = 256
 
 
 
 class Stock(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     name: str
     ticker: str
     sector: str
     init_price: float
     init_vol: float
-    init_time: Optional[float] = Field(default_factory=time.time)
+    init_time: Optional[float] = None
     rate: Optional[float] = RF
-    price_history: Optional[list] = None
-    vol_history: Optional[list] = None
-    time_history: Optional[list] = None
+    history_maxlen: Optional[int] = HISTORY_MAXLEN
+    price_history: Optional[HistoryBuffer] = None
+    vol_history: Optional[HistoryBuffer] = None
+    time_history: Optional[HistoryBuffer] = None
     last_price: float = None
     last_vol: float = None
     last_time: float = None
+    clock: Clock = Field(default_factory=WallClock, exclude=True)
+    rng: Optional[np.random.Generator] = Field(default=None, exclude=True, repr=False)
+
+    # Buffered standard normal draws consumed by move_stock
+    _normals: np.ndarray = PrivateAttr(default_factory=lambda: np.empty(0))
+    _normal_idx: int = PrivateAttr(default=0)
+
+    # Pre-generated (price, vol) path consumed by move_stock, see load_path
+    _path: Optional[Tuple[np.ndarray, np.ndarray]] = PrivateAttr(default=None)
+    _path_step: int = PrivateAttr(default=0)
+
+    @model_validator(mode='after')
+    def set_init_time(self):
+        if self.init_time is None:
+            self.init_time = self.clock.now()
+        return self
 
     @model_validator(mode='after')
     def set_price_history(self):
-        self.price_history = [self.init_price]
+        self.price_history = HistoryBuffer([self.init_price], maxlen=self.history_maxlen)
         return self
 
     @model_validator(mode='after')
     def set_vol_history(self):
-        self.vol_history = [self.init_vol]
+        self.vol_history = HistoryBuffer([self.init_vol], maxlen=self.history_maxlen)
         return self
 
     @model_validator(mode='after')
     def set_time_history(self):
-        self.time_history = [self.init_time]
+        self.time_history = HistoryBuffer([self.init_time], maxlen=self.history_maxlen)
         return self
 
     @model_validator(mode='after')
@@ -56,9 +80,18 @@ class Stock(BaseModel):
         return self
 
     @classmethod
-    def stock(cls):
-        stock_data = get_random_stock()
-        return cls(**stock_data)
+    def stock(cls, clock: Optional[Clock] = None, rng: Optional[np.random.Generator] = None):
+        stock_data = get_random_stock(rng)
+        return cls(**stock_data, clock=clock or WallClock(), rng=rng)
+
+    def _next_normal(self) -> float:
+        """Next standard normal draw, refilled by batches (same sequence as drawing one by one)"""
+        if self._normal_idx >= len(self._normals):
+            self._normals = get_rng(self.rng).standard_normal(NORMAL_BUFFER_SIZE)
+            self._normal_idx = 0
+        z = self._normals[self._normal_idx]
+        self._normal_idx += 1
+        return float(z)
 
     def _update_state(self, t: float, p: float, v: float) -> None:
         self.last_time = t
@@ -68,10 +101,99 @@ class Stock(BaseModel):
         self.price_history.append(p)
         self.vol_history.append(v)
 
+    def simulate_paths(self, n_paths: int, n_steps: int, dt: float = REFRESH_INTERVAL / 1_000,
+                       shock_schedule: Optional[Dict[int, MarketShock]] = None,
+                       seed: Optional[int | np.random.Generator] = None,
+                       live_shock: Optional[MarketShock] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Generate n_paths price paths of n_steps ticks from the last price, with the same drift, diffusion,
+        shock jump and exponential vol decay as move_stock.
+        dt is the tick length in seconds (like the wall-clock delta of move_stock), shock_schedule maps
+        a step index to the MarketShock hitting at that step. live_shock is the shock the stock is currently
+        under (the game's MarketShock): while it is happening or decaying, the paths carry on its vol decay from
+        its shock_time. Draws come from seed (int or Generator), or from the stock's own generator when no seed
+        is given; like move_stock, only the diffusion steps draw a normal, not the shock jumps.
+        Returns (prices, vols), both of shape (n_paths, n_steps + 1) with the last price/vol in column 0.
+        The vol path does not depend on the draws, so vols is a read-only broadcast of a single path.
+        """
+        rng = get_rng(self.rng) if seed is None else np.random.default_rng(seed)
+        shock_schedule = shock_schedule or {}
+        tick_seconds, dt = dt, dt / TIME_SCALE
+
+        # ---- Vol path (deterministic, replays the shock states of the game loop) ----
+        vols = np.empty(n_steps + 1)
+        vols[0] = self.last_vol
+        jumps = np.zeros(n_steps, dtype=bool)
+        growth_jump = np.ones(n_steps)
+        # Shock state, shock and shock time (seconds after the last tick), the live shock's if any
+        state, shock, shock_time, shocked_vol = StateShock.NONE, None, 0.0, self.init_vol
+        if live_shock is not None and live_shock.shock_state != StateShock.NONE:
+            state, shock, shock_time = live_shock.shock_state, live_shock, live_shock.shock_time - self.last_time
+            shocked_vol = self.init_vol * live_shock.vol_spike
+
+        for i in range(n_steps):
+            if i in shock_schedule:
+                shock, shock_time, state = shock_schedule[i], (i + 1) * tick_seconds, StateShock.HAPPENING
+                shocked_vol = self.init_vol * shock.vol_spike
+                jumps[i] = True
+                growth_jump[i] = 1 + shock.price_impact
+                vols[i + 1] = shocked_vol
+                continue
+
+            if state == StateShock.HAPPENING:
+                state = StateShock.DECAY
+            elif state == StateShock.DECAY and abs(vols[i] - self.init_vol) < 0.01:
+                state = StateShock.NONE
+
+            if state == StateShock.DECAY:
+                time_since_shock = (i + 1) * tick_seconds - shock_time
+                vols[i + 1] = self.init_vol + (shocked_vol - self.init_vol) * np.exp(-shock.vol_decay_rate * time_since_shock)
+            else:
+                vols[i + 1] = self.init_vol
+
+        # ---- Price paths (one vectorized pass over every path and step) ----
+        prices = np.empty((n_paths, n_steps + 1))
+        prices[:, 0] = self.last_price
+        jump_steps, diffusion_steps = np.flatnonzero(jumps), np.flatnonzero(~jumps)
+        prices[:, 1 + jump_steps] = growth_jump[jump_steps]
+
+        v = vols[1:][diffusion_steps]
+        drift = (self.rate - 0.5 * v ** 2) * dt
+        diffusion = v * np.sqrt(dt) * rng.standard_normal((n_paths, len(diffusion_steps)))
+        prices[:, 1 + diffusion_steps] = np.exp(drift + diffusion)
+        np.cumprod(prices, axis=1, out=prices)
+
+        return prices, np.broadcast_to(vols, prices.shape)
+
+    def load_path(self, prices: np.ndarray, vols: np.ndarray) -> None:
+        """
+        Queue a pre-generated path (one row of simulate_paths, column 0 being the current state):
+        the following move_stock calls replay it tick by tick instead of drawing new moves.
+        """
+        prices, vols = np.asarray(prices, dtype=float), np.asarray(vols, dtype=float)
+        if prices.shape != vols.shape or prices.ndim != 1:
+            raise ValueError("Expected one price path and one vol path of the same length.")
+        self._path = (prices, vols)
+        self._path_step = 1
+
+    @property
+    def path_remaining(self) -> int:
+        """Number of ticks left in the loaded path"""
+        return 0 if self._path is None else len(self._path[0]) - self._path_step
+
     def move_stock(self, shock: dict, shocked_vol: float) -> None:
-        t = time.time()
+        t = self.clock.now()
+
+        # Replay the loaded path if any
+        if self.path_remaining > 0:
+            prices, vols = self._path
+            p, v = float(prices[self._path_step]), float(vols[self._path_step])
+            self._path_step += 1
+            self._update_state(t, p, v)
+            return
+
         delta_t = t - self.last_time
-        dt = delta_t / (252 * 4)  # (252*24*3600)
+        dt = delta_t / TIME_SCALE  # (252*24*3600)
 
         # If shock is triggered apply it to stock
         if shock["shock_state"].value == StateShock.HAPPENING.value:
@@ -91,7 +213,7 @@ class Stock(BaseModel):
                 v = self.init_vol
 
             drift = (self.rate - 0.5 * v ** 2) * dt
-            diffusion = v * np.sqrt(dt) * np.random.normal(0, 1)
+            diffusion = v * np.sqrt(dt) * self._next_normal()
             p = self.last_price * np.exp(drift + diffusion)
 
         self._update_state(t, p, v)
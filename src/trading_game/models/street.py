@@ -1,29 +1,33 @@
-import random
 from typing import List, Optional
 
-from pydantic import BaseModel, model_validator
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 from trading_game.config.investor_pool import get_random_investors
 from trading_game.config.settings import NB_INVESTORS
+from trading_game.utils.app_utils import get_rng
 
 
 
 class Investor(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     name: str
     company: str
     width_tolerance: Optional[float] = None
     client_relationship: Optional[int] = None
+    rng: Optional[np.random.Generator] = Field(default=None, exclude=True, repr=False)
 
     @model_validator(mode="after")
     def set_width_tolerance(self):
         if self.width_tolerance is None:
-            self.width_tolerance = random.uniform(0.1,0.2)
+            self.width_tolerance = float(get_rng(self.rng).uniform(0.1,0.2))
         return self
 
     @model_validator(mode="after")
     def set_client_relationship(self):
         if self.client_relationship is None:
-            self.client_relationship = random.randint(0,10)
+            self.client_relationship = int(get_rng(self.rng).integers(0,10, endpoint=True))
         return self
 
 class Street(BaseModel):
@@ -36,7 +40,7 @@ class Street(BaseModel):
         return self
 
     @classmethod
-    def street(cls):
-        investors_data = get_random_investors(NB_INVESTORS, unique_companies=True)
-        street_data = [Investor(**investor_data) for investor_data in investors_data]
+    def street(cls, rng: Optional[np.random.Generator] = None):
+        investors_data = get_random_investors(NB_INVESTORS, unique_companies=True, rng=rng)
+        street_data = [Investor(**investor_data, rng=rng) for investor_data in investors_data]
         return cls(investors=street_data)
\ No newline at end of file
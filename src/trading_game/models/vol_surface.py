@@ -0,0 +1,117 @@
+from collections import OrderedDict
+from itertools import count
+from typing import List, Optional
+
+import numpy as np
+from pydantic import BaseModel, Field, PrivateAttr
+
+from trading_game.config.maturity_config import get_year_frac_maturity_options
+from trading_game.models.shock import MarketShock
+from trading_game.models.stock import Stock
+
+# Number of distinct (strikes, maturities) queries whose interpolation weights are kept
+WEIGHTS_CACHE_SIZE = 64
+
+# Grid versions, unique across surfaces (see cache_key)
+_GRID_VERSIONS = count()
+
+
+class VolSurface(BaseModel):
+    """
+    Implied vol surface on a (strike, maturity) grid, sticky to the strikes of spot_ref.
+    Node vols follow atm_vol + term_slope * ln(T / ref_maturity) + skew * x + smile * x^2 with x = ln(K / spot_ref),
+    plus a parallel shift driven by market shocks. The grid and the bilinear interpolation weights of each
+    queried set of legs are cached, so looking up the vols of every leg of a book is one vectorized call.
+    Call rebuild() after changing anything but the shift.
+    """
+
+    spot_ref: float = Field(..., gt=0, description="Spot the strike nodes are relative to")
+    atm_vol: float = Field(..., gt=0, description="ATM vol at the reference maturity")
+    skew: float = Field(default=-0.15, description="Vol change per unit of log-moneyness")
+    smile: float = Field(default=0.25, description="Vol convexity in log-moneyness")
+    term_slope: float = Field(default=-0.02, description="Vol change per unit of log-maturity")
+    ref_maturity: float = Field(default=0.25, gt=0, description="Maturity of the ATM vol, in years")
+    moneyness_nodes: List[float] = Field(default_factory=lambda: np.linspace(0.5, 1.5, 21).tolist())
+    maturity_nodes: List[float] = Field(default_factory=get_year_frac_maturity_options)
+    shift: float = Field(default=0.0, description="Parallel shift added to every node")
+    min_vol: float = Field(default=0.01, gt=0)
+
+    _log_strikes: np.ndarray = PrivateAttr(default=None)
+    _maturities: np.ndarray = PrivateAttr(default=None)
+    _grid: np.ndarray = PrivateAttr(default=None)
+    _weights_cache: OrderedDict = PrivateAttr(default_factory=OrderedDict)
+    _grid_version: int = PrivateAttr(default=None)
+
+    def model_post_init(self, __context) -> None:
+        self.rebuild()
+
+    @classmethod
+    def from_stock(cls, stock: Stock, **params):
+        """Surface centred on the stock, whose ATM vol at the reference maturity is the stock's current vol"""
+        return cls(spot_ref=stock.last_price, atm_vol=stock.init_vol, shift=stock.last_vol - stock.init_vol, **params)
+
+    # ---- Cached grid ----
+    def rebuild(self) -> None:
+        """Recompute the node vols and drop the cached interpolation weights"""
+        # ATM and the reference maturity are always nodes, so the reference ATM vol is exact
+        self._log_strikes = np.log(np.unique(np.append(self.moneyness_nodes, 1.0)))
+        self._maturities = np.unique(np.append(self.maturity_nodes, self.ref_maturity))
+        if len(self._log_strikes) < 2 or len(self._maturities) < 2:
+            raise ValueError("A vol surface needs at least 2 strike nodes and 2 maturity nodes.")
+
+        x = self._log_strikes[:, None]
+        t = self._maturities[None, :]
+        self._grid = self.atm_vol + self.term_slope * np.log(t / self.ref_maturity) + self.skew * x + self.smile * x * x
+        self._weights_cache.clear()
+        self._grid_version = next(_GRID_VERSIONS)
+
+    @staticmethod
+    def _axis_weights(nodes: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Lower node index and linear weight of the upper node, flat outside the grid"""
+        idx = np.clip(np.searchsorted(nodes, values) - 1, 0, len(nodes) - 2)
+        weight = np.clip((values - nodes[idx]) / (nodes[idx + 1] - nodes[idx]), 0.0, 1.0)
+        return idx, weight
+
+    def _weights(self, strikes: np.ndarray, maturities: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Flat grid indices and bilinear weights (4 corners per query point), cached by query"""
+        key = (strikes.shape, strikes.tobytes(), maturities.tobytes())
+        cached = self._weights_cache.get(key)
+        if cached is not None:
+            self._weights_cache.move_to_end(key)
+            return cached
+
+        ix, wx = self._axis_weights(self._log_strikes, np.log(strikes / self.spot_ref))
+        it, wt = self._axis_weights(self._maturities, maturities)
+        n_t = len(self._maturities)
+        corners = np.stack([ix * n_t + it, (ix + 1) * n_t + it, ix * n_t + it + 1, (ix + 1) * n_t + it + 1])
+        weights = np.stack([(1 - wx) * (1 - wt), wx * (1 - wt), (1 - wx) * wt, wx * wt])
+
+        self._weights_cache[key] = (corners, weights)
+        if len(self._weights_cache) > WEIGHTS_CACHE_SIZE:
+            self._weights_cache.popitem(last=False)
+        return corners, weights
+
+    def cache_key(self) -> tuple:
+        """Hashable state of the surface (grid version and shift), for pricing caches"""
+        return self._grid_version, self.shift
+
+    # ---- Lookups ----
+    def vol(self, strike, maturity):
+        """Vols at broadcastable strikes and maturities (a float for scalar inputs)"""
+        strikes, maturities = np.broadcast_arrays(np.asarray(strike, dtype=float), np.asarray(maturity, dtype=float))
+        corners, weights = self._weights(strikes, maturities)
+        vols = np.maximum((weights * self._grid.ravel()[corners]).sum(axis=0) + self.shift, self.min_vol)
+        return float(vols) if vols.ndim == 0 else vols
+
+    def atm(self, maturity: Optional[float] = None) -> float:
+        """ATM vol (at spot_ref) for a maturity, the reference maturity by default"""
+        return self.vol(self.spot_ref, self.ref_maturity if maturity is None else maturity)
+
+    # ---- Shocks ----
+    def apply_shock(self, shock: MarketShock, time_since_shock: float) -> None:
+        """Parallel shift of a shock vol spike decaying exponentially, as in Stock.move_stock"""
+        self.shift = self.atm_vol * (shock.vol_spike - 1) * np.exp(-shock.vol_decay_rate * time_since_shock)
+
+    def follow(self, stock: Stock) -> None:
+        """Shift the surface so that its reference ATM vol tracks the stock's current vol"""
+        self.shift = stock.last_vol - self.atm_vol
@@ -0,0 +1,55 @@
+import itertools
+import secrets
+import threading
+from typing import List, Optional, Sequence, TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+
+
+class IdGenerator:
+    """
+    Monotonic, collision-free identifiers of the form {prefix}_{session}_{counter}.
+    A single counter is shared by every prefix, so ids are ordered across trades, orders and quotes.
+    The session token keeps ids unique across server restarts and parallel games.
+    """
+
+    def __init__(self, session: Optional[str] = None):
+        self.session = session or secrets.token_hex(3)
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def next_id(self, prefix: str) -> str:
+        with self._lock:
+            n = next(self._counter)
+        return f"{prefix}_{self.session}_{n:09d}"
+
+
+# Process-wide generator used by Book, Order, QuoteRequest and the chat history
+ID_GENERATOR = IdGenerator()
+
+
+def new_id(prefix: str) -> str:
+    """Next id from the process-wide generator"""
+    return ID_GENERATOR.next_id(prefix)
+
+
+# Process-wide random stream, used when no Generator is injected
+DEFAULT_RNG = np.random.default_rng()
+
+
+def get_rng(rng: Optional[np.random.Generator] = None) -> np.random.Generator:
+    """Injected generator, or the process-wide default one"""
+    return DEFAULT_RNG if rng is None else rng
+
+
+def spawn_rngs(seed: Optional[int | np.random.SeedSequence], n: int) -> List[np.random.Generator]:
+    """n statistically independent generators derived from one seed (reproducible for a given seed)"""
+    seed_seq = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    return [np.random.default_rng(child) for child in seed_seq.spawn(n)]
+
+
+def pick(items: Sequence[T], rng: Optional[np.random.Generator] = None) -> T:
+    """Random element of a sequence, keeping its Python type (unlike Generator.choice)"""
+    return items[int(get_rng(rng).integers(len(items)))]
@@ -0,0 +1,253 @@
+import argparse
+import json
+import timeit
+from typing import List, Literal, Sequence, Tuple
+
+import numpy as np
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Largest-Triangle-Three-Buckets: keep n_out points (first and last included) that best preserve
+    the visual shape of the series. One vectorized pass per bucket.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return x, y
+
+    # Bucket edges of the n - 2 inner points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    keep = np.empty(n_out, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Average of the next bucket (the last point for the last bucket)
+        next_lo, next_hi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[next_lo:next_hi].mean(), y[next_lo:next_hi].mean()
+
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+
+    return x[keep], y[keep]
+
+
+def minmax_downsample(x: np.ndarray, y: np.ndarray, n_out: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Keep the min and the max of n_out // 2 equal buckets (in time order): every extreme is preserved"""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    n_buckets = n_out // 2
+    if n_out >= n or n_buckets < 1:
+        return x, y
+
+    width = n // n_buckets
+    body = y[:n_buckets * width].reshape(n_buckets, width)
+    offsets = np.arange(n_buckets) * width
+    lo = offsets + body.argmin(axis=1)
+    hi = offsets + body.argmax(axis=1)
+    keep = np.unique(np.concatenate([lo, hi, [n - 1]]))
+    return x[keep], y[keep]
+
+
+def downsample(x: np.ndarray, y: np.ndarray, n_out: int,
+               method: Literal["lttb", "minmax"] = "lttb") -> Tuple[np.ndarray, np.ndarray]:
+    """Reduce a series to about n_out points"""
+    if method == "lttb":
+        return lttb(x, y, n_out)
+    if method == "minmax":
+        return minmax_downsample(x, y, n_out)
+    raise ValueError(f"Unknown downsampling method: {method}")
+
+
+class MinMaxAggregator:
+    """
+    Incremental min-max downsampling of a growing series (x increasing), for live charts.
+    Points are folded into buckets of `width` consecutive points keeping their min and max; when there are
+    more than max_points // 2 buckets, neighbours are merged and the width doubles. Each update only folds the
+    points appended since the previous one, the output stays below max_points (+ the last point) and the
+    y-range is exact without scanning the history. Points dropped from the front (ring buffers) drop their buckets.
+    """
+
+    def __init__(self, max_points: int):
+        if max_points < 2:
+            raise ValueError("max_points must be >= 2.")
+        self.max_buckets = max_points // 2
+        self.reset()
+
+    def reset(self) -> None:
+        self.width = 1
+        # One bucket per row: [count, x_min, y_min, x_max, y_max, x_end]
+        self._buckets: List[list] = []
+        self._last = None  # Last (x, y) folded
+
+    # ---- Updates ----
+    def update(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Fold the points of (x, y) not seen yet, return the downsampled series"""
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if len(x) == 0:
+            self.reset()
+            return x, y
+
+        # New series (restarted game): start over
+        if self._last is not None and x[-1] < self._last[0]:
+            self.reset()
+
+        start = 0 if self._last is None else int(np.searchsorted(x, self._last[0], side="right"))
+        while self._buckets and self._buckets[0][5] < x[0]:
+            self._buckets.pop(0)
+        if start < len(x):
+            self._fold(x[start:], y[start:])
+        return self.points()
+
+    def _fold(self, x: np.ndarray, y: np.ndarray) -> None:
+        n = len(x)
+        open_count = self._buckets[-1][0] % self.width if self._buckets else 0
+        while len(self._buckets) - (open_count > 0) - (-(open_count + n) // self.width) > self.max_buckets:
+            self._merge_pairs()
+            open_count = self._buckets[-1][0] % self.width if self._buckets else 0
+
+        i = 0
+        # Top up the open bucket
+        if open_count:
+            take = min(self.width - open_count, n)
+            self._merge_into(self._buckets[-1], self._bucket(x[:take], y[:take]))
+            i = take
+
+        # Full buckets, vectorized
+        m = (n - i) // self.width
+        if m:
+            xs = x[i:i + m * self.width].reshape(m, self.width)
+            ys = y[i:i + m * self.width].reshape(m, self.width)
+            rows = np.arange(m)
+            lo, hi = ys.argmin(axis=1), ys.argmax(axis=1)
+            self._buckets.extend(
+                [self.width, x_lo, y_lo, x_hi, y_hi, x_end] for x_lo, y_lo, x_hi, y_hi, x_end in zip(
+                    xs[rows, lo].tolist(), ys[rows, lo].tolist(), xs[rows, hi].tolist(), ys[rows, hi].tolist(),
+                    xs[:, -1].tolist()
+                )
+            )
+            i += m * self.width
+
+        # Remainder opens a new bucket
+        if i < n:
+            self._buckets.append(self._bucket(x[i:], y[i:]))
+
+        self._last = (float(x[-1]), float(y[-1]))
+
+    @staticmethod
+    def _bucket(x: np.ndarray, y: np.ndarray) -> list:
+        lo, hi = int(np.argmin(y)), int(np.argmax(y))
+        return [len(x), float(x[lo]), float(y[lo]), float(x[hi]), float(y[hi]), float(x[-1])]
+
+    @staticmethod
+    def _merge_into(left: list, right: list) -> None:
+        left[0] += right[0]
+        if right[2] < left[2]:
+            left[1], left[2] = right[1], right[2]
+        if right[4] > left[4]:
+            left[3], left[4] = right[3], right[4]
+        left[5] = right[5]
+
+    def _merge_pairs(self) -> None:
+        merged = []
+        for k in range(0, len(self._buckets), 2):
+            bucket = self._buckets[k]
+            if k + 1 < len(self._buckets):
+                self._merge_into(bucket, self._buckets[k + 1])
+            merged.append(bucket)
+        self._buckets = merged
+        self.width *= 2
+
+    # ---- Reads ----
+    def points(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Downsampled series: min and max of each bucket in x order, ending with the last point"""
+        xs, ys = [], []
+        for _, x_lo, y_lo, x_hi, y_hi, _ in self._buckets:
+            if x_lo == x_hi:
+                xs.append(x_lo)
+                ys.append(y_lo)
+            elif x_lo < x_hi:
+                xs += (x_lo, x_hi)
+                ys += (y_lo, y_hi)
+            else:
+                xs += (x_hi, x_lo)
+                ys += (y_hi, y_lo)
+        if self._last is not None and (not xs or xs[-1] != self._last[0]):
+            xs.append(self._last[0])
+            ys.append(self._last[1])
+        return np.asarray(xs), np.asarray(ys)
+
+    def y_range(self) -> Tuple[float, float]:
+        """Exact (min, max) of the folded points still in the series"""
+        if not self._buckets:
+            return 0.0, 0.0
+        return min(b[2] for b in self._buckets), max(b[4] for b in self._buckets)
+
+
+def _payload_bytes(x: np.ndarray, y: np.ndarray) -> int:
+    """Size of a trace's points serialized to JSON, as sent to the browser"""
+    return len(json.dumps({"x": np.asarray(x).tolist(), "y": np.asarray(y).tolist()}))
+
+
+def benchmark(sizes: Sequence[int] = (1_000, 100_000, 1_000_000), max_points: int = 1_000, refresh: int = 1,
+              repeat: int = 3, seed: int = 0) -> dict:
+    """
+    Per-refresh latency (best of repeat, seconds) and payload (bytes) of a chart trace of n points, for each n:
+    the full series, one-shot lttb / minmax_downsample, and a MinMaxAggregator folding the whole series at once
+    ("aggregator_first") then only the `refresh` points appended since ("aggregator_refresh").
+    """
+    rng = np.random.default_rng(seed)
+    report = {}
+    for n in sizes:
+        x = np.arange(n + refresh, dtype=float)
+        y = 100.0 + np.cumsum(rng.normal(size=n + refresh))
+        x_old, y_old = x[:n], y[:n]
+
+        def full():
+            return x.tolist(), y.tolist(), min(y), max(y)
+
+        def refreshed():
+            sampler = MinMaxAggregator(max_points)
+            sampler.update(x_old, y_old)
+            start = timeit.default_timer()
+            sampler.update(x, y)
+            return timeit.default_timer() - start
+
+        report[n] = {
+            "full_s": min(timeit.repeat(full, number=1, repeat=repeat)),
+            "lttb_s": min(timeit.repeat(lambda: lttb(x, y, max_points), number=1, repeat=repeat)),
+            "minmax_s": min(timeit.repeat(lambda: minmax_downsample(x, y, max_points), number=1, repeat=repeat)),
+            "aggregator_first_s": min(timeit.repeat(lambda: MinMaxAggregator(max_points).update(x, y), number=1,
+                                                    repeat=repeat)),
+            "aggregator_refresh_s": min(refreshed() for _ in range(repeat)),
+            "full_bytes": _payload_bytes(x, y),
+            "downsampled_bytes": _payload_bytes(*MinMaxAggregator(max_points).update(x, y)),
+        }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Chart trace latency and payload, full vs downsampled")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000], help="Series lengths")
+    parser.add_argument("--max-points", type=int, default=1_000, help="Points kept per trace")
+    parser.add_argument("--refresh", type=int, default=1, help="Points appended between two refreshes")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    report = benchmark(args.sizes, args.max_points, args.refresh, seed=args.seed)
+    columns = list(next(iter(report.values())))
+    print(f"{'points':>10}  " + "  ".join(f"{column:>20}" for column in columns))
+    for n, row in report.items():
+        print(f"{n:>10,}  " + "  ".join(
+            f"{row[column] * 1e3:>17.3f} ms" if column.endswith("_s") else f"{row[column]:>20,}" for column in columns
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import argparse
+import timeit
+from typing import Any, Iterable, Optional, Sequence
+
+import numpy as np
+from pydantic_core import core_schema
+
+# Initial number of slots of a growable buffer
+INITIAL_CAPACITY = 64
+
+
+class HistoryBuffer:
+    """
+    Append-only float history backed by a preallocated NumPy array.
+    Growable by default (capacity doubles when full). With maxlen it is a bounded ring buffer keeping the
+    last maxlen values: each value is written twice (at i and i + maxlen), so the window stays contiguous
+    and view() is always a zero-copy slice, wrapped or not.
+    Behaves like a read-only sequence (len, indexing, iteration) and validates from / serializes to a list
+    in pydantic models.
+    """
+
+    def __init__(self, values: Iterable[float] = (), maxlen: Optional[int] = None, capacity: int = INITIAL_CAPACITY):
+        if maxlen is not None and maxlen <= 0:
+            raise ValueError("maxlen must be > 0.")
+        self.maxlen = maxlen
+        self._data = np.empty(2 * maxlen if maxlen is not None else max(capacity, 1))
+        self._start = 0  # Offset of the oldest kept value
+        self._size = 0  # Number of kept values
+        self.total = 0  # Number of values ever appended
+        self.extend(values)
+
+    # ---- Writes ----
+    def append(self, value: float) -> None:
+        if self.maxlen is None:
+            if self._size == len(self._data):
+                self._data = np.concatenate([self._data, np.empty(len(self._data))])
+            self._data[self._size] = value
+            self._size += 1
+        else:
+            slot = (self._start + self._size) % self.maxlen
+            self._data[slot] = value
+            self._data[slot + self.maxlen] = value
+            if self._size < self.maxlen:
+                self._size += 1
+            else:
+                self._start = (self._start + 1) % self.maxlen
+        self.total += 1
+
+    def extend(self, values: Iterable[float]) -> None:
+        values = np.asarray(values if isinstance(values, np.ndarray) else list(values), dtype=float).ravel()
+        if self.maxlen is not None and len(values) > self.maxlen:
+            # Only the last maxlen values are kept
+            self.total += len(values) - self.maxlen
+            values = values[-self.maxlen:]
+        if self.maxlen is None:
+            needed = self._size + len(values)
+            if needed > len(self._data):
+                capacity = max(needed, 2 * len(self._data))
+                self._data = np.concatenate([self._data[:self._size], np.empty(capacity - self._size)])
+            self._data[self._size:needed] = values
+            self._size = needed
+            self.total += len(values)
+        else:
+            for value in values:
+                self.append(value)
+
+    def clear(self) -> None:
+        self._start = self._size = self.total = 0
+
+    # ---- Reads ----
+    def view(self) -> np.ndarray:
+        """Read-only zero-copy array of the kept values, oldest first (invalidated by later appends)"""
+        values = self._data[self._start:self._start + self._size]
+        values.flags.writeable = False
+        return values
+
+    def indices(self) -> np.ndarray:
+        """Position of each kept value in the full history (tick numbers when one value is appended per tick)"""
+        return np.arange(self.total - self._size, self.total)
+
+    def last(self, default: Optional[float] = None) -> Optional[float]:
+        return float(self._data[self._start + self._size - 1]) if self._size else default
+
+    def tolist(self) -> list:
+        return self.view().tolist()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, item):
+        values = self.view()[item]
+        return float(values) if np.ndim(values) == 0 else values
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __array__(self, dtype=None, copy=None):
+        values = self.view()
+        if copy:
+            values = values.copy()
+        return values if dtype is None else values.astype(dtype, copy=False)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, HistoryBuffer):
+            other = other.view()
+        try:
+            return bool(np.array_equal(self.view(), np.asarray(other, dtype=float)))
+        except (TypeError, ValueError):
+            return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"HistoryBuffer(len={self._size}, maxlen={self.maxlen}, last={self.last()})"
+
+    # ---- Pydantic ----
+    @classmethod
+    def _validate(cls, value: Any) -> "HistoryBuffer":
+        if isinstance(value, cls):
+            return value
+        return cls(value)
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source_type, handler) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            cls._validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(lambda buffer: buffer.tolist()),
+        )
+
+
+def benchmark(sizes: Sequence[int] = (1_000, 100_000, 1_000_000), maxlen: int = 10_000, repeat: int = 3) -> dict:
+    """
+    Seconds (best of repeat) to append n values one by one and to read the history back as an array, for a list
+    (np.asarray on each read), a growable HistoryBuffer and a HistoryBuffer ring of maxlen values (view() on
+    each read), for each n.
+    """
+    report = {}
+    for n in sizes:
+        values = np.random.default_rng(n).normal(size=n).tolist()
+        containers = {"list": list, "buffer": HistoryBuffer, "ring": lambda: HistoryBuffer(maxlen=maxlen)}
+        row = {}
+        for name, make in containers.items():
+            history = make()
+            row[f"{name}_append_s"] = min(timeit.repeat(
+                "for value in values: append(value)", setup="history = make(); append = history.append",
+                number=1, repeat=repeat, globals={"values": values, "make": make}
+            ))
+            history.extend(values)
+            read = (lambda: np.asarray(history)) if name == "list" else history.view
+            row[f"{name}_read_s"] = min(timeit.repeat(read, number=1, repeat=repeat))
+        report[n] = row
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Append and read latency of list vs HistoryBuffer histories")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000], help="Values appended")
+    parser.add_argument("--maxlen", type=int, default=10_000, help="Length of the ring buffer")
+    args = parser.parse_args()
+
+    report = benchmark(args.sizes, args.maxlen)
+    columns = list(next(iter(report.values())))
+    print(f"{'values':>10}  " + "  ".join(f"{column:>16}" for column in columns))
+    for n, row in report.items():
+        print(f"{n:>10,}  " + "  ".join(f"{row[column] * 1e3:>13.3f} ms" for column in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import re
+import threading
+
+from trading_game.utils.app_utils import IdGenerator, new_id
+
+N_THREADS = 8
+IDS_PER_THREAD = 12_500  # 100k ids in total
+
+
+def test_concurrent_ids_are_unique_and_well_formed():
+    generator = IdGenerator(session="abc123")
+    results = [[] for _ in range(N_THREADS)]
+    start = threading.Barrier(N_THREADS)
+
+    def draw(out):
+        start.wait()
+        for _ in range(IDS_PER_THREAD):
+            out.append(generator.next_id("TRD"))
+
+    threads = [threading.Thread(target=draw, args=(out,)) for out in results]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ids = [order_id for out in results for order_id in out]
+    assert len(ids) == N_THREADS * IDS_PER_THREAD
+    assert len(set(ids)) == len(ids)
+
+    pattern = re.compile(r"TRD_abc123_(\d{9})")
+    counters = [int(pattern.fullmatch(order_id).group(1)) for order_id in ids]
+    assert sorted(counters) == list(range(1, len(ids) + 1))
+    # Monotonic within each thread
+    for out in results:
+        numbers = [int(order_id[-9:]) for order_id in out]
+        assert numbers == sorted(numbers)
+
+
+def test_new_id_uses_prefix():
+    first, second = new_id("ORD"), new_id("ORD")
+    assert first.startswith("ORD_") and first != second
+    assert int(second.rsplit("_", 1)[1]) > int(first.rsplit("_", 1)[1])
@@ -0,0 +1,33 @@
+import pytest
+
+from trading_game.config.settings import STARTING_CASH, TRANSACTION_COST
+from trading_game.core.batch_runner import ScriptedPolicy, simulate_game
+from trading_game.core.game_engine import GameEngine
+from trading_game.core.option_pricer import Strategy
+from trading_game.models.clock import SimulatedClock
+
+
+def test_game_summary_holds_plain_python_numbers():
+    summary = simulate_game(seed=1, game_duration=30)
+    assert summary["ticks"] == 30
+    for name, value in summary.items():
+        assert type(value) in (int, float, str), f"{name} is a {type(value).__name__}"
+
+
+def test_policy_hedge_pays_its_premium_and_fees():
+    engine = GameEngine.new_game(game_duration=20, clock=SimulatedClock(), seed=7)
+    engine.step()
+    stock = engine.stock
+    engine.book.add_trade_strategy(Strategy.call(round(stock.last_price), 0.25, 0.04), -100,
+                                   stock.last_price, engine.market_vol)
+    cash = engine.book.cash
+
+    ScriptedPolicy(hedge_threshold=10)(engine)
+    hedge = engine.book.stocks[stock.ticker][1]
+    assert hedge > 10
+    fees = hedge * stock.last_price * TRANSACTION_COST
+    assert engine.book.cash == pytest.approx(cash - hedge * stock.last_price - fees, rel=1e-12)
+
+    # Booked at the market: the all-in P&L is the fees paid
+    value = engine.book.compute_book_value(stock.last_price, engine.market_vol)
+    assert value - STARTING_CASH == pytest.approx(-fees, abs=1e-6)
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from trading_game.config.settings import BASE
+from trading_game.core.book import STOCK_FIELDS, Book
+from trading_game.core.option_pricer import Option, Strategy
+from trading_game.models.stock import Stock
+from trading_game.models.vol_surface import VolSurface
+
+SPOT = 100.0
+SURFACE = VolSurface(spot_ref=SPOT, atm_vol=0.25)
+
+
+def random_book(n_legs: int, seed: int = 0) -> Book:
+    rng = np.random.default_rng(seed)
+    book = Book()
+    while len(book._legs) < n_legs:
+        k = float(rng.uniform(70, 130))
+        t = float(rng.choice([0.02, 0.1, 0.25, 0.5, 1.0]))
+        factory = Strategy.call_spread if rng.random() < 0.5 else Strategy.put_spread
+        book.add_trade_strategy(factory(k, k + 10, t, 0.03), int(rng.integers(1, 6)) * int(rng.choice([-1, 1])),
+                                SPOT, SURFACE)
+    return book
+
+
+def test_scenario_grid_matches_leg_by_leg_repricing():
+    book = random_book(20)
+    # Also hold two legs with the same strike, maturity and rate, netted by the grid
+    book.add_trade_strategy(Strategy.straddle(100.0, 0.25, 0.03), -3, SPOT, SURFACE)
+    grid = book.scenario_grid(SPOT, SURFACE, [-0.2, 0.0, 0.1], [-0.3, 0.0, 0.5], [0, 5, 21])
+
+    for i, spot_shock in enumerate(grid["spot_shocks"]):
+        for j, vol_shock in enumerate(grid["vol_shocks"]):
+            for k, days in enumerate(grid["time_rolls"]):
+                s, roll = SPOT * (1 + spot_shock), days / BASE
+                expected = 0.0
+                for strategy, quantity, entry_price in book.trades.values():
+                    for opt in strategy.options:
+                        rolled = Option(K=opt.K, T=max(opt.T - roll, 0.0), r=opt.r, option_type=opt.option_type,
+                                        position=opt.position)
+                        sigma = SURFACE.vol(opt.K, opt.T) * (1 + vol_shock)
+                        value = rolled.price(s, sigma) if rolled.T > 0 else rolled.position * max(
+                            rolled.type_sign * (s - opt.K), 0.0)
+                        expected += quantity * value
+                    expected -= quantity * entry_price
+                assert grid["pnl"][i, j, k] == pytest.approx(expected, rel=1e-9, abs=1e-9)
+
+    assert grid["pnl_change"][1, 1, 0] == pytest.approx(0.0, abs=1e-9)
+
+
+def stock(ticker: str = "TST") -> Stock:
+    return Stock(name=ticker, ticker=ticker, sector="Tech", init_price=SPOT, init_vol=0.2)
+
+
+def test_last_trade_price_follows_the_ref_key_index():
+    book = Book(cash=1e9)
+    tst = stock()
+    book.add_trade_stock(tst, 10, 99.0)
+    book.add_trade_stock(tst, -5, 101.0)
+    strat_id = book.add_trade_strategy(Strategy.call(100.0, 0.5, 0.03), 2, SPOT, 0.2, trade_price=4.0)
+    strat_key = book.trade_history[strat_id][7]
+
+    assert book.last_trade_price("TST", 0.0) == 101.0
+    assert book.last_trade_price(strat_key, 0.0) == 4.0
+    assert book.last_trade_price("OTHER", 7.0) == 7.0
+    assert book.compute_book_pnl(103.0, 0.2) == pytest.approx(
+        5 * (103.0 - 101.0) + 2 * (book._legs.strategy_price(strat_key, 103.0, 0.2) - 4.0)
+    )
+
+    # Rebuilt with a loaded state, emptied with the book
+    restored = Book()
+    restored.load_state(book.state_dict())
+    assert restored.last_trade_price("TST", 0.0) == 101.0
+    book.clear_book()
+    assert book.last_trade_price("TST", 0.0) == 0.0
+
+
+def stock_event(trade_id: str, ticker: str, spot: float) -> dict:
+    return {"event": "stock", "trade_id": trade_id, "key": ticker, "time": "00_00_00", "spot": spot, "quantity": 5,
+            "stock": stock(ticker).model_dump(include=STOCK_FIELDS)}
+
+
+def test_overwritten_trade_drops_its_stale_index_entry():
+    book = Book(cash=1e9)
+    first, second, last = (book.add_trade_stock(stock("AAA"), 10, spot) for spot in (99.0, 100.0, 101.0))
+
+    # The last AAA trade is rewritten as a BBB trade: AAA falls back to its previous trade
+    book.apply_event(stock_event(last, "BBB", 50.0))
+    assert book._trades_by_ref == {"AAA": [first, second], "BBB": [last]}
+    assert book.last_trade_price("AAA", 0.0) == 100.0
+    assert book.last_trade_price("BBB", 0.0) == 50.0
+
+    # Rewritten under the same key: indexed once, as the latest trade
+    book.apply_event(stock_event(first, "AAA", 98.0))
+    assert book._trades_by_ref["AAA"] == [second, first]
+    assert book.last_trade_price("AAA", 0.0) == 98.0
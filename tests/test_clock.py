@@ -0,0 +1,15 @@
+import pytest
+
+from trading_game.models.clock import Clock, SimulatedClock
+
+
+def test_clock_is_abstract():
+    with pytest.raises(TypeError):
+        Clock()
+
+
+def test_simulated_clock_advances_by_ticks():
+    clock = SimulatedClock(start=10.0, tick_length=2.0)
+    assert clock.now() == 10.0
+    assert clock.advance(3) == 16.0 == clock.now()
+
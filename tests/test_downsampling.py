@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from trading_game.utils.downsampling import MinMaxAggregator
+
+MAX_POINTS = 100
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_aggregator_keeps_the_extremes_and_the_last_point(seed):
+    rng = np.random.default_rng(seed)
+    y = 100.0 + np.cumsum(rng.normal(size=20_000))
+    x = np.arange(len(y), dtype=float)
+    sampler = MinMaxAggregator(MAX_POINTS)
+
+    end = 0
+    while end < len(y):
+        end = min(end + int(rng.integers(1, 2_000)), len(y))
+        x_plot, y_plot = sampler.update(x[:end], y[:end])
+        lo, hi = int(np.argmin(y[:end])), int(np.argmax(y[:end]))
+
+        assert sampler.y_range() == (y[lo], y[hi])
+        assert (x[lo], y[lo]) in zip(x_plot, y_plot)
+        assert (x[hi], y[hi]) in zip(x_plot, y_plot)
+        assert (x_plot[-1], y_plot[-1]) == (x[end - 1], y[end - 1])
+        assert np.all(np.diff(x_plot) > 0)
+        assert len(x_plot) <= MAX_POINTS + 1
+
+
+def test_aggregator_starts_over_on_a_new_series():
+    sampler = MinMaxAggregator(MAX_POINTS)
+    sampler.update(np.arange(500.0), np.linspace(0.0, 50.0, 500))
+    x_plot, y_plot = sampler.update(np.arange(3.0), np.array([7.0, -1.0, 2.0]))
+    assert x_plot.tolist() == [0.0, 1.0, 2.0]
+    assert y_plot.tolist() == [7.0, -1.0, 2.0]
+    assert sampler.y_range() == (-1.0, 7.0)
@@ -0,0 +1,102 @@
+import pytest
+
+from trading_game.config.settings import TRANSACTION_COST
+from trading_game.core.game_engine import GameEngine
+from trading_game.core.legs import price_legs
+from trading_game.core.manual_trading import OrderSide, OrderType, StrategyOrder, StrategyType, VanillaOrder
+from trading_game.models.clock import SimulatedClock
+
+
+@pytest.fixture
+def engine():
+    engine = GameEngine.new_game(game_duration=20, clock=SimulatedClock(), seed=7)
+    engine.step()
+    return engine
+
+
+def vanilla(engine, side, order_type=OrderType.MARKET, quantity=10, limit_price=None):
+    stock = engine.stock
+    return VanillaOrder(side=side, order_type=order_type, quantity=quantity, option_type="call",
+                        strike=round(stock.last_price), maturity=0.25, spot_price=stock.last_price,
+                        volatility=stock.last_vol, risk_free_rate=0.04, limit_price=limit_price, clock=engine.clock)
+
+
+@pytest.mark.parametrize("side", [OrderSide.BUY, OrderSide.SELL])
+def test_vanilla_fill_pays_its_premium_once(engine, side):
+    order = vanilla(engine, side)
+    price = abs(price_legs(order.instrument(), order.spot_price, engine.market_vol))
+    cash = engine.book.cash
+
+    assert engine.place_order(order)
+    fees = price * order.quantity * TRANSACTION_COST
+    assert engine.book.cash == pytest.approx(cash - order.side_sign * price * order.quantity - fees, rel=1e-12)
+
+    # Booked at the fill price: no P&L jump at the execution market
+    assert engine.book.compute_book_pnl(engine.stock.last_price, engine.market_vol) == pytest.approx(0.0, abs=1e-9)
+
+
+def test_strategy_fill_pays_its_premium_once(engine):
+    stock = engine.stock
+    k = round(stock.last_price)
+    order = StrategyOrder(side=OrderSide.SELL, order_type=OrderType.MARKET, quantity=5,
+                          strategy_type=StrategyType.CALL_SPREAD, strikes=[k, k + 10], maturity=0.5,
+                          spot_price=stock.last_price, volatility=stock.last_vol, risk_free_rate=0.04,
+                          clock=engine.clock)
+    price = abs(price_legs(order.to_legs(), order.spot_price, engine.market_vol))
+    cash = engine.book.cash
+
+    assert engine.place_order(order)
+    assert engine.book.cash == pytest.approx(cash + price * 5 - price * 5 * TRANSACTION_COST, rel=1e-12)
+
+
+def test_resting_order_fill_is_charged_at_its_fill_price(engine):
+    order = vanilla(engine, OrderSide.BUY)
+    limit = 2.0 * abs(price_legs(order.instrument(), order.spot_price, engine.market_vol))
+    order = vanilla(engine, OrderSide.BUY, OrderType.LIMIT, quantity=10, limit_price=limit)
+    engine.order_executor.market_depth = 4
+    engine.order_executor.order_book(order.instrument()).market_left = {1: 0, -1: 0}
+    cash = engine.book.cash
+
+    assert not engine.place_order(order)  # no depth left this tick: the order rests
+    assert engine.book.cash == cash
+
+    engine.step()  # depth restored: 4 fill at the new market
+    filled = engine.order_executor.get_order(order.order_id)
+    assert filled.filled_quantity == 4
+    paid = filled.executed_price * 4
+    assert engine.book.cash == pytest.approx(cash - paid * (1 + TRANSACTION_COST), rel=1e-12)
+    (_, _, quantity, _, _, trade_price, _, _), = engine.book.trade_history.values()
+    assert (quantity, trade_price) == (4, filled.executed_price)
+
+
+def test_fill_is_valued_on_the_execution_vol_surface(engine):
+    stock = engine.stock
+    put = lambda order_type, limit_price=None: VanillaOrder(
+        side=OrderSide.BUY, order_type=order_type, quantity=100, option_type="put", strike=round(0.8 * stock.last_price),
+        maturity=0.25, spot_price=stock.last_price, volatility=stock.last_vol, risk_free_rate=0.04,
+        limit_price=limit_price, clock=engine.clock,
+    )
+    limit = 2.0 * abs(price_legs(put(OrderType.MARKET).instrument(), stock.last_price, engine.market_vol))
+    order = put(OrderType.LIMIT, limit)
+    engine.order_executor.order_book(order.instrument()).market_left = {1: 0, -1: 0}
+    assert not engine.place_order(order)
+
+    engine.step()  # filled at the new market, then the P&L point is taken on the same surface
+    assert engine.order_executor.get_order(order.order_id).filled_quantity > 0
+    assert engine.book.pnl_history[-1] == pytest.approx(0.0, abs=1e-6)
+    assert engine.book.compute_book_pnl(stock.last_price, engine.market_vol) == pytest.approx(0.0, abs=1e-6)
+
+
+@pytest.mark.parametrize("quantity", [100, -100])
+def test_stock_trade_pays_its_premium_and_fees_once(engine, quantity):
+    spot, cash = engine.stock.last_price, engine.book.cash
+
+    assert engine.trade_stock(quantity)
+    assert engine.book.stocks[engine.stock.ticker][1] == quantity
+    assert engine.book.cash == pytest.approx(cash - quantity * spot - abs(quantity) * spot * TRANSACTION_COST, rel=1e-12)
+
+
+def test_stock_trade_beyond_the_cash_is_refused(engine):
+    cash = engine.book.cash
+    assert not engine.trade_stock(int(cash / engine.stock.last_price) + 1)
+    assert engine.book.is_empty_stock() and engine.book.cash == cash
@@ -0,0 +1,50 @@
+import copy
+
+import pytest
+
+from trading_game.core.batch_runner import ScriptedPolicy
+from trading_game.core.game_engine import GameEngine
+from trading_game.core.game_recorder import GameRecorder, GameReplayer, ReplayDivergence, book_digest
+from trading_game.core.manual_trading import OrderSide, OrderType, VanillaOrder
+from trading_game.models.clock import SimulatedClock
+
+
+def recorded_game(n_ticks=40, seed=3):
+    """Scripted game with quotes, stock hedges and option orders, and the live book digest after each tick"""
+    engine = GameEngine.new_game(game_duration=n_ticks, clock=SimulatedClock(), seed=seed)
+    recorder = GameRecorder(checkpoint_every=10)
+    recorder.attach(engine)
+    policy = ScriptedPolicy(hedge_threshold=50)
+    digests = {}
+    while engine.step():
+        policy(engine)
+        if engine.tick_count % 4 == 0:
+            stock = engine.stock
+            side = OrderSide.BUY if engine.tick_count % 8 else OrderSide.SELL
+            engine.place_order(VanillaOrder(side=side, order_type=OrderType.MARKET, quantity=100, option_type="call",
+                                            strike=round(stock.last_price), maturity=0.25, spot_price=stock.last_price,
+                                            volatility=stock.last_vol, risk_free_rate=0.04, clock=engine.clock))
+        digests[engine.tick_count] = book_digest(engine.book)
+    return engine, recorder, digests
+
+
+def test_replay_and_seek_reproduce_the_recorded_book():
+    engine, recorder, digests = recorded_game()
+    kinds = {record["type"] for record in recorder.records}
+    assert {"tick", "quote", "response", "order", "stock", "book", "checkpoint"} <= kinds
+
+    assert book_digest(GameReplayer(recorder.records).play().book) == book_digest(engine.book)
+
+    replayer = GameReplayer(recorder.records)
+    for tick in (23, 17, 31):  # forwards, backwards past a checkpoint, forwards again
+        assert book_digest(replayer.seek(tick).book) == digests[tick]
+
+
+def test_tampered_recording_raises_replay_divergence():
+    _, recorder, _ = recorded_game()
+    records = copy.deepcopy(recorder.records)
+    order = next(record for record in records if record["type"] == "order" and record["filled"])
+    order["order"]["quantity"] += 100
+
+    with pytest.raises(ReplayDivergence):
+        GameReplayer(records).play()
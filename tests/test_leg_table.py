@@ -0,0 +1,72 @@
+import copy
+import pickle
+
+import numpy as np
+import pytest
+
+from trading_game.core.leg_table import INITIAL_CAPACITY, LegTable
+from trading_game.core.option_pricer import Strategy
+
+
+def strategies(n, seed=0):
+    rng = np.random.default_rng(seed)
+    for i in range(n):
+        k = float(rng.uniform(80, 120))
+        t = float(rng.uniform(0.01, 1.0))
+        strategy = Strategy.butterfly(k - 5, k, k + 5, t, 0.03) if i % 2 else Strategy.put_spread(k, k + 5, t, 0.03)
+        yield f"s{i}", strategy, int(rng.integers(1, 5)), float(rng.uniform(0, 3))
+
+
+def columns(table):
+    return {name: getattr(table, name).tolist() for name in LegTable.LEG_COLUMNS + LegTable.STRATEGY_COLUMNS}
+
+
+def test_columns_grow_past_their_capacity():
+    table = LegTable()
+    booked = list(strategies(3 * INITIAL_CAPACITY))
+    for key, strategy, quantity, price in booked:
+        table.add(key, strategy, quantity, price)
+
+    legs = [(opt.K, opt.T, opt.r, opt.type_sign, opt.position, quantity, owner)
+            for owner, (_, strategy, quantity, _) in enumerate(booked) for opt in strategy.options]
+    assert len(table) == len(legs)
+    assert list(zip(*(getattr(table, name).tolist() for name in LegTable.LEG_COLUMNS))) == legs
+    assert table.entry_price.tolist() == [price for *_, price in booked]
+    assert table.settled.tolist() == [0.0] * len(booked)
+
+
+def test_remove_roll_and_reload_keep_the_columns_consistent():
+    table = LegTable()
+    for key, strategy, quantity, price in strategies(40):
+        table.add(key, strategy, quantity, price)
+    table.remove("s3")
+    table.remove("s0")
+    settlement = table.roll(0.3, 100.0)
+    table.add("late", Strategy.call(100.0, 0.5, 0.03), 2, 4.0)
+
+    # Same table rebuilt from scratch without the removed strategies, then rolled
+    expected = LegTable()
+    for key, strategy, quantity, price in strategies(40):
+        if key not in ("s3", "s0"):
+            expected.add(key, strategy, quantity, price)
+    assert expected.roll(0.3, 100.0) == pytest.approx(settlement, rel=1e-12)
+    expected.add("late", Strategy.call(100.0, 0.5, 0.03), 2, 4.0)
+
+    assert table.keys == expected.keys
+    assert columns(table) == pytest.approx(columns(expected), rel=1e-12)
+    assert table.owner.tolist() == expected.owner.tolist()
+
+    reloaded = LegTable()
+    reloaded.load_state(table.state())
+    assert columns(reloaded) == columns(table)
+
+
+def test_copies_keep_their_columns_on_their_buffers():
+    table = LegTable()
+    for key, strategy, quantity, price in strategies(10):
+        table.add(key, strategy, quantity, price)
+
+    for clone in (copy.deepcopy(table), pickle.loads(pickle.dumps(table))):
+        clone.roll(0.001, 100.0)
+        clone.add("new", Strategy.call(100.0, 0.5, 0.03), 1, 1.0)
+        assert clone.maturity[:len(table)].tolist() == pytest.approx((table.maturity - 0.001).tolist(), rel=1e-12)
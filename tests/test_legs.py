@@ -0,0 +1,45 @@
+import pytest
+
+from trading_game.core import legs
+from trading_game.core.legs import legs_from_strategy, legs_greeks, price_legs
+from trading_game.core.option_pricer import Greeks, Strategy
+from trading_game.models.vol_surface import VolSurface
+
+T, R = 0.5, 0.04
+FACTORIES = [
+    ("call", (100.0, T, R)),
+    ("put", (100.0, T, R)),
+    ("call_spread", (95.0, 110.0, T, R)),
+    ("put_spread", (95.0, 110.0, T, R)),
+    ("straddle", (100.0, T, R)),
+    ("strangle", (90.0, 110.0, T, R)),
+    ("calendar_spread", (100.0, 0.25, 1.0, R)),
+    ("risk_reversal_bullish", (90.0, 110.0, T, R)),
+    ("risk_reversal_bearish", (90.0, 110.0, T, R)),
+    ("butterfly", (90.0, 100.0, 110.0, T, R)),
+]
+
+
+@pytest.mark.parametrize("name, args", FACTORIES)
+@pytest.mark.parametrize("sigma", [0.2, VolSurface(spot_ref=100.0, atm_vol=0.25)], ids=["flat", "surface"])
+def test_legs_price_like_the_strategy(name, args, sigma):
+    strategy = getattr(Strategy, name)(*args)
+    unit_legs = getattr(legs, name)(*args)
+    assert legs_from_strategy(strategy) == unit_legs or name == "butterfly"  # butterfly legs are merged
+    for s in (70.0, 100.0, 135.0):
+        assert price_legs(unit_legs, s, sigma) == pytest.approx(strategy.price(s, sigma), rel=1e-12, abs=1e-12)
+
+
+@pytest.mark.parametrize("name, args", FACTORIES)
+def test_legs_greeks_match_strategy_greeks(name, args):
+    strategy = getattr(Strategy, name)(*args)
+    expected = Greeks(strategy=strategy).all_greeks(102.0, 0.3)
+    actual = legs_greeks(getattr(legs, name)(*args), 102.0, 0.3)
+    assert actual == pytest.approx(expected, rel=1e-12, abs=1e-12)
+
+
+def test_legs_round_trip_through_strategy():
+    unit_legs = legs.butterfly(90.0, 100.0, 110.0, T, R)
+    strategy = legs.legs_to_strategy("Butterfly", unit_legs)
+    assert len(strategy.options) == 4
+    assert price_legs(unit_legs, 101.0, 0.2) == pytest.approx(strategy.price(101.0, 0.2), rel=1e-12)
@@ -0,0 +1,58 @@
+import pytest
+
+from trading_game.core.legs import price_legs
+from trading_game.core.manual_trading import OrderExecutor, OrderSide, OrderStatus, OrderType, VanillaOrder
+from trading_game.models.vol_surface import VolSurface
+
+SPOT = 100.0
+FLAT_VOL = 0.2
+
+
+def limit_order(side, limit, strike=80.0, quantity=10, order_id=None):
+    return VanillaOrder(order_id=order_id, side=side, order_type=OrderType.LIMIT, quantity=quantity,
+                        option_type="put", strike=strike, maturity=0.5, spot_price=SPOT, volatility=FLAT_VOL,
+                        risk_free_rate=0.04, limit_price=limit)
+
+
+def test_resting_orders_are_matched_on_the_execution_surface():
+    surface = VolSurface(spot_ref=SPOT, atm_vol=FLAT_VOL)
+    probe = limit_order(OrderSide.BUY, 1.0)
+    flat = abs(price_legs(probe.instrument(), SPOT, FLAT_VOL))
+    skewed = abs(price_legs(probe.instrument(), SPOT, surface))
+    assert skewed != pytest.approx(flat)
+
+    # Between the two prices, on the side the surface crosses but the flat vol does not
+    side = OrderSide.BUY if skewed < flat else OrderSide.SELL
+    order = limit_order(side, 0.5 * (flat + skewed))
+    executor = OrderExecutor()
+    executor.submit_order(order)
+    assert not executor.execute_vanilla_order(order)  # flat vol: does not cross, the order rests
+
+    executor.on_tick(SPOT, FLAT_VOL)
+    executor.on_tick(SPOT, FLAT_VOL)  # indexed at the flat vol
+    assert order.status == OrderStatus.PENDING
+
+    executor.on_tick(SPOT, surface)
+    assert order.status == OrderStatus.EXECUTED
+    assert order.executed_price == pytest.approx(skewed)
+
+
+def test_executed_value_counts_the_filled_part_of_cancelled_and_replaced_orders():
+    executor = OrderExecutor(market_depth=4)
+    cancelled = limit_order(OrderSide.BUY, 50.0, strike=95.0)
+    replaced = limit_order(OrderSide.BUY, 50.0, strike=105.0)
+    for order in (cancelled, replaced):
+        executor.submit_order(order)
+        assert not executor.execute_vanilla_order(order)
+        assert order.filled_quantity == 4  # market depth of the tick, the rest rests
+
+    assert executor.cancel_order(cancelled.order_id)
+    assert executor.replace_order(replaced.order_id, quantity=12)
+    executor.on_tick(SPOT, FLAT_VOL)
+    assert replaced.filled_quantity == 8
+
+    fills = executor.take_fills()
+    assert len(fills) == 3
+    assert executor.executed_value == pytest.approx(sum(fill.price * fill.quantity for _, fill in fills), rel=1e-12)
+    assert executor.get_execution_summary()["total_executed_value"] == executor.executed_value
+    assert executor.executed_value == pytest.approx(4 * cancelled.executed_price + 8 * replaced.executed_price)
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from trading_game.core.option_pricer import Option, Strategy
+from trading_game.models.vol_surface import VolSurface
+
+SPOTS = np.linspace(40.0, 160.0, 41)
+VOLS = np.array([0.05, 0.12, 0.2, 0.35, 0.8])
+
+OPTIONS = [
+    Option(K=100.0, T=0.5, r=0.04, option_type="call"),
+    Option(K=95.0, T=0.25, r=0.04, option_type="put"),
+    Option(K=110.0, T=1.5, r=0.01, option_type="call", position=-1),
+    Option(K=80.0, T=2.0, r=0.0, option_type="put", position=-1),
+]
+STRATEGIES = [
+    Strategy.butterfly(90.0, 100.0, 110.0, 0.5, 0.04),
+    Strategy.calendar_spread(100.0, 0.25, 1.0, 0.04, option_type="put"),
+    Strategy.risk_reversal_bullish(90.0, 110.0, 0.75, 0.04),
+]
+
+
+@pytest.mark.parametrize("option", OPTIONS)
+def test_option_price_batch_matches_scalar_price(option):
+    batch = option.price_batch(SPOTS[:, None], VOLS[None, :])
+    assert batch.shape == (len(SPOTS), len(VOLS))
+    for i, s in enumerate(SPOTS):
+        for j, sigma in enumerate(VOLS):
+            assert batch[i, j] == option.price(float(s), float(sigma))
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_strategy_price_batch_matches_scalar_price(strategy):
+    batch = strategy.price_batch(SPOTS[:, None], VOLS[None, :])
+    for i, s in enumerate(SPOTS):
+        for j, sigma in enumerate(VOLS):
+            assert batch[i, j] == strategy.price(float(s), float(sigma))
+
+
+def test_price_batch_on_vol_surface_matches_scalar_price():
+    surface = VolSurface(spot_ref=100.0, atm_vol=0.2)
+    strategy = STRATEGIES[0]
+    batch = strategy.price_batch(SPOTS, surface)
+    for i, s in enumerate(SPOTS):
+        assert batch[i] == strategy.price(float(s), surface)
+
+
+@pytest.mark.parametrize("option_type", ["call", "put"])
+def test_implied_vol_round_trip(option_type):
+    option = Option(K=100.0, T=0.5, r=0.04, option_type=option_type)
+    spots, vols = np.meshgrid(np.linspace(70.0, 130.0, 25), np.linspace(0.05, 1.0, 20))
+    prices = option.price_batch(spots, vols)
+
+    result = option.implied_vol(prices, spots)
+    assert result["converged"].all()
+    np.testing.assert_allclose(option.price_batch(spots, result["vol"]), prices, rtol=0, atol=1e-8)
+
+    # Vols are only identified where the price moves with them
+    _, vega = option.price_vega(spots, vols)
+    identified = vega > 1e-2
+    np.testing.assert_allclose(result["vol"][identified], vols[identified], rtol=0, atol=1e-6)
+
+
+def test_implied_vol_of_butterfly_round_trips_prices():
+    strategy = STRATEGIES[0]
+    spots, vols = np.meshgrid(np.linspace(75.0, 125.0, 21), np.linspace(0.05, 1.0, 20))
+    prices = strategy.price_batch(spots, vols)
+
+    result = strategy.implied_vol(prices, spots, initial_vol=vols)
+    assert result["converged"].all()
+    np.testing.assert_allclose(strategy.price_batch(spots, result["vol"]), prices, rtol=0, atol=1e-8)
+
+
+def test_implied_vol_is_nan_when_not_solved():
+    option = Option(K=100.0, T=0.5, r=0.04, option_type="call")
+    # Below intrinsic value: no vol reaches it
+    result = option.implied_vol([1.0, option.price(100.0, 0.2)], [120.0, 100.0])
+    assert not result["converged"][0] and np.isnan(result["vol"][0])
+    assert result["converged"][1]
+
+    # Not converged within max_iter: no estimate is returned
+    result = option.implied_vol([option.price(100.0, 0.6)], [100.0], initial_vol=0.05, max_iter=1)
+    assert not result["converged"][0] and np.isnan(result["vol"][0])
@@ -0,0 +1,130 @@
+import math
+
+import pytest
+
+from trading_game.core.order_book import BUY, HEAP_SLACK, SELL, Fill, OrderBook, TriggerIndex
+
+
+def own_fills(fills, order_id):
+    return [(fill.counterparty, fill.price, fill.quantity) for fill in fills if fill.order_id == order_id]
+
+
+def test_incoming_order_walks_the_levels_best_price_first():
+    book = OrderBook()
+    book.submit("A", SELL, 10, 10.2)
+    book.submit("B", SELL, 10, 10.1)
+    book.submit("C", SELL, 10, 10.3)
+
+    fills = book.submit("X", BUY, 25, 10.25)
+    assert own_fills(fills, "X") == [("B", 10.1, 10), ("A", 10.2, 10)]
+    assert book.levels(BUY) == [(10.25, 5)]  # C is above the limit: the remainder rests
+    assert book.best_ask() == 10.3
+
+
+def test_orders_at_one_level_fill_in_arrival_order():
+    book = OrderBook()
+    for order_id in ("A", "B", "C"):
+        book.submit(order_id, BUY, 10, 9.9)
+
+    fills = book.submit("X", SELL, 15, 9.9)
+    assert own_fills(fills, "X") == [("A", 9.9, 10), ("B", 9.9, 5)]
+    assert [(order.order_id, order.quantity) for order in book.resting()] == [("B", 5), ("C", 10)]
+
+
+def test_resting_orders_beat_the_market_on_ties():
+    book = OrderBook()
+    book.submit("A", SELL, 10, 10.0)
+
+    fills = book.submit("X", BUY, 15, 10.5, market_price=10.0)
+    assert own_fills(fills, "X") == [("A", 10.0, 10), (None, 10.0, 5)]
+    assert len(book) == 0
+
+
+def test_cancelled_orders_are_skipped_lazily():
+    book = OrderBook()
+    book.submit("A", BUY, 10, 10.0)
+    book.submit("B", BUY, 10, 9.0)
+
+    assert book.cancel("A").order_id == "A"
+    assert book.cancel("A") is None
+    assert "A" not in book and len(book.bids) == 2  # the heap entry stays until it reaches the top
+
+    assert book.best_bid() == 9.0
+    assert len(book.bids) == 1
+    assert own_fills(book.submit("X", SELL, 5, 8.0), "X") == [("B", 9.0, 5)]
+
+
+def test_stale_entries_are_rebuilt_away():
+    book = OrderBook()
+    for i in range(200):
+        book.submit(f"O{i}", SELL, 1, 10.0 + i)
+    for i in range(199):
+        book.cancel(f"O{i}")
+
+    assert len(book.asks) <= 2 * len(book) + HEAP_SLACK + 1
+    assert book.best_ask() == 209.0
+
+
+def test_resting_order_fills_across_ticks_within_the_market_depth():
+    book = OrderBook(market_depth=30)
+    book.submit("A", BUY, 50, 10.0)
+
+    assert book.match_market(10.1) == []  # not crossed
+    assert book.match_market(9.9) == [Fill("A", 9.9, 30, None)]
+    assert book.match_market(9.8) == []  # no depth left this tick
+
+    book.new_tick(1)
+    assert book.match_market(9.8) == [Fill("A", 9.8, 20, None)]
+    assert len(book) == 0
+
+
+def test_replace_keeps_priority_only_when_reducing_at_the_same_limit():
+    book = OrderBook()
+    book.submit("A", SELL, 10, 10.0)
+    book.submit("B", SELL, 10, 10.0)
+
+    assert book.replace("A", quantity=5) == []
+    assert [order.order_id for order in book.resting()] == ["A", "B"]
+
+    assert book.replace("A", quantity=8) == []  # larger: requeued behind B
+    assert [order.order_id for order in book.resting()] == ["B", "A"]
+    assert own_fills(book.submit("X", BUY, 12, 10.0), "X") == [("B", 10.0, 10), ("A", 10.0, 2)]
+
+    with pytest.raises(ValueError):
+        book.replace("B", quantity=1)
+
+
+def test_replace_to_a_crossing_limit_matches_again():
+    book = OrderBook()
+    book.submit("A", SELL, 10, 10.0)
+    book.submit("B", BUY, 10, 9.0)
+
+    fills = book.replace("B", limit=10.0)
+    assert own_fills(fills, "B") == [("A", 10.0, 10)]
+    assert len(book) == 0
+
+
+def test_trigger_index_returns_the_keys_whose_band_the_spot_left():
+    index = TriggerIndex()
+    index.set("a", 90.0, 110.0)
+    index.set("b", 95.0, 105.0)
+    index.set("c", -math.inf, 120.0)
+
+    assert index.crossed(100.0) == []
+    assert index.crossed(105.0) == ["b"]  # bounds included
+    assert "b" not in index and len(index) == 2
+
+    assert index.crossed(80.0) == ["a"]
+    assert index.below == [] and index.above == [(120.0, "c")]
+
+
+def test_trigger_index_returns_keys_by_level_and_replaces_bands():
+    index = TriggerIndex()
+    index.set("a", 90.0, 110.0)
+    index.set("b", 95.0, 105.0)
+    index.set("c", 80.0, math.inf)
+    index.set("a", 85.0, 130.0)  # moved: its old band no longer triggers
+
+    assert index.crossed(110.0) == ["b"]
+    assert index.crossed(70.0) == ["a", "c"]
+    assert len(index) == 0 and index.below == [] and index.above == []
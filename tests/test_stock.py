@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from trading_game.config.settings import TIME_SCALE
+from trading_game.core.game_engine import GameEngine
+from trading_game.models.clock import SimulatedClock
+from trading_game.models.shock import MarketShock, StateShock
+from trading_game.models.stock import Stock
+
+DT = 2.0
+
+
+def shock(**fields):
+    return MarketShock(news="news", shock_type="negative", price_impact=-0.1, vol_spike=3.0, vol_decay_rate=0.05,
+                       **fields)
+
+
+@pytest.mark.parametrize("ticks, state", [(13, StateShock.HAPPENING), (14, StateShock.DECAY), (30, StateShock.NONE)])
+def test_paths_carry_on_the_live_shock(ticks, state):
+    engine = GameEngine.new_game(game_duration=200, clock=SimulatedClock(), seed=11)
+    for _ in range(ticks):
+        engine.step()
+    assert engine.shock.shock_state == state
+
+    stock = engine.stock
+    _, vols = stock.simulate_paths(1, 30, engine.clock.tick_length, seed=0, live_shock=engine.shock)
+    for _ in range(30):
+        engine.step()
+    assert vols[0].tolist() == pytest.approx(stock.vol_history.view()[-31:].tolist(), rel=1e-12)
+
+
+def test_jump_steps_draw_no_normal():
+    stock = Stock(name="Test", ticker="TST", sector="Tech", init_price=100.0, init_vol=0.2, clock=SimulatedClock())
+    n_paths, n_steps, jump = 4, 6, 2
+    prices, vols = stock.simulate_paths(n_paths, n_steps, DT, {jump: shock()}, seed=3)
+
+    growth = prices[:, 1:] / prices[:, :-1]
+    assert growth[:, jump] == pytest.approx(0.9, rel=1e-12)
+
+    # The diffusion steps consume the seed's normals in order, none is spent on the jump
+    z = np.random.default_rng(3).standard_normal((n_paths, n_steps - 1))
+    v = np.delete(vols[0, 1:], jump)
+    dt = DT / TIME_SCALE
+    expected = np.exp((stock.rate - 0.5 * v ** 2) * dt + v * np.sqrt(dt) * z)
+    assert np.delete(growth, jump, axis=1) == pytest.approx(expected, rel=1e-12)
@@ -0,0 +1,41 @@
+import pytest
+
+from trading_game.core.batch_runner import ScriptedPolicy
+from trading_game.core.book import Book
+from trading_game.core.game_engine import GameEngine
+from trading_game.core.trade_journal import TradeJournal
+from trading_game.models.clock import SimulatedClock
+
+
+@pytest.fixture
+def journaled_game(tmp_path):
+    engine = GameEngine.new_game(game_duration=80, clock=SimulatedClock(), seed=5)
+    engine.book.journal = TradeJournal(tmp_path / "book.jsonl", snapshot_every=15)
+    policy = ScriptedPolicy()
+    for _ in range(80):
+        engine.step()
+        policy(engine)
+    engine.book.journal.close()
+    return engine
+
+
+def test_restore_ignores_a_torn_record(journaled_game):
+    book, journal = journaled_game.book, journaled_game.book.journal
+    assert book.trades and book.stocks
+    assert journal.snapshot_seq > 0 and journal.seq > journal.snapshot_seq  # snapshot + tail
+    with open(journal.path, "ab") as f:
+        f.write(b'{"event":"cash","amount":-12')  # crash in the middle of an append
+
+    restored = Book.restore(TradeJournal(journal.path, snapshot_every=15))
+    assert restored.state_dict() == book.state_dict()
+
+    # The next append overwrites the torn record
+    restored.adjust_cash(-1.0, "fee")
+    restored.journal.close()
+    assert Book.restore(TradeJournal(journal.path, snapshot_every=15)).state_dict() == restored.state_dict()
+
+
+def test_restore_from_events_only(journaled_game):
+    journal = journaled_game.book.journal
+    journal.snapshot_path.unlink()
+    assert Book.restore(TradeJournal(journal.path)).state_dict() == journaled_game.book.state_dict()